@@ -1,6 +1,103 @@
-from flask import Flask
-app = Flask(__name__)
+import os
 
-@app.route('/')
-def hello_world():
-    return 'Hello, Docker!'
+import numpy as np
+import scipy.sparse as sp
+from flask import Flask, jsonify, request
+
+from src.models import TfIdfModel
+
+# Directory of a model saved with TfIdfModel.save
+MODEL_PATH = os.environ.get("TFIDF_MODEL_PATH", "model")
+# Maximum number of documents accepted in a single transform request
+MAX_BATCH_SIZE = int(os.environ.get("TFIDF_MAX_BATCH_SIZE", 1000))
+
+
+def top_k_terms(row :sp.csr_matrix, k :int, feature_names :list):
+    """
+    Description: Returns the 'k' highest weighted terms of a single document row.
+
+    Inputs:
+        row (sp.csr_matrix)  : 1 x n_features Tf-idf-weighted row.
+        k (int)              : number of terms to return.
+        feature_names (list) : feature name of each column.
+
+    Outputs:
+        terms (List[dict])   : terms and their weights, in decreasing weight order.
+    """
+    order = np.argsort(-row.data, kind="stable")[:k]
+    return [{"term": feature_names[row.indices[i]], "weight": float(row.data[i])} for i in order]
+
+
+def create_app(model :TfIdfModel=None, model_path :str=MODEL_PATH):
+    """
+    Description: Creates the transform service. The model is loaded once, when the app is created,
+                 so that a WSGI server started with '--preload' shares it between its workers
+                 instead of loading it per worker or per request.
+
+    Inputs:
+        model (TfIdfModel)  : fitted model to serve. If None, it is loaded from 'model_path'.
+        model_path (string) : directory of a model saved with TfIdfModel.save.
+
+    Outputs:
+        app (Flask)         : the WSGI application.
+    """
+    app = Flask(__name__)
+    state = {"model": model, "feature_names": None, "error": None}
+
+    if state["model"] is None:
+        try:
+            state["model"] = TfIdfModel.load(model_path, mmap=True)
+        except (OSError, AssertionError, ValueError, KeyError) as e:
+            state["error"] = "Model could not be loaded from '%s': %s" % (model_path, e)
+    if state["model"] is not None:
+        state["feature_names"] = state["model"].get_feature_names()
+
+    @app.route("/")
+    def index():
+        return jsonify({"service": "tf-idf", "endpoints": ["/health", "/ready", "/transform"]})
+
+    @app.route("/health")
+    def health():
+        return jsonify({"status": "ok"})
+
+    @app.route("/ready")
+    def ready():
+        if state["model"] is None:
+            return jsonify({"status": "unavailable", "error": state["error"]}), 503
+        return jsonify({"status": "ready", "n_features": len(state["feature_names"])})
+
+    @app.route("/transform", methods=["POST"])
+    def transform():
+        if state["model"] is None:
+            return jsonify({"error": state["error"]}), 503
+
+        body = request.get_json(silent=True)
+        if type(body) != dict:
+            return jsonify({"error": "Request body has to be a JSON object !"}), 400
+
+        documents, top_k = body.get("documents"), body.get("top_k")
+        if type(documents) != list or len(documents) == 0 or any(type(d) != str for d in documents):
+            return jsonify({"error": "'documents' has to be a non-empty list of strings !"}), 400
+        if len(documents) > MAX_BATCH_SIZE:
+            return jsonify({"error": "At most %d documents can be sent at once !" % MAX_BATCH_SIZE}), 413
+        if top_k is not None and (type(top_k) != int or top_k <= 0):
+            return jsonify({"error": "'top_k' has to be a positive integer !"}), 400
+
+        try:
+            X = sp.csr_matrix(state["model"].transform(documents))
+        except AssertionError as e:
+            # The tokenizers reject documents that are empty after preprocessing, e.g. only punctuation
+            return jsonify({"error": "Documents could not be analyzed: %s" % e}), 400
+        results = []
+        for i in range(X.shape[0]):
+            row = X[i]
+            if top_k is None:
+                results.append({"indices": row.indices.tolist(), "values": row.data.tolist()})
+            else:
+                results.append({"terms": top_k_terms(row, top_k, state["feature_names"])})
+        return jsonify({"n_features": X.shape[1], "results": results})
+
+    return app
+
+
+app = create_app()
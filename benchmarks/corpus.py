@@ -0,0 +1,65 @@
+"""
+Description: Reproducible synthetic corpora for the benchmarks. Word frequencies follow a Zipf law
+             like natural language, and the words are built from syllables and English suffixes so
+             that the stemmer and the lemmatizer have work to do. Capitals, punctuation, digits and
+             accents are sprinkled in so that every TextOps operation changes the text.
+"""
+import numpy as np
+
+SYLLABLES = ["ba", "ko", "ri", "tem", "sa", "lo", "vin", "de", "mar", "tu", "pel", "no", "ches", "gra", "fi", "won"]
+SUFFIXES = ["", "", "", "s", "ing", "ed", "ly", "ness", "er"]
+PUNCTUATIONS = [",", ".", "!", "?", ";", ":"]
+
+
+def zipf_vocabulary(n_terms :int, seed :int=0):
+    """
+    Description: Returns 'n_terms' distinct pseudo-words.
+    """
+    rng = np.random.default_rng(seed)
+    words, seen = [], set()
+    while len(words) < n_terms:
+        n_syllables = rng.integers(1, 5)
+        word = "".join(rng.choice(SYLLABLES, size=n_syllables)) + rng.choice(SUFFIXES)
+        if word not in seen:
+            seen.add(word)
+            words.append(word)
+    return words
+
+
+def zipf_corpus(n_docs :int, n_terms :int=20000, doc_length :int=100, exponent :float=1.1,
+                noise :bool=True, seed :int=0):
+    """
+    Description: Generates documents of words drawn from a Zipf distribution over a pseudo-word
+                 vocabulary. Document lengths are Poisson distributed around 'doc_length'.
+
+    Inputs:
+        n_docs (int)     : Number of documents.
+        n_terms (int)    : Size of the vocabulary.
+        doc_length (int) : Mean number of words of a document.
+        exponent (float) : Exponent of the Zipf law, the frequency of the r-th word is ~ 1 / r^exponent.
+        noise (bool)     : Whether to add capitals, punctuation, digits and accents.
+        seed (int)       : Seed of the generator, the same arguments always give the same corpus.
+
+    Outputs:
+        corpus (List[str]) : Generated documents.
+    """
+    rng = np.random.default_rng(seed)
+    words = np.array(zipf_vocabulary(n_terms, seed), dtype=object)
+    cdf = np.cumsum(1.0 / np.arange(1, n_terms + 1) ** exponent)
+    lengths = np.maximum(rng.poisson(doc_length, size=n_docs), 1)
+    tokens = words[np.minimum(np.searchsorted(cdf, rng.random(lengths.sum()) * cdf[-1]), n_terms - 1)]
+
+    if noise:
+        tokens = tokens.copy()
+        marks = rng.random(len(tokens))
+        for i in np.flatnonzero(marks < 0.05):
+            tokens[i] = tokens[i].capitalize()
+        for i in np.flatnonzero((marks >= 0.05) & (marks < 0.13)):
+            tokens[i] = tokens[i] + PUNCTUATIONS[i % len(PUNCTUATIONS)]
+        for i in np.flatnonzero((marks >= 0.13) & (marks < 0.15)):
+            tokens[i] = str(i % 1000)
+        for i in np.flatnonzero((marks >= 0.15) & (marks < 0.16)):
+            tokens[i] = tokens[i].replace("e", "é")
+
+    bounds = np.concatenate([[0], np.cumsum(lengths)])
+    return [" ".join(tokens[bounds[i]:bounds[i + 1]]) for i in range(n_docs)]
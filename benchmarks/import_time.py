@@ -0,0 +1,54 @@
+"""
+Description: Measures the wall-clock time of importing the package in fresh interpreters and lists
+             the heavy optional libraries that got imported with it.
+
+Usage: python3 -m benchmarks.import_time --repeat 5 --module "src.models, src.utils"
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+HEAVY_MODULES = ["nltk", "matplotlib", "seaborn", "pandas"]
+
+SNIPPET = """
+import sys, time, json
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps({{"seconds": elapsed, "loaded": [m for m in {heavy} if m in sys.modules]}}))
+"""
+
+
+def measure(module :str, repeat :int):
+    """
+    Description: Imports the module in 'repeat' fresh interpreters.
+
+    Outputs:
+        result (dict) : median / min / max import seconds and the heavy modules that were loaded.
+    """
+    runs = []
+    for _ in range(repeat):
+        out = subprocess.run(
+            [sys.executable, "-c", SNIPPET.format(module=module, heavy=HEAVY_MODULES)],
+            capture_output=True, text=True, check=True)
+        runs.append(json.loads(out.stdout.strip().splitlines()[-1]))
+
+    seconds = [r["seconds"] for r in runs]
+    return {
+        "module": module,
+        "repeat": repeat,
+        "median_seconds": statistics.median(seconds),
+        "min_seconds": min(seconds),
+        "max_seconds": max(seconds),
+        "heavy_modules_loaded": runs[-1]["loaded"],
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(prog="Import Time Benchmark")
+    parser.add_argument("--module", type=str, default="src.models, src.utils, src.tokenizers", help="Comma separated modules to import.")
+    parser.add_argument("--repeat", type=int, default=5, help="Number of fresh interpreters to measure.")
+    args = parser.parse_args()
+    print(json.dumps(measure(args.module, args.repeat), indent=2))
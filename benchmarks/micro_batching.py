@@ -0,0 +1,81 @@
+"""
+Description: Load test of the micro-batching front end. Concurrent clients send single-document
+             transform requests, either one 'infer' call per request or through a MicroBatcher,
+             and the throughput and latency percentiles of both are reported.
+
+Usage: python3 -m benchmarks.micro_batching --clients 64 --requests 50 --max_batch_size 64
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from benchmarks.corpus import zipf_corpus
+from src.models import TfIdfModel
+from src.serving import MicroBatcher
+from src.types import TextOps
+
+
+async def load(send, documents :list, clients :int, requests :int):
+    """
+    Description: Runs 'clients' concurrent clients, each sending 'requests' documents one after
+                 the other, and returns the latency of each request and the total time.
+    """
+    latencies = []
+
+    async def client(seed :int):
+        rng = random.Random(seed)
+        for _ in range(requests):
+            start = time.perf_counter()
+            await send(rng.choice(documents))
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*[client(i) for i in range(clients)])
+    return latencies, time.perf_counter() - start
+
+
+def summary(latencies :list, seconds :float):
+    latencies = np.array(latencies)
+    return {
+        "requests_per_second": len(latencies) / seconds,
+        "p50_ms": float(np.percentile(latencies, 50) * 1000),
+        "p99_ms": float(np.percentile(latencies, 99) * 1000),
+    }
+
+
+async def main(args):
+    documents = zipf_corpus(args.n_docs, n_terms=5000, doc_length=60, noise=False)
+    model = TfIdfModel({TextOps.LOWER}, sparse_output=True)
+    model.train(documents)
+    executor = ThreadPoolExecutor(max_workers=1)
+    loop = asyncio.get_running_loop()
+
+    async def per_request(document):
+        return await loop.run_in_executor(executor, model.infer, [document])
+
+    results = {"unbatched": summary(*await load(per_request, documents, args.clients, args.requests))}
+
+    async with MicroBatcher(model, args.max_batch_size, args.max_wait, executor=executor) as batcher:
+        results["batched"] = summary(*await load(batcher.transform, documents, args.clients, args.requests))
+        results["batched"]["metrics"] = batcher.metrics.info()
+
+    results["throughput_gain"] = results["batched"]["requests_per_second"] / results["unbatched"]["requests_per_second"]
+    results["p99_gain"] = results["unbatched"]["p99_ms"] / results["batched"]["p99_ms"]
+    executor.shutdown()
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(prog="Micro-batching Load Test")
+    parser.add_argument("--clients", type=int, default=64, help="Number of concurrent clients.")
+    parser.add_argument("--requests", type=int, default=50, help="Number of requests sent by each client.")
+    parser.add_argument("--n_docs", type=int, default=2000, help="Number of documents to fit the model on.")
+    parser.add_argument("--max_batch_size", type=int, default=64, help="Maximum batch size of the batcher.")
+    parser.add_argument("--max_wait", type=float, default=0.002, help="Maximum seconds a batch waits to fill up.")
+    args = parser.parse_args()
+    print(json.dumps(asyncio.run(main(args)), indent=2))
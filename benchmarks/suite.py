@@ -0,0 +1,222 @@
+"""
+Description: Throughput benchmark of TfIdfModel.train / infer across TextOps combinations, analyzers
+             and n-gram ranges. Every configuration reports docs/sec, per-stage latencies and peak
+             RSS, and runs in a fresh process so that the memory of one does not leak into another.
+             Results are written as JSON, and '--compare' flags the regressions against a baseline.
+
+Usage:
+    python3 -m benchmarks.suite --output bench_results.json
+    python3 -m benchmarks.suite --ops clean,stem --analyzers word --ngrams 1-1,1-2 --n_docs 2000
+    python3 -m benchmarks.suite --corpus datasets/podcast_transcripts/processed/train.txt
+    python3 -m benchmarks.suite --compare benchmarks/baseline.json --tolerance 0.15
+"""
+import argparse
+import json
+import multiprocessing as mp
+import platform
+import resource
+import statistics
+import sys
+import time
+import warnings
+
+import numpy as np
+import scipy
+import sklearn
+
+from benchmarks.corpus import zipf_corpus
+from src.constants import ENGLISH_STOP_WORDS
+from src.models import TfIdfModel
+from src.types import TextOps
+from src.utils import IO
+
+# Operation sets of the benchmark, by name
+OP_PRESETS = {
+    "raw"        : [],
+    "lower"      : [TextOps.LOWER],
+    "clean"      : [TextOps.LOWER, TextOps.DIGITS, TextOps.PUNCTUATIONS],
+    "clean_stop" : [TextOps.LOWER, TextOps.ASCII, TextOps.DIGITS, TextOps.PUNCTUATIONS, TextOps.STOP_WORDS],
+    "stem"       : [TextOps.LOWER, TextOps.DIGITS, TextOps.PUNCTUATIONS, TextOps.STEM],
+    "lemmatize"  : [TextOps.LOWER, TextOps.DIGITS, TextOps.PUNCTUATIONS, TextOps.LEMMATIZE],
+}
+
+# Metrics compared against the baseline, and whether higher values are better
+COMPARED_METRICS = {
+    "train_docs_per_sec": True,
+    "infer_docs_per_sec": True,
+    "peak_rss_mb": False,
+}
+
+
+def max_rss_mb():
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / (1024 ** 2 if sys.platform == "darwin" else 1024)
+
+
+def run_config(config :dict, train_docs :list, infer_docs :list, repeat :int):
+    """
+    Description: Benchmarks a single configuration.
+
+    Outputs:
+        result (dict) : configuration, throughputs, median stage seconds and memory of the run.
+    """
+    ops = [TextOps[op] for op in config["ops"]]
+    params = dict(analyzer=config["analyzer"], ngram_range=tuple(config["ngram_range"]))
+    if TextOps.STOP_WORDS in ops:
+        params["stop_words"] = sorted(ENGLISH_STOP_WORDS)
+    result = dict(config, n_train_docs=len(train_docs), n_infer_docs=len(infer_docs))
+    rss_before = max_rss_mb()
+    # Unused parameter warnings of scikit-learn, e.g. stop words with the char analyzers
+    warnings.simplefilter("ignore", UserWarning)
+
+    stages = {"preprocess": [], "tokenize": [], "count_and_idf": [], "train": [], "infer": []}
+    try:
+        for _ in range(repeat):
+            tf_idf = TfIdfModel(set(ops), sparse_output=True, **params)
+            start = time.perf_counter()
+            tf_idf.train(train_docs)
+            stages["train"].append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            tf_idf.infer(infer_docs)
+            stages["infer"].append(time.perf_counter() - start)
+
+            # The analysis stages are timed separately, outside of the fit
+            preprocess, analyze = tf_idf.build_preprocessor(), tf_idf.build_analyzer()
+            start = time.perf_counter()
+            for doc in train_docs:
+                preprocess(doc)
+            stages["preprocess"].append(time.perf_counter() - start)
+            start = time.perf_counter()
+            for doc in train_docs:
+                analyze(doc)
+            analyze_seconds = time.perf_counter() - start
+            stages["tokenize"].append(max(analyze_seconds - stages["preprocess"][-1], 0.0))
+            stages["count_and_idf"].append(max(stages["train"][-1] - analyze_seconds, 0.0))
+    except LookupError as e:
+        # NLTK resources of the tokenizers are missing
+        result["skipped"] = str(e)
+        return result
+
+    stages = {stage: statistics.median(seconds) for stage, seconds in stages.items()}
+    result.update({
+        "n_features": len(tf_idf.vocabulary_),
+        "train_docs_per_sec": len(train_docs) / stages["train"],
+        "infer_docs_per_sec": len(infer_docs) / stages["infer"],
+        "stage_seconds": stages,
+        "peak_rss_mb": max_rss_mb(),
+        "delta_rss_mb": max_rss_mb() - rss_before,
+    })
+    return result
+
+
+def run_isolated(config :dict, train_docs :list, infer_docs :list, repeat :int):
+    """
+    Description: Runs the configuration in a freshly spawned interpreter, so that its peak RSS is
+                 not hidden by the peak of a previous configuration.
+    """
+    with mp.get_context("spawn").Pool(1) as pool:
+        return pool.apply(run_config, (config, train_docs, infer_docs, repeat))
+
+
+def configurations(ops :list, analyzers :list, ngrams :list):
+    for op in ops:
+        assert op in OP_PRESETS, "Unknown op preset: %s, options: %s !" % (op, list(OP_PRESETS))
+        for analyzer in analyzers:
+            for ngram in ngrams:
+                low, high = [int(n) for n in ngram.split("-")]
+                yield {
+                    "name": "%s/%s/%d-%d" % (op, analyzer, low, high),
+                    "ops": [o.name for o in OP_PRESETS[op]],
+                    "analyzer": analyzer,
+                    "ngram_range": [low, high],
+                }
+
+
+def load_corpus(args):
+    """
+    Description: Returns the train and infer documents, either from a corpus file of the datasets or
+                 from the synthetic Zipfian generator. A fifth of the documents is kept for infer.
+    """
+    n_infer = max(args.n_docs // 4, 1)
+    if args.corpus is not None:
+        docs = IO.read_txt_corpus(args.corpus)[:args.n_docs + n_infer]
+        source = {"corpus": args.corpus}
+    else:
+        docs = zipf_corpus(args.n_docs + n_infer, n_terms=args.n_terms, doc_length=args.doc_length, seed=args.seed)
+        source = {"corpus": "zipf", "n_terms": args.n_terms, "doc_length": args.doc_length, "seed": args.seed}
+    return docs[:-n_infer], docs[-n_infer:], source
+
+
+def compare(results :dict, baseline :dict, tolerance :float):
+    """
+    Description: Compares the results with a baseline run. A metric regresses when it is worse than
+                 the baseline by more than 'tolerance', relative to the baseline.
+
+    Outputs:
+        regressions (List[dict]) : configuration, metric, baseline and current values of each regression.
+    """
+    base = {r["name"]: r for r in baseline["results"] if "skipped" not in r}
+    regressions = []
+    for result in results["results"]:
+        if "skipped" in result or result["name"] not in base:
+            continue
+        for metric, higher_is_better in COMPARED_METRICS.items():
+            old, new = base[result["name"]][metric], result[metric]
+            change = (new - old) / old if old > 0 else 0.0
+            worse = -change if higher_is_better else change
+            status = "REGRESSION" if worse > tolerance else "ok"
+            print("%-32s %-20s %12.2f -> %12.2f (%+6.1f%%) %s" % (
+                result["name"], metric, old, new, change * 100, status))
+            if worse > tolerance:
+                regressions.append({"name": result["name"], "metric": metric, "baseline": old, "current": new})
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(prog="TF-IDF Benchmark Suite")
+    parser.add_argument("--ops", type=str, default=",".join(OP_PRESETS), help="Comma separated op presets: %s." % ", ".join(OP_PRESETS))
+    parser.add_argument("--analyzers", type=str, default="word,char_wb", help="Comma separated analyzers.")
+    parser.add_argument("--ngrams", type=str, default="1-1,1-2", help="Comma separated n-gram ranges, e.g. '1-1,1-2'.")
+    parser.add_argument("--corpus", type=str, default=None, help="Text corpus to use instead of the synthetic one, one document per line.")
+    parser.add_argument("--n_docs", type=int, default=5000, help="Number of train documents.")
+    parser.add_argument("--n_terms", type=int, default=20000, help="Vocabulary size of the synthetic corpus.")
+    parser.add_argument("--doc_length", type=int, default=100, help="Mean number of words of the synthetic documents.")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the synthetic corpus.")
+    parser.add_argument("--repeat", type=int, default=3, help="Number of runs of each configuration, the median is reported.")
+    parser.add_argument("--no_isolate", action="store_true", help="Run every configuration in this process, peak RSS is then cumulative.")
+    parser.add_argument("--output", type=str, default=None, help="JSON file to write the results to.")
+    parser.add_argument("--compare", type=str, default=None, help="Baseline JSON file to compare the results with.")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="Relative change of a metric tolerated by the comparison.")
+    args = parser.parse_args()
+
+    train_docs, infer_docs, source = load_corpus(args)
+    run = run_config if args.no_isolate else run_isolated
+    results = {
+        "meta": dict(source, **{
+            "python": platform.python_version(), "numpy": np.__version__, "scipy": scipy.__version__,
+            "sklearn": sklearn.__version__, "platform": platform.platform(), "cpu_count": mp.cpu_count(),
+            "repeat": args.repeat, "isolated": not args.no_isolate,
+        }),
+        "results": [],
+    }
+    for config in configurations(args.ops.split(","), args.analyzers.split(","), args.ngrams.split(",")):
+        result = run(config, train_docs, infer_docs, args.repeat)
+        results["results"].append(result)
+        if "skipped" in result:
+            print("%-32s skipped: %s" % (config["name"], result["skipped"]), file=sys.stderr)
+        else:
+            print("%-32s train %10.1f docs/s  infer %10.1f docs/s  peak rss %8.1f MB" % (
+                config["name"], result["train_docs_per_sec"], result["infer_docs_per_sec"], result["peak_rss_mb"]),
+                file=sys.stderr)
+
+    if args.output is not None:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if args.compare is not None:
+        with open(args.compare) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        print("%d regression(s) found." % len(regressions))
+        sys.exit(1 if len(regressions) > 0 else 0)
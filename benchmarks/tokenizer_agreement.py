@@ -0,0 +1,119 @@
+"""
+Description: Compares the regex word tokenizer with NLTK's word tokenizer on a corpus: the share of
+             documents tokenized identically, the token level agreement and the throughput of both.
+             NLTK's reference is 'nltk.word_tokenize' if the Punkt models are installed, otherwise
+             the same Treebank tokenizer on the sentences of an untrained Punkt splitter, which does
+             not know the English abbreviations; the abbreviation list of the regex tokenizer is
+             then disabled to compare like with like.
+
+Usage:
+    python3 -m benchmarks.tokenizer_agreement --corpus datasets/podcast_transcripts/processed/train.txt
+    python3 -m benchmarks.tokenizer_agreement --n_docs 2000 --show 5
+"""
+import argparse
+import json
+import sys
+import time
+from collections import Counter
+
+from src.tokenizers.regex_word_tokenizer import RegexWordTokenizer
+from src.tokenizers.resources import has_nltk_resource, tokenizer_resources
+from src.utils import IO
+
+
+# English sentences exercising the Treebank rules: contractions, quotes, abbreviations, numbers, final periods
+SAMPLE_SENTENCES = [
+    "We're trying to manipulate the Radio Playhouse listeners, aren't we?",
+    "I guess \"manipulate\" has the tune of a negative connotation.",
+    "Keep going, baby. You're on a roll. You're on such a roll here. Sure.",
+    "Dr. Smith said the U.S. economy grew 3.5% in 2019, didn't he?",
+    "She'll arrive at 10:30 a.m. on Jan. 5th; don't be late!",
+    "\"It's fine,\" he said -- but it wasn't (not really).",
+    "Mr. and Mrs. O'Neil couldn't find the café's address: 221B Baker St.",
+    "The price is $12.99, or about €11... give or take.",
+    "They'd've gone if they'd known; I'm sure you'd agree.",
+    "Email me at someone@example.com or call 555-0199 -- whichever's easier.",
+    "Wait... what?! That's 'impossible', isn't it?",
+    "Prof. Lee's lab (est. 1998) has published 40+ papers, e.g. on NLP.",
+]
+
+
+def sample_corpus(n_docs :int):
+    """
+    Description: Zipfian pseudo-word documents of 'benchmarks.corpus', each followed by one of the
+                 bundled English sentences, used when no corpus file is given.
+    """
+    from benchmarks.corpus import zipf_corpus
+    docs = zipf_corpus(n_docs, doc_length=30)
+    return [doc + " " + SAMPLE_SENTENCES[i % len(SAMPLE_SENTENCES)] for i, doc in enumerate(docs)]
+
+
+def nltk_reference():
+    """
+    Description: Returns NLTK's word tokenizer and whether it uses the trained English Punkt models.
+    """
+    if all(has_nltk_resource(name) for name in tokenizer_resources()):
+        from nltk import word_tokenize
+        return word_tokenize, True
+    from nltk.tokenize import NLTKWordTokenizer
+    from nltk.tokenize.punkt import PunktSentenceTokenizer
+    sentences, words = PunktSentenceTokenizer(), NLTKWordTokenizer()
+    return (lambda text: [token for sent in sentences.tokenize(text) for token in words.tokenize(sent)]), False
+
+
+def throughput(tokenize, docs, repeat :int):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for doc in docs:
+            tokenize(doc)
+        best = min(best, time.perf_counter() - start)
+    return len(docs) / best
+
+
+def compare(docs, repeat :int=3, show :int=0):
+    """
+    Description: Tokenizes the documents with both tokenizers.
+
+    Outputs:
+        result (dict) : document and token agreement rates, docs/sec of both tokenizers and speedup.
+    """
+    reference, trained = nltk_reference()
+    regex = RegexWordTokenizer() if trained else RegexWordTokenizer(abbreviations=None)
+
+    same_docs, common, total, shown = 0, 0, 0, 0
+    for doc in docs:
+        expected, tokens = reference(doc), regex(doc)
+        if expected == tokens:
+            same_docs += 1
+        elif shown < show:
+            shown += 1
+            print("NLTK :", expected, "\nREGEX:", tokens, "\n", file=sys.stderr)
+        common += sum((Counter(expected) & Counter(tokens)).values())
+        total += max(len(expected), len(tokens))
+
+    nltk_dps, regex_dps = throughput(reference, docs, repeat), throughput(regex, docs, repeat)
+    return {
+        "n_docs": len(docs),
+        "reference": "word_tokenize" if trained else "untrained_punkt+treebank",
+        "document_agreement": same_docs / len(docs),
+        "token_agreement": common / max(total, 1),
+        "nltk_docs_per_sec": nltk_dps,
+        "regex_docs_per_sec": regex_dps,
+        "speedup": regex_dps / nltk_dps,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(prog="Tokenizer Agreement Benchmark")
+    parser.add_argument("--corpus", type=str, default=None, help="Corpus .txt file, Zipfian documents with bundled English sentences if not given.")
+    parser.add_argument("--n_docs", type=int, default=5000, help="Maximum number of documents to compare.")
+    parser.add_argument("--repeat", type=int, default=3, help="Number of timed passes, the fastest is reported.")
+    parser.add_argument("--show", type=int, default=0, help="Number of disagreeing documents to print to stderr.")
+    args = parser.parse_args()
+
+    if args.corpus is not None:
+        docs = [doc for doc in IO.read_txt_corpus(args.corpus)[:args.n_docs] if len(doc) > 0]
+    else:
+        docs = sample_corpus(args.n_docs)
+    print(json.dumps(compare(docs, args.repeat, args.show), indent=2))
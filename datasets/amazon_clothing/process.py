@@ -1,17 +1,18 @@
 import os
+import sys
 import json
+import argparse
 
-inp_path = "raw/Clothing_Shoes_and_Jewelry_5.json"
-out_path = "processed/train.txt"
-
-with open(inp_path, "r") as f:
-    lines = f.readlines()
-
-f_out = open(out_path, "w")
-for line in lines:
-    d = json.loads(line)
-    f_out.write(d["reviewText"].replace("\n", "").strip() + "\n")
-
-f_out.close()
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+from src.utils import IO
 
+parser = argparse.ArgumentParser(prog="Amazon Clothing Corpus Extraction")
+parser.add_argument("--inp_path", type=str, default="raw/reviews_Clothing_Shoes_and_Jewelry_5.json.gz",
+                    help="Reviews .json lines file, optionally compressed as .gz, .bz2 or .xz")
+parser.add_argument("--out_path", type=str, default="processed/train.txt")
+parser.add_argument("--n_jobs", type=int, default=-1, help="Number of worker processes, -1 to use all the cores.")
+args = parser.parse_args()
 
+os.makedirs(os.path.dirname(args.out_path) or ".", exist_ok=True)
+stats = IO.create_corpus_txt_from_json_list_file(args.inp_path, args.out_path, "reviewText", n_jobs=args.n_jobs)
+print(json.dumps(stats, indent=2))
@@ -1,25 +1,19 @@
 import os
+import sys
 import json
-from tqdm import tqdm
+import argparse
 
-inp_paths = [os.path.join("raw", file) for file in os.listdir("raw") if "json" in file]
-out_paths = [
-    os.path.join("processed", part + ".txt") for part in [
-        sub[:sub.find("-")] for sub in os.listdir("raw") if "json" in sub]
-]
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+from src.utils import IO
 
-for inp_path, out_path in zip(inp_paths, out_paths):
-
-    with open(inp_path, "r") as f:
-        d = json.load(f)
-
-    f_out = open(out_path, "w")
-
-    for k in tqdm(d.keys()):
-        for el in d[k]:
-            txt = el["utterance"].replace("\n", "").strip()
-            f_out.write(txt + "\n")
-
-    f_out.close()
+parser = argparse.ArgumentParser(prog="Podcast Transcripts Corpus Extraction")
+parser.add_argument("--n_jobs", type=int, default=-1, help="Number of files to process concurrently, -1 to use all the cores.")
+args = parser.parse_args()
 
+inp_files = [file for file in sorted(os.listdir("raw")) if "json" in file]
+inp_paths = [os.path.join("raw", file) for file in inp_files]
+out_paths = [os.path.join("processed", file[:file.find("-")] + ".txt") for file in inp_files]
 
+os.makedirs("processed", exist_ok=True)
+for stats in IO.create_corpus_txt_from_json_files(inp_paths, out_paths, "utterance", n_jobs=args.n_jobs):
+    print(json.dumps(stats))
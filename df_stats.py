@@ -0,0 +1,74 @@
+import argparse
+import time
+
+from src.models import TfIdfModel, merge_term_stats_files
+from src.types import TextOps
+
+
+parser = argparse.ArgumentParser(
+    prog = 'TF-IDF Term Statistics',
+    description = 'Fits a TF-IDF model over corpus shards on several machines: each shard is counted into a '
+                  'document frequency statistics file, the files are merged in any grouping and the model '
+                  'is fitted from them without moving the texts.')
+commands = parser.add_subparsers(dest='command', required=True)
+
+collect = commands.add_parser('collect', help='Counts the document frequencies of a corpus shard into a statistics file.')
+collect.add_argument('-c', '--corpus', type=str, required=True, help='txt file path of the corpus shard.')
+collect.add_argument('-o', '--out', type=str, required=True, help='Path of the statistics file, compressed if it ends with .gz')
+collect.add_argument('--chunk_size', default=10000, type=int, help='Number of documents to analyze at once.')
+collect.add_argument('--lower', action='store_true', help='Lower the texts if present.')
+collect.add_argument('--nodigit', action='store_true', help='Removes digits from the texts, if present.')
+collect.add_argument('--nopunc', action='store_true', help='Removes punctuations from the texts, if present.')
+collect.add_argument('--ascii', action='store_true', help='Strip the texts with ascii, if present.')
+collect.add_argument('--unicode', action='store_true', help='Strip the texts with unicode, if present.')
+collect.add_argument('--lemmatize', action='store_true', help='Lemmatize the texts, if present.')
+collect.add_argument('--stem', action='store_true', help='Stem the texts, if present.')
+collect.add_argument('--word_tokenizer', default='nltk', type=str, choices=['nltk', 'regex'], help='Splitter of the texts before lemmatization / stemming.')
+collect.add_argument('--batch_normalize', action='store_true', help='Lemmatize / stem each distinct token of the shard once, if present.')
+collect.add_argument('--stop_words', type=str, default=None, help="List the stop words with the format \"w1,w2,w3...,wn\".")
+collect.add_argument('--ngram_max', default=1, type=int, help='Upper boundary of the word n-grams.')
+
+merge = commands.add_parser('merge', help='Merges statistics files of disjoint shards into one, streaming them.')
+merge.add_argument('-i', '--inputs', type=str, nargs='+', required=True, help='Paths of the statistics files.')
+merge.add_argument('-o', '--out', type=str, required=True, help='Path of the merged statistics file.')
+
+fit = commands.add_parser('fit', help='Fits a model from statistics files and saves it.')
+fit.add_argument('-i', '--inputs', type=str, nargs='+', required=True, help='Paths of the statistics files.')
+fit.add_argument('-o', '--out', type=str, required=True, help='Directory to save the fitted model into.')
+fit.add_argument('--min_df', default=0.02, type=float, help='Filter ratio of min. occurring items. In range: [0, 1)')
+fit.add_argument('--max_df', default=0.98, type=float, help='Filter ratio of max. occurring items. In range: (0, 1]')
+fit.add_argument('--max_features', default=None, type=int, help='Maximum number of feature items to select.')
+
+args = parser.parse_args()
+start = time.perf_counter()
+
+if args.command == 'collect':
+    op_flags = [
+        (args.lower, TextOps.LOWER), (args.nodigit, TextOps.DIGITS), (args.nopunc, TextOps.PUNCTUATIONS),
+        (args.ascii, TextOps.ASCII), (args.unicode, TextOps.UNICODE), (args.lemmatize, TextOps.LEMMATIZE),
+        (args.stem, TextOps.STEM), (args.stop_words is not None, TextOps.STOP_WORDS),
+    ]
+    op_set = {op for flag, op in op_flags if flag}
+    print("[INFO] Counting the shard with ops -->", " ".join(sorted(op.name for op in op_set)))
+
+    tf_idf = TfIdfModel(
+        op_set,
+        stop_words=args.stop_words.split(",") if args.stop_words is not None else None,
+        ngram_range=(1, args.ngram_max),
+        word_tokenizer=args.word_tokenizer,
+        batch_normalize=args.batch_normalize,
+    )
+    stats = tf_idf.collect_term_stats(args.corpus, args.out, chunk_size=args.chunk_size)
+    print("--> Documents: %d, terms: %d" % (stats.n_docs, len(stats)))
+
+elif args.command == 'merge':
+    header, _ = merge_term_stats_files(args.inputs, args.out)
+    print("--> Merged %d files, documents: %d" % (len(args.inputs), header["n_docs"]))
+
+else:
+    tf_idf = TfIdfModel.from_term_stats(args.inputs, min_df=args.min_df, max_df=args.max_df,
+                                        max_features=args.max_features)
+    tf_idf.save(args.out)
+    print("--> Documents: %d, features: %d" % (tf_idf.term_stats_.n_docs, len(tf_idf.vocabulary_)))
+
+print("--> Seconds: %.2f" % (time.perf_counter() - start))
@@ -1,9 +1,11 @@
 import argparse
+import cProfile
+import pstats
 import numpy as np
 
 from src.models import TfIdfModel
 from src.types import TextOps
-from src.utils import IO, Visualizer
+from src.utils import IO, Visualizer, AnalysisCache
 
 
 parser = argparse.ArgumentParser(
@@ -20,6 +22,11 @@ parser.add_argument('--ascii', action='store_true', help='Strip the texts with a
 parser.add_argument('--unicode', action='store_true', help='Strip the texts with unicode, if present.')
 parser.add_argument('--lemmatize', action='store_true', help='Lemmatize the texts, if present.')
 parser.add_argument('--stem', action='store_true', help='Stem the texts, if present.')
+parser.add_argument('--word_tokenizer', default='nltk', type=str, choices=['nltk', 'regex'], help='Splitter of the texts before lemmatization / stemming, regex is faster and needs no Punkt models.')
+parser.add_argument('--batch_normalize', action='store_true', help='Lemmatize / stem each distinct token of the corpus once instead of every occurrence, if present.')
+parser.add_argument('--normalize_n_jobs', default=1, type=int, help='Number of processes that normalize the vocabulary with --batch_normalize, -1 to use all the cores.')
+parser.add_argument('--vocabulary_budget', default=None, type=int, help='Builds the vocabulary in bounded memory, counting at most this many candidate terms, if present.')
+parser.add_argument('--n_jobs', default=1, type=int, help='Number of processes that count the training corpus and transform the validation corpus, -1 to use all the cores.')
 parser.add_argument(
     '--stop_words', type=str, default=None, 
     help="List the stop words with the format \"w1,w2,w3...,wn\" if they are custom, \
@@ -29,7 +36,20 @@ parser.add_argument('--min_df', default=0.02, type=float, help='Filter ratio of
 parser.add_argument('--max_df', default=0.98, type=float, help='Filter ratio of max. occurring items. In range: (0, 1]')
 parser.add_argument('--max_features', default=None, type=int, help='Maximum number of feature items to select.')
 
+parser.add_argument('--sparse', action='store_true', help='Keep the transform results as sparse matrices, if present.')
+parser.add_argument('--memory_budget_mb', default=None, type=int, help='Memory limit of each transform result in MB: results are made sparse / float32 to fit, or written in chunks (.npz, .mtx or .tsv outputs). The training CSR matrix is still built in memory.')
+parser.add_argument('--dtype', default='float64', type=str, choices=['float64', 'float32'], help='Type of the transform results.')
+
+parser.add_argument('--train_out', default='train_result.csv', type=str, help='File to save the fit transform result to, the format is picked by the extension: .csv, .npz, .mtx or .tsv')
+parser.add_argument('--val_out', default='val_result.csv', type=str, help='File to save the validation transform result to, the format is picked by the extension: .csv, .npz, .mtx or .tsv')
+
 parser.add_argument('--visualize', action='store_true', help='Visualize the heatmap bad closeness of validation data, if present.')
+parser.add_argument('--stats', action='store_true', help='Print the time, characters and tokens of each pipeline stage, if present.')
+parser.add_argument('--stats_memory', action='store_true', help='Also track the allocation peak of each pipeline stage (slower), if present.')
+parser.add_argument('--profile', default=None, type=str, help='Path to dump the cProfile stats of the fit and transform to.')
+parser.add_argument('--analysis_cache', default=None, type=str, help='SQLite file to keep the analyzed documents in, so that repeated runs skip the preprocessing and tokenization.')
+parser.add_argument('--analysis_cache_mb', default=1024, type=int, help='Size cap of the analysis cache in MB, least recently used documents are evicted.')
+parser.add_argument('--vis_items', default=50, type=int, help='Maximum number of features to visualize the closeness of.')
 
 args = parser.parse_args()
 
@@ -87,11 +107,26 @@ tf_idf  = TfIdfModel(
     max_df=args.max_df, 
     min_df=args.min_df,
     max_features=args.max_features,
+    sparse_output=args.sparse,
+    dtype=np.dtype(args.dtype).type,
+    word_tokenizer=args.word_tokenizer,
+    batch_normalize=args.batch_normalize,
+    normalize_n_jobs=args.normalize_n_jobs,
+    vocabulary_budget=args.vocabulary_budget,
+    memory_budget=args.memory_budget_mb * 1024 ** 2 if args.memory_budget_mb is not None else None,
+    analysis_cache=AnalysisCache(args.analysis_cache, max_bytes=args.analysis_cache_mb * 1024 ** 2)
+                   if args.analysis_cache is not None else None,
 )
 
+if args.stats or args.stats_memory:
+    stats = tf_idf.enable_stats(track_memory=args.stats_memory)
+if args.profile is not None:
+    profiler = cProfile.Profile()
+    profiler.enable()
+
 # Fit the model with the train data
 
-out = tf_idf.train(tr_data)
+out = tf_idf.train(tr_data, n_jobs=args.n_jobs, out_path=args.train_out)
 feature_words = tf_idf.get_feature_names()
 
 print("\n--> Feature Names: Size of", len(feature_words))
@@ -100,15 +135,36 @@ print(feature_words)
 print("\n--> Stop Words:")
 print(tf_idf.get_stop_words())
 
-print("\n--> Saving fit transform result:", out.shape)
-IO.save_to_csv(out, "train_result.csv", colnames=feature_words)
+if args.memory_budget_mb is not None:
+    print("\n--> Fit transform output plan:", tf_idf.output_plan_)
+if out is not None:
+    print("\n--> Saving fit transform result:", out.shape)
+    IO.save_matrix(out, args.train_out, colnames=feature_words)
 
 # Evaluate the model with validateion data
 
 if val_data is not None:
-    val_out = tf_idf.infer(val_data)
-    print("\n--> Val transform result:", val_out.shape)
-    IO.save_to_csv(out, "val_result.csv", colnames=feature_words)
-    if args.visualize:
+    val_out = tf_idf.infer(val_data, n_jobs=args.n_jobs, out_path=args.val_out)
+    if args.memory_budget_mb is not None:
+        print("\n--> Val transform output plan:", tf_idf.output_plan_)
+    if val_out is not None:
+        print("\n--> Val transform result:", val_out.shape)
+        IO.save_matrix(val_out, args.val_out, colnames=feature_words)
+    if args.visualize and val_out is not None:
         Visualizer.vis_heatmap(val_out, "val_data_heatmap.png")
-        Visualizer.vis_closeness(val_out, "val_data_closeness.png", labels=feature_words)
\ No newline at end of file
+        Visualizer.vis_closeness(val_out, "val_data_closeness.png", labels=feature_words, max_items=args.vis_items)
+
+# Report the instrumentation of the fit and transform
+
+if args.profile is not None:
+    profiler.disable()
+    profiler.dump_stats(args.profile)
+    print("\n--> cProfile stats are saved to", args.profile)
+    pstats.Stats(profiler).sort_stats("cumulative").print_stats(15)
+
+if args.stats or args.stats_memory:
+    print("\n--> Pipeline stage stats:")
+    print(stats.report())
+
+if args.analysis_cache is not None:
+    print("\n--> Analysis cache:", tf_idf.analysis_cache.info())
@@ -1 +1,6 @@
-from .tf_idf import TfIdfModel
\ No newline at end of file
+from .tf_idf import TfIdfModel
+from .hashing_tf_idf import HashingTfIdfModel
+from .term_stats import TermStatistics, merge_term_stats_files
+from .sorted_vocabulary import SortedVocabulary
+from .space_saving import SpaceSaving
+from .output_plan import OutputPlan
\ No newline at end of file
@@ -0,0 +1,501 @@
+# STD Libraries
+from typing import List, Union, Iterable
+from itertools import islice
+from contextlib import nullcontext, contextmanager
+import copy
+import math
+import multiprocessing as mp
+import os
+# Custom Libraries
+import numpy as np
+import scipy.sparse as sp
+# User-defined Files
+from ..tokenizers import LemmaTokenizer, StemTokenizer
+from ..tokenizers.base_tokenizer import BaseTokenizer, _init_normalize_worker
+from ..preprocessors import DigitPreprocessor, PuncPreprocessor, MultiPreprocessor, ExternalPreprocessor, FusedPreprocessor
+from ..constants import ENGLISH_STOP_WORDS
+from ..types import TextOps
+from ..utils.pipeline_stats import PipelineStats
+from ..utils.analysis_cache import AnalysisCache, analysis_fingerprint
+
+
+_WORKER_MODEL = None
+
+class _GrowingVocabulary(dict):
+    """
+    Description: Vocabulary that gives a new term the next index when it is first looked up, so that
+                 the indices follow the first occurrences of the terms. If 'candidates' is not None,
+                 other terms are not added and raise a KeyError, like the terms that are not in a
+                 fixed vocabulary.
+    """
+
+    def __init__(self, candidates :set=None):
+        super().__init__()
+        self.candidates = candidates
+
+    def __missing__(self, term :str):
+        if self.candidates is not None and term not in self.candidates:
+            raise KeyError(term)
+        index = self[term] = len(self)
+        return index
+
+
+def _init_infer_worker(model):
+    """
+    Description: Process pool initializer that keeps the model in the worker, so that the
+                 vocabulary and idf are handed over once per worker instead of once per shard.
+    """
+    global _WORKER_MODEL
+    _WORKER_MODEL = model
+
+def _infer_shard(shard :List[str]):
+    return _WORKER_MODEL.transform(shard)
+
+def _count_shard(args :tuple):
+    """
+    Description: Counts the terms of a shard of the corpus into a local vocabulary, whose indices
+                 follow the first occurrences of the terms in the shard, and its count matrix.
+                 With a fixed vocabulary, only the count matrix is returned.
+    """
+    shard, fixed_vocab = args
+    model = _WORKER_MODEL
+    if fixed_vocab:
+        return None, model._count_vocab(shard, True)[1]
+    # A growing vocabulary counted as a fixed one, so that an empty shard is not an error
+    model.vocabulary_ = _GrowingVocabulary(model._vocabulary_candidates)
+    vocabulary, X = model._count_vocab(shard, True)
+    return dict(vocabulary), X
+
+class BaseModel:
+    """
+    Description: Shared behaviour of the models that are built on scikit-learn's vectorizers.
+                 Translates the op_set into scikit-learn's preprocessing, tokenization and 
+                 stop word parameters, and formats or parallelizes the transform outputs.
+                 Has to be placed before the scikit-learn vectorizer in the base classes.
+    """
+
+    # PipelineStats of the instrumented model, None when not instrumented
+    stats = None
+    # AnalysisCache of the analyzed documents, None when not cached
+    analysis_cache = None
+    # Number of documents whose distinct tokens are normalized together in 'batch_normalize' mode
+    normalize_batch_size = 10000
+    # True while the documents given to scikit-learn are already analyzed token lists
+    _pre_analyzed = False
+    # (n_jobs, shard_size) of the parallel counting of 'train', None when it is serial
+    _fit_parallelism = None
+    # Terms the vocabulary is restricted to while they are counted exactly, None when not restricted
+    _vocabulary_candidates = None
+    # Number of documents transformed to estimate the non-zero entries of a memory-budgeted result
+    output_sample_size = 1000
+
+    def enable_stats(self, track_memory :bool=False):
+        """
+        Description: Starts recording per-stage call counts, timings, characters / tokens processed
+                     and, if 'track_memory' is set, allocation peaks of the analysis pipeline and of
+                     the fit / transform steps. The stages of the pipeline are named after their
+                     classes, e.g. 'FusedPreprocessor' or 'LemmaTokenizer'; set 'fuse_preprocessors'
+                     to False to see each preprocessing operation separately. Stages run in the
+                     worker processes of a parallel inference are not recorded.
+
+        Inputs:
+            track_memory (bool) : Whether to track the allocation peaks with tracemalloc, which
+                                  slows down every allocation.
+
+        Outputs:
+            stats (PipelineStats) : The stats object the calls are recorded into.
+        """
+        self.disable_stats()
+        self.stats = PipelineStats(track_memory)
+        return self.stats
+
+    def disable_stats(self):
+        """
+        Description: Stops recording, the stats object returned by 'enable_stats' keeps its counters.
+        """
+        if self.stats is not None:
+            self.stats.close()
+        self.stats = None
+        if isinstance(self.tokenizer, BaseTokenizer):
+            self.tokenizer.stats = None
+
+    def _stage(self, name :str):
+        """
+        Description: Context manager recording the enclosed block as a stage, if stats are enabled.
+        """
+        return nullcontext() if self.stats is None else self.stats.stage(name)
+
+
+    def _set_analysis_cache(self, analysis_cache :Union[str, AnalysisCache]):
+        """
+        Description: Sets the persistent cache of analyzed documents, opening it if a path is given.
+        """
+        assert analysis_cache is None or type(analysis_cache) == str or isinstance(analysis_cache, AnalysisCache), \
+            "Analysis cache must be None, a path or an AnalysisCache !"
+        self.analysis_cache = AnalysisCache(analysis_cache) if type(analysis_cache) == str else analysis_cache
+
+
+    def _analysis_settings(self):
+        """
+        Description: Returns the settings that determine the output of the analyzer, None if it
+                     depends on a user given callable that cannot be fingerprinted.
+        """
+        if callable(self.analyzer) or self.preprocessor is not None:
+            return None
+        if self.tokenizer is not None and not isinstance(self.tokenizer, BaseTokenizer):
+            return None
+
+        import sklearn
+        from importlib.metadata import version, PackageNotFoundError
+        try:
+            nltk_version = version("nltk") if self.tokenizer is not None else None
+        except PackageNotFoundError:
+            nltk_version = None
+
+        return {
+            "op_set": sorted(op.name for op in self.op_set),
+            "analyzer": self.analyzer,
+            "ngram_range": list(self.ngram_range),
+            "stop_words": None if self.stop_words is None else sorted(self.stop_words),
+            "lowercase": self.lowercase,
+            "strip_accents": self.strip_accents,
+            "token_pattern": self.token_pattern,
+            "encoding": self.encoding,
+            "decode_error": self.decode_error,
+            "tokenizer": None if self.tokenizer is None else type(self.tokenizer).__name__,
+            "word_tokenizer": None if self.tokenizer is None else self.tokenizer.word_tokenizer,
+            "fuse_preprocessors": self.fuse_preprocessors,
+            "sklearn": sklearn.__version__,
+            "nltk": nltk_version,
+        }
+
+
+    def _flush_analysis_cache(self):
+        """
+        Description: Writes the buffered entries of the analysis cache, if it is set.
+        """
+        if self.analysis_cache is not None:
+            self.analysis_cache.flush()
+
+
+    def _batch_normalizes(self):
+        """
+        Description: Whether the documents are analyzed in two phases, which requires the word
+                     analyzer with a lemmatizer / stemmer tokenizer.
+        """
+        return self.batch_normalize and self.analyzer == "word" and isinstance(self.tokenizer, BaseTokenizer)
+
+
+    @contextmanager
+    def _analyzed_input(self):
+        """
+        Description: Makes the analyzer of scikit-learn pass the documents through, while they are
+                     token lists analyzed by '_iter_batch_analyzed'.
+        """
+        self._pre_analyzed = True
+        try:
+            yield
+        finally:
+            self._pre_analyzed = False
+
+
+    def _iter_batch_analyzed(self, raw_documents :Iterable[str]):
+        """
+        Description: Two-phase alternative of the word analyzer for lemmatizer / stemmer tokenizers.
+                     For each batch of 'normalize_batch_size' documents, the documents are split into
+                     surface tokens and only the tokens that were not seen in the previous batches
+                     are normalized, each exactly once, optionally in a process pool of
+                     'normalize_n_jobs' workers. Then the terms of each document are looked up in the
+                     surface -> normalized map, and the stop words and n-grams are applied as in
+                     scikit-learn's analyzer, so the terms are the same as the per-token path.
+
+        Inputs:
+            raw_documents (Iterable[string]) : string documents.
+
+        Outputs:
+            terms (Iterator[List[string]])   : analyzed terms of each document, in order.
+        """
+        assert type(raw_documents) != str, "Iterable over raw text documents expected, string object received."
+        preprocess, tokenizer = self.build_preprocessor(), self.tokenizer
+        stop_words = self.get_stop_words()
+        n_jobs = os.cpu_count() if self.normalize_n_jobs == -1 else self.normalize_n_jobs
+        pool = mp.Pool(n_jobs, initializer=_init_normalize_worker, initargs=(tokenizer,)) if n_jobs > 1 else None
+
+        normalized = {}
+        try:
+            for chunk in self._iter_chunks(raw_documents, self.normalize_batch_size):
+                with self._stage("split_tokens"):
+                    surface = [tokenizer.split(preprocess(self.decode(doc))) for doc in chunk]
+                with self._stage("normalize_vocabulary"):
+                    new_tokens = dict.fromkeys(t for tokens in surface for t in tokens if t not in normalized)
+                    normalized.update(tokenizer.normalize_vocabulary(new_tokens, pool))
+                with self._stage("map_tokens"):
+                    terms = [self._word_ngrams([normalized[t] for t in tokens], stop_words) for tokens in surface]
+                yield from terms
+        finally:
+            if pool is not None:
+                pool.terminate()
+
+
+    def _iter_chunks(self, corpus :Iterable[str], chunk_size :int):
+        """
+        Description: Splits an iterable of documents into lists of at most 'chunk_size' documents.
+        """
+        assert type(corpus) != str, "Corpus has to be an iterable of string documents !"
+        corpus = iter(corpus)
+        while True:
+            chunk = list(islice(corpus, chunk_size))
+            if len(chunk) == 0:
+                break
+            yield chunk
+
+
+    def _transform_parallel(self, corpus :List[str], n_jobs :int, shard_size :int=None):
+        """
+        Description: Splits the documents into contiguous shards, calls 'transform' on them in a 
+                     process pool and stitches the CSR results back together in the original order.
+
+        Inputs:
+            corpus (List[string]) : list of string documents.
+            n_jobs (int)          : number of worker processes, -1 to use all the cores.
+            shard_size (int)      : number of documents in each shard. If None, the corpus is 
+                                    split into 4 shards per worker.
+        """
+        n_jobs = os.cpu_count() if n_jobs == -1 else n_jobs
+        if shard_size is None:
+            shard_size = math.ceil(len(corpus) / (4 * n_jobs))
+        shards = [corpus[i:i + shard_size] for i in range(0, len(corpus), shard_size)]
+
+        with mp.Pool(min(n_jobs, len(shards)), initializer=_init_infer_worker, 
+                     initargs=(self._get_inference_copy(),)) as pool:
+            return sp.vstack(pool.map(_infer_shard, shards, chunksize=1), format="csr")
+
+
+    @contextmanager
+    def _parallel_fit(self, n_jobs :int, shard_size :int=None):
+        """
+        Description: Makes '_count_vocab' count the documents in a process pool of 'n_jobs' workers
+                     while the model is fitted in the enclosed block.
+        """
+        self._fit_parallelism = (n_jobs, shard_size) if n_jobs != 1 else None
+        try:
+            yield
+        finally:
+            self._fit_parallelism = None
+
+
+    def _count_vocab_parallel(self, raw_documents :List[str], fixed_vocab :bool):
+        """
+        Description: Parallel alternative of scikit-learn's '_count_vocab'. The documents are split
+                     into contiguous shards that the workers count into local vocabularies and count
+                     matrices. The local vocabularies are merged in the order of the shards, so each
+                     term gets the index of its first occurrence in the corpus, as in the serial
+                     count; the columns of each shard are remapped to the merged indices and the
+                     shards are stacked in the original order. The merge runs as the shards arrive.
+
+        Inputs:
+            raw_documents (List[string]) : list of string documents.
+            fixed_vocab (bool)           : If True, the documents are counted against 'vocabulary_'.
+
+        Outputs:
+            vocabulary (dict)            : term to feature index mapping.
+            X (sp.csr_matrix)            : document-term count matrix.
+        """
+        n_jobs, shard_size = self._fit_parallelism
+        n_jobs = os.cpu_count() if n_jobs == -1 else n_jobs
+        if shard_size is None:
+            shard_size = math.ceil(len(raw_documents) / (4 * n_jobs))
+        shards = [raw_documents[i:i + shard_size] for i in range(0, len(raw_documents), shard_size)]
+
+        model = self._get_inference_copy()
+        model._fit_parallelism = None
+        if not fixed_vocab and hasattr(model, "vocabulary_"):
+            del model.vocabulary_
+
+        vocabulary = self.vocabulary_ if fixed_vocab else {}
+        counts = []
+        with mp.Pool(min(n_jobs, len(shards)), initializer=_init_infer_worker, initargs=(model,)) as pool:
+            for local_vocabulary, X in pool.imap(_count_shard, [(shard, fixed_vocab) for shard in shards], chunksize=1):
+                if not fixed_vocab:
+                    remap = np.empty(len(local_vocabulary), dtype=np.int64)
+                    for term, index in local_vocabulary.items():
+                        remap[index] = vocabulary.setdefault(term, len(vocabulary))
+                    X.indices = remap[X.indices].astype(X.indices.dtype, copy=False)
+                    X.has_sorted_indices = False
+                counts.append(X)
+
+        if not fixed_vocab and len(vocabulary) == 0:
+            raise ValueError("empty vocabulary; perhaps the documents only contain stop words")
+        for X in counts:
+            X.resize((X.shape[0], len(vocabulary)))
+        X = sp.vstack(counts, format="csr")
+        X.sort_indices()
+        return vocabulary, X
+
+
+    def _compute_idf(self, dfs :np.ndarray, n_docs :int):
+        """
+        Description: Computes the idf vector from document frequencies with the same formula and 
+                     dtype as scikit-learn's TfidfTransformer.
+
+        Inputs:
+            dfs (np.ndarray) : document frequency of each feature.
+            n_docs (int)     : number of documents the frequencies are counted from.
+
+        Outputs:
+            idf (np.ndarray) : inverse document frequency of each feature.
+        """
+        dtype = self.dtype if self.dtype in (np.float64, np.float32) else np.float64
+        df = dfs.astype(dtype)
+        df += float(self.smooth_idf)
+        idf = np.full_like(df, fill_value=n_docs + int(self.smooth_idf), dtype=dtype)
+        idf /= df
+        np.log(idf, out=idf)
+        idf += 1.0
+        return idf
+
+
+    def _get_inference_copy(self):
+        """
+        Description: Returns a shallow copy of the fitted model without the attributes that are
+                     only needed for fitting, to keep what is sent to the worker processes small.
+        """
+        model = copy.copy(self)
+        if hasattr(model, "term_stats_"):
+            del model.term_stats_
+        # Worker processes cannot start their own pools
+        model.normalize_n_jobs = 1
+        return model
+
+
+    def _format_output(self, X, plan=None):
+        """
+        Description: Returns the CSR result of scikit-learn as-is in sparse output mode,
+                     otherwise converts it to a dense numpy array. If an OutputPlan is given, its
+                     storage and dtype are used instead of 'sparse_output' and 'dtype'.
+        """
+        sparse, dtype = (plan.sparse, plan.dtype) if plan is not None else (self.sparse_output, self.dtype)
+        with self._stage("format_output"):
+            if sparse:
+                return sp.csr_matrix(X, dtype=dtype, copy=False)
+            return X.astype(dtype, copy=False).toarray()
+
+    
+    """ --------------------------------------------------------------------------------------
+    ----- GETTERS OF THE SKLEARN'S TFIDFVECTORIZER
+    -------------------------------------------------------------------------------------- """
+    
+    def _get_tokenizer(self):
+        """
+        Description: Sets Lemmatizer or Stemmer of NLTK as tokenizer, if requested.
+        """
+        assert TextOps.LEMMATIZE not in self.op_set or TextOps.STEM not in self.op_set, \
+            "Both Lemmatization and Stemmer cannot be applied together !"
+        
+        if TextOps.LEMMATIZE in self.op_set:
+            return LemmaTokenizer(self.token_cache_size, self.token_cache_policy, self.word_tokenizer)
+        elif TextOps.STEM in self.op_set:
+            return StemTokenizer(self.token_cache_size, self.token_cache_policy, self.word_tokenizer)
+        else:
+            return None
+    
+
+    def _get_strip_accent(self):
+        """
+        Description: Gets the requested strip accents, checks the operation set correctness,
+                     and returns the correct strip accent text for scikit-learn
+        """
+        assert TextOps.ASCII not in self.op_set or TextOps.UNICODE not in self.op_set, \
+            "Both ASCII and UNICODE cannot be applied together !"
+        
+        if TextOps.ASCII in self.op_set:
+            return "ascii"
+        elif TextOps.UNICODE in self.op_set:
+            return "unicode"
+        else:
+            return None
+
+    
+    def _get_stop_words(self, stop_words: Union[str, list]):
+        """
+        Description: Handles three different approaches:
+            1) If TextOps.STOP_WORD is not in op_set, then no stop words will be applied
+            2) If stop_words is a string and its value is '#default', detault stop words will be applied.
+            3) If a list of stop words are given, then these will be applied.
+
+        Outputs:
+            stop_words (List[string]) : final stop words to be applied to the corpus
+        """
+
+        if TextOps.STOP_WORDS not in self.op_set:
+            return None
+        
+        assert stop_words is not None, \
+            "If stop words will be discarded from the data, stop_words must be specified !"
+        
+        if type(stop_words) == str:
+            assert stop_words == "#default", \
+                "If stop_words is given as a string, only supported value is 'default' !"
+        elif type(stop_words) == list:
+            assert len(stop_words) > 0, \
+                "If stop words are given, it cannot be empty !"
+
+        if (len(stop_words) == 1 and stop_words[0] == '#default') or stop_words == "#default":
+            return ENGLISH_STOP_WORDS
+        else:
+            return stop_words
+    
+    
+    def build_preprocessor(self):
+        """
+        Description: Overrides of its parent's method since additional preprocessing 
+                     operations are also required. May add DigitPreprocessor or / and 
+                     PuncPreprocessor to the default preprocessor of scikit-learn's if requested.
+                     Unless a custom preprocessor is given, the operations are fused into a 
+                     single FusedPreprocessor when 'fuse_preprocessors' is set.
+        """
+        if self.fuse_preprocessors and self.preprocessor is None:
+            preprocessor = FusedPreprocessor(self.op_set)
+        else:
+            preprocessors = [ExternalPreprocessor(super().build_preprocessor())]
+            if TextOps.DIGITS in self.op_set:
+                preprocessors.append(DigitPreprocessor())
+            if TextOps.PUNCTUATIONS in self.op_set:
+                preprocessors.append(PuncPreprocessor())
+            preprocessor = MultiPreprocessor(preprocessors)
+
+        if self.stats is not None:
+            preprocessor.instrument(self.stats)
+        return preprocessor
+
+
+    def build_tokenizer(self):
+        """
+        Description: Attaches the stats to the NLTK tokenizers, or records scikit-learn's regular
+                     expression tokenizer as the 'regex_tokenize' stage, if stats are enabled.
+        """
+        tokenize = super().build_tokenizer()
+        if isinstance(tokenize, BaseTokenizer):
+            tokenize.stats = self.stats
+        elif self.stats is not None:
+            tokenize = self.stats.wrap("regex_tokenize", tokenize, count_tokens=True)
+        return tokenize
+
+
+    def build_analyzer(self):
+        """
+        Description: Answers the already analyzed documents from the analysis cache, if it is set,
+                     and records the whole analysis of each document as the 'analyze' stage, if
+                     stats are enabled. Analyzers that depend on user given callables are not cached.
+                     Passes the documents through while they are analyzed by '_iter_batch_analyzed'.
+        """
+        if self._pre_analyzed:
+            return list
+        analyze = super().build_analyzer()
+        if self.analysis_cache is not None:
+            settings = self._analysis_settings()
+            if settings is not None:
+                analyze = self.analysis_cache.wrap(analysis_fingerprint(settings), analyze)
+        if self.stats is not None:
+            analyze = self.stats.wrap("analyze", analyze, count_tokens=True)
+        return analyze
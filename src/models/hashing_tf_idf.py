@@ -0,0 +1,334 @@
+# STD Libraries
+from typing import List, Tuple, Set, Union, Callable
+import math
+# Custom Libraries
+import numpy as np
+import scipy.sparse as sp
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.preprocessing import normalize
+from sklearn.utils import murmurhash3_32
+# User-defined Files
+from .base_model import BaseModel
+from ..types import TextOps
+from ..utils.analysis_cache import AnalysisCache
+
+class HashingTfIdfModel(BaseModel, HashingVectorizer):
+    """
+        Description: Stateless TF_IDF Model Object Class that uses the hashing trick. Terms are
+                     processed with the same op_set preprocessing and tokenizers as TfIdfModel,
+                     but instead of a vocabulary, each term is mapped to one of 'n_features'
+                     buckets by a signed hash, so memory does not depend on the vocabulary size.
+                     Document frequencies and idf are kept per bucket. The object is inherited
+                     from scikit-learn's HashingVectorizer:
+                     https://scikit-learn.org/stable/modules/generated/sklearn.feature_extraction.text.HashingVectorizer.html
+
+        Attributes:
+            dfs_ (array of shape (n_features,))  : Number of documents each bucket occurs in.
+            n_docs_ (int)                        : Number of documents the model is fitted on.
+            idf_ (array of shape (n_features,))  : Inverse document frequency of each bucket.
+            reverse_map_ (Dict[int, List[str]])  : Terms seen in each bucket, at most 'max_reverse_terms'
+                                                   terms in total. Only for debugging the feature names.
+            reverse_map_complete_ (bool)         : True if every distinct term of the fitted corpus is
+                                                   in the reverse map.
+    """
+
+    def __init__(
+        self,
+        op_set             : Set[TextOps],
+        n_features         : int                  = 2 ** 20,
+        analyzer           : Union[str, Callable] = "word",
+        stop_words         : Union[str, List[str]]= None,
+        ngram_range        : Tuple[int, int]      = (1, 1),
+        binary             : bool                 = False,
+        alternate_sign     : bool                 = True,
+        norm               : str                  = "l2",
+        use_idf            : bool                 = True,
+        smooth_idf         : bool                 = True,
+        sublinear_tf       : bool                 = False,
+        sparse_output      : bool                 = False,
+        dtype              : type                 = np.float64,
+        max_reverse_terms  : int                  = 0,
+        token_cache_size   : int                  = None,
+        token_cache_policy : str                  = "lru",
+        word_tokenizer     : str                  = "nltk",
+        batch_normalize    : bool                 = False,
+        normalize_n_jobs   : int                  = 1,
+        fuse_preprocessors : bool                 = True,
+        analysis_cache     : Union[str, AnalysisCache] = None,
+        **kwargs,
+        ):
+
+        """
+        Description: Constructor of the Hashing TF_IDF Object.
+
+        Inputs:
+            op_set (Set[TextOps])         : Set of text processing operations to be applied to data.
+            n_features (int)              : Number of hash buckets, i.e. columns of the output matrix.
+            analyzer (string)             : Whether the feature should be made of word or character n-grams.
+                                            Options: ["word", "char", "char_wb"]
+            stop_words (List[string])     : Stop words to exclude that is specific to the corpus. If set
+                                            to 'default', default stop words will be used.
+            ngram_range (Tuple[int, int]) : The lower and upper boundary of the range of n-values for
+                                            different n-grams to be extracted.
+            binary (bool)                 : If True, all non-zero term counts are set to 1.
+            alternate_sign (bool)         : If True, the sign of each term's count is given by its hash,
+                                            so that collisions cancel out in expectation.
+            norm (string)                 : Norm of each output row. Options: ["l1", "l2", None]
+            use_idf (bool)                : If True, the counts are weighted by the idf of the buckets.
+            smooth_idf (bool)             : If True, one document containing every bucket is assumed.
+            sublinear_tf (bool)           : If True, counts are replaced by 1 + log(count), keeping the sign.
+            sparse_output (bool)          : If True, 'train' and 'infer' return the scipy CSR matrix as-is
+                                            instead of converting it to a dense numpy array.
+            dtype (type)                  : Type of the output matrix. Options: [np.float64, np.float32]
+            max_reverse_terms (int)       : Number of distinct terms to keep in the reverse map of the
+                                            buckets while fitting. 0 disables the reverse map.
+            token_cache_size (int)        : If not None, the lemmatizer / stemmer results of at most this
+                                            many distinct tokens are cached by the tokenizer.
+            token_cache_policy (string)   : Eviction policy of the token cache. Options: ["lru", "fifo"]
+            word_tokenizer (string)       : Splitter of the text before lemmatization / stemming. Options: ["nltk", "regex"]
+                                            "regex" follows the rules of 'nltk.word_tokenize' several times
+                                            faster and without the Punkt models.
+            batch_normalize (bool)        : If True, the distinct tokens of each batch of documents are
+                                            lemmatized / stemmed once and the documents are mapped through
+                                            the results, instead of normalizing every token occurrence.
+            normalize_n_jobs (int)        : Number of worker processes normalizing the distinct tokens in
+                                            'batch_normalize' mode, -1 to use all the cores.
+            fuse_preprocessors (bool)     : If True, the preprocessing operations are compiled into a single
+                                            FusedPreprocessor instead of a chain of preprocessors.
+            analysis_cache (Union[str, AnalysisCache]) : If not None, path of the SQLite file or the cache
+                                            that keeps the analyzed documents across runs.
+        """
+
+        assert type(n_features) == int and n_features > 0, "'n_features' should be a positive integer !"
+        assert callable(analyzer) or analyzer in ["word", "char", "char_wb"], \
+            "Analyzer can be a callable or one of word, char, or char_wb !"
+        assert len(ngram_range) == 2 and ngram_range[0] >= 1 and ngram_range[1] >= 1, \
+            "ngram_range must have 2 items and each item has to be >= 1 !"
+        assert dtype in [np.float64, np.float32], \
+            "dtype must be either np.float64 or np.float32 !"
+        assert normalize_n_jobs == -1 or normalize_n_jobs > 0, \
+            "normalize_n_jobs should be a positive integer or -1 !"
+        assert max_reverse_terms >= 0, "'max_reverse_terms' should be a non-negative integer !"
+
+        self.op_set = op_set if op_set is not None else {}
+        self.use_idf = use_idf
+        self.smooth_idf = smooth_idf
+        self.sublinear_tf = sublinear_tf
+        self.sparse_output = sparse_output
+        self.max_reverse_terms = max_reverse_terms
+        self.token_cache_size = token_cache_size
+        self.token_cache_policy = token_cache_policy
+        self.word_tokenizer = word_tokenizer
+        self.batch_normalize = batch_normalize
+        self.normalize_n_jobs = normalize_n_jobs
+        self.fuse_preprocessors = fuse_preprocessors
+        self._set_analysis_cache(analysis_cache)
+
+        super().__init__(
+            input="content",
+            strip_accents=self._get_strip_accent(),
+            lowercase=TextOps.LOWER in self.op_set,
+            tokenizer=self._get_tokenizer(),
+            analyzer=analyzer,
+            stop_words=self._get_stop_words(stop_words),
+            ngram_range=ngram_range,
+            n_features=n_features,
+            binary=binary,
+            norm=norm,
+            alternate_sign=alternate_sign,
+            dtype=dtype,
+            **kwargs
+            )
+
+
+    def train(self, corpus :List[str]):
+        """
+        Description: An alias to the 'fit_transform' method.
+
+        Inputs:
+            corpus (List[string]) : list of string documents.
+
+        Outputs:
+            X (Union[np.ndarray, sp.csr_matrix]) : 2D Tf-idf-weighted document-bucket matrix,
+                                                   sparse if 'sparse_output' is set.
+        """
+        assert corpus is not None, "Corpus cannot be None !"
+        assert type(corpus) == list, "Corpus has to be list of string documents !"
+        assert len(corpus) > 0, "Corpus has to include at least one document!"
+
+        return self._format_output(self.fit_transform(corpus))
+
+
+    def infer(self, corpus :List[str], n_jobs :int=1, shard_size :int=None):
+        """
+        Description: An alias to the 'transform' method. If 'n_jobs' is not 1, the documents are
+                     transformed in a process pool as in TfIdfModel.infer.
+
+        Inputs:
+            corpus (List[string]) : list of string documents.
+            n_jobs (int)          : number of worker processes, -1 to use all the cores.
+            shard_size (int)      : number of documents in each shard.
+
+        Outputs:
+            X (Union[np.ndarray, sp.csr_matrix]) : 2D Tf-idf-weighted document-bucket matrix,
+                                                   sparse if 'sparse_output' is set.
+        """
+        assert corpus is not None, "Corpus cannot be None !"
+        assert type(corpus) == list, "Corpus has to be list of string documents !"
+        assert len(corpus) > 0, "Corpus has to include at least one document!"
+        assert n_jobs == -1 or n_jobs > 0, "n_jobs should be a positive integer or -1 !"
+        assert shard_size is None or shard_size > 0, "Shard size should be a positive integer !"
+
+        if n_jobs == 1:
+            return self._format_output(self.transform(corpus))
+        return self._format_output(self._transform_parallel(corpus, n_jobs, shard_size))
+
+
+    def fit(self, raw_documents, y=None):
+        """
+        Description: Counts the document frequencies of the buckets and computes their idf.
+        """
+        self.fit_transform(raw_documents)
+        return self
+
+
+    def fit_transform(self, raw_documents, y=None):
+        """
+        Description: Fits the bucket idf and returns the Tf-idf-weighted document-bucket matrix.
+        """
+        self._validate_params()
+        self._validate_ngram_range()
+        self._warn_for_unused_params()
+
+        self.reverse_map_ = {}
+        self.reverse_map_complete_ = True
+        X = self._count(raw_documents, track_terms=self.max_reverse_terms > 0)
+
+        self.n_docs_ = X.shape[0]
+        self.dfs_ = np.bincount(X.indices, minlength=self.n_features)
+        if self.use_idf:
+            self.idf_ = self._compute_idf(self.dfs_, self.n_docs_)
+        return self._weight(X)
+
+
+    def transform(self, raw_documents):
+        """
+        Description: Returns the Tf-idf-weighted document-bucket matrix using the fitted bucket idf.
+        """
+        assert hasattr(self, "dfs_"), "Model has to be fitted before inference !"
+        return self._weight(self._count(raw_documents))
+
+
+    def get_bucket(self, term :str):
+        """
+        Description: Returns the bucket (feature index) of an analyzed term, computed exactly as
+                     scikit-learn's FeatureHasher does.
+        """
+        h = murmurhash3_32(term, seed=0, positive=False)
+        if h == -2147483648:
+            return (2147483647 - (self.n_features - 1)) % self.n_features
+        return abs(h) % self.n_features
+
+
+    def get_feature_names(self):
+        """
+        Description: Returns a name for each bucket by joining the terms in its reverse map with '|'.
+                     Buckets without any recorded term have empty names.
+        """
+        assert hasattr(self, "reverse_map_"), "Model has to be fitted before getting feature names !"
+        return ["|".join(self.reverse_map_.get(i, [])) for i in range(self.n_features)]
+
+
+    def collision_report(self):
+        """
+        Description: Reports how crowded the buckets are, to help sizing 'n_features'. The number of
+                     distinct terms is estimated from the number of occupied buckets by linear
+                     counting, n = -m * ln(1 - occupied / m), and the expected share of terms that
+                     share their bucket with another term is 1 - (1 - 1 / m) ^ (n - 1). If the reverse
+                     map holds every distinct term, the observed values are reported as well.
+
+        Outputs:
+            report (dict) : bucket occupancy, estimated and (if available) observed collision rates.
+        """
+        assert hasattr(self, "dfs_"), "Model has to be fitted before reporting collisions !"
+
+        m = self.n_features
+        occupied = int(np.count_nonzero(self.dfs_))
+        if occupied < m:
+            n_estimate = -m * math.log(1.0 - occupied / m)
+            collision_estimate = 1.0 - (1.0 - 1.0 / m) ** max(n_estimate - 1.0, 0.0)
+        else:
+            n_estimate, collision_estimate = float("inf"), 1.0
+
+        report = {
+            "n_features": m,
+            "occupied_buckets": occupied,
+            "load_factor": occupied / m,
+            "estimated_distinct_terms": n_estimate,
+            "estimated_collision_rate": collision_estimate,
+        }
+        if self.max_reverse_terms > 0 and self.reverse_map_complete_:
+            n_terms = sum(len(terms) for terms in self.reverse_map_.values())
+            colliding = sum(len(terms) for terms in self.reverse_map_.values() if len(terms) > 1)
+            report["observed_distinct_terms"] = n_terms
+            report["colliding_buckets"] = sum(1 for terms in self.reverse_map_.values() if len(terms) > 1)
+            report["observed_collision_rate"] = colliding / n_terms if n_terms > 0 else 0.0
+        return report
+
+
+    def _count(self, raw_documents, track_terms :bool=False):
+        """
+        Description: Analyzes the documents and hashes their terms into a sparse signed count matrix.
+        """
+        if isinstance(raw_documents, str):
+            raise ValueError("Iterable over raw text documents expected, string object received.")
+
+        if self._batch_normalizes():
+            analyze, raw_documents = list, self._iter_batch_analyzed(raw_documents)
+        else:
+            analyze = self.build_analyzer()
+        if track_terms:
+            analyze = self._tracking_analyzer(analyze)
+
+        X = sp.csr_matrix(self._get_hasher().fit().transform(analyze(doc) for doc in raw_documents))
+        self._flush_analysis_cache()
+        X.eliminate_zeros()
+        if self.binary:
+            X.data.fill(1)
+        return X
+
+
+    def _tracking_analyzer(self, analyze :Callable):
+        """
+        Description: Wraps the analyzer to record the terms of each bucket into the reverse map,
+                     until 'max_reverse_terms' distinct terms are recorded.
+        """
+        seen = set()
+
+        def analyze_and_track(doc):
+            terms = analyze(doc)
+            if self.reverse_map_complete_:
+                for term in terms:
+                    if term in seen:
+                        continue
+                    if len(seen) >= self.max_reverse_terms:
+                        self.reverse_map_complete_ = False
+                        break
+                    seen.add(term)
+                    self.reverse_map_.setdefault(self.get_bucket(term), []).append(term)
+            return terms
+
+        return analyze_and_track
+
+
+    def _weight(self, X):
+        """
+        Description: Applies sublinear tf, bucket idf and row normalization to the count matrix.
+        """
+        if self.sublinear_tf:
+            X.data = np.sign(X.data) * (np.log(np.abs(X.data)) + 1.0)
+        if self.use_idf:
+            X.data *= self.idf_[X.indices]
+        if self.norm is not None:
+            X = normalize(X, norm=self.norm, copy=False)
+        return X
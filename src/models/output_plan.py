@@ -0,0 +1,108 @@
+import math
+
+import numpy as np
+
+
+# Bytes of a CSR column index, assumed int32, and of an 'indptr' entry, int64 as the worst case
+_INDEX_BYTES = 4
+_INDPTR_BYTES = 8
+
+
+def csr_nbytes(n_rows :int, nnz :int, dtype :type):
+    """
+    Description: Returns the bytes of a CSR matrix of 'n_rows' rows and 'nnz' entries of 'dtype'.
+    """
+    return nnz * (np.dtype(dtype).itemsize + _INDEX_BYTES) + (n_rows + 1) * _INDPTR_BYTES
+
+
+class OutputPlan:
+    """
+    Description: Storage of a transform result under a memory budget. The candidates are tried
+                 from the most to the least faithful one, dense before sparse and float64 before
+                 float32, never denser or more precise than the model is configured for. The first
+                 candidate whose peak memory fits the budget is kept; if none fits, the result is
+                 generated in chunks of rows that fit the budget and written to disk.
+
+                 The peak of a candidate is estimated from the number of non-zero entries:
+                    - scikit-learn's transform holds the raw counts next to the weighted matrix,
+                      counted as two CSR matrices of the working dtype,
+                    - a CSR copy of the output dtype is added when the dtype changes,
+                    - a dense output adds n_rows x n_cols items of the output dtype.
+
+    Attributes:
+        sparse (bool)     : If True, the result is a CSR matrix, otherwise a dense array.
+        dtype (type)      : dtype of the result.
+        chunk_rows (int)  : Number of rows generated at once when the result is written to disk,
+                            None when it is kept in memory.
+        n_rows (int)      : Number of rows of the result.
+        n_cols (int)      : Number of columns of the result.
+        nnz (int)         : (Estimated) number of non-zero entries of the result.
+        nbytes (int)      : Estimated peak bytes of the result, of a chunk when written to disk.
+    """
+
+    def __init__(self, sparse :bool, dtype :type, chunk_rows :int, n_rows :int, n_cols :int, nnz :int, nbytes :int):
+        self.sparse = sparse
+        self.dtype = dtype
+        self.chunk_rows = chunk_rows
+        self.n_rows = n_rows
+        self.n_cols = n_cols
+        self.nnz = nnz
+        self.nbytes = nbytes
+
+    @property
+    def to_disk(self):
+        return self.chunk_rows is not None
+
+    def __repr__(self):
+        storage = "disk in chunks of %d rows" % self.chunk_rows if self.to_disk else "memory"
+        return "OutputPlan(%s %s, %dx%d, nnz~%d, ~%d bytes, %s)" % (
+            "sparse" if self.sparse else "dense", np.dtype(self.dtype).name,
+            self.n_rows, self.n_cols, self.nnz, self.nbytes, storage)
+
+    @staticmethod
+    def peak_nbytes(n_rows :int, n_cols :int, nnz :int, sparse :bool, dtype :type, work_dtype :type):
+        """
+        Description: Estimated peak bytes of transforming into the given storage, see the class.
+        """
+        nbytes = 2 * csr_nbytes(n_rows, nnz, work_dtype)
+        if np.dtype(dtype) != np.dtype(work_dtype):
+            nbytes += csr_nbytes(n_rows, nnz, dtype)
+        if not sparse:
+            nbytes += n_rows * n_cols * np.dtype(dtype).itemsize
+        return nbytes
+
+    @classmethod
+    def create(cls, n_rows :int, n_cols :int, nnz :int, memory_budget :int, sparse_output :bool, dtype :type, work_dtype :type=None):
+        """
+        Description: Picks the storage of an 'n_rows' x 'n_cols' result with 'nnz' non-zero entries
+                     within 'memory_budget' bytes.
+
+        Inputs:
+            n_rows (int)          : number of rows (documents) of the result.
+            n_cols (int)          : number of columns (features) of the result.
+            nnz (int)             : (estimated) number of non-zero entries.
+            memory_budget (int)   : byte limit of the result.
+            sparse_output (bool)  : If True, only sparse storage is considered.
+            dtype (type)          : configured dtype; float64 may be lowered to float32.
+            work_dtype (type)     : dtype the result is computed in, 'dtype' if None.
+
+        Outputs:
+            plan (OutputPlan)     : the storage of the result.
+        """
+        assert memory_budget > 0, "'memory_budget' should be a positive integer !"
+        work_dtype = dtype if work_dtype is None else work_dtype
+        dtypes = [np.float64, np.float32] if np.dtype(dtype) == np.float64 else [dtype]
+        for sparse in ([True] if sparse_output else [False, True]):
+            for candidate in dtypes:
+                nbytes = cls.peak_nbytes(n_rows, n_cols, nnz, sparse, candidate, work_dtype)
+                if nbytes <= memory_budget:
+                    return cls(sparse, candidate, None, n_rows, n_cols, nnz, nbytes)
+
+        # Written to disk with the configured precision, a chunk of rows at a time
+        row_nbytes = cls.peak_nbytes(1, n_cols, math.ceil(nnz / max(n_rows, 1)), True, dtype, work_dtype)
+        chunk_rows = min(memory_budget // row_nbytes, n_rows)
+        if chunk_rows < 1:
+            raise MemoryError(
+                "A single row of the result needs ~%d bytes, more than the memory budget of %d bytes !" % (
+                    row_nbytes, memory_budget))
+        return cls(True, dtype, int(chunk_rows), n_rows, n_cols, nnz, int(chunk_rows * row_nbytes))
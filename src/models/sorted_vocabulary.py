@@ -0,0 +1,43 @@
+from collections.abc import Mapping
+
+import numpy as np
+
+
+class SortedVocabulary(Mapping):
+    """
+    Description: Read-only term -> feature index mapping backed by a sorted numpy array of terms.
+                 Lookups are binary searches, so the array can be memory-mapped from disk and shared
+                 between processes instead of building a Python dict in each of them.
+
+    Attributes:
+        terms (np.ndarray)   : Sorted unicode array of the vocabulary terms.
+        indices (np.ndarray) : Feature index of each term in 'terms'. If None, the feature index
+                               of a term is its position in 'terms'.
+    """
+
+    def __init__(self, terms :np.ndarray, indices :np.ndarray=None):
+        assert terms.ndim == 1, "Terms should be a 1D array !"
+        assert indices is None or len(indices) == len(terms), \
+            "Terms and indices should have the same length !"
+
+        self.terms = terms
+        self.indices = indices
+
+    def __getitem__(self, term :str):
+        pos = int(np.searchsorted(self.terms, term))
+        if pos < len(self.terms) and self.terms[pos] == term:
+            return pos if self.indices is None else int(self.indices[pos])
+        raise KeyError(term)
+
+    def __contains__(self, term):
+        try:
+            self[term]
+            return True
+        except (KeyError, TypeError):
+            return False
+
+    def __len__(self):
+        return len(self.terms)
+
+    def __iter__(self):
+        return iter(self.terms.tolist())
@@ -0,0 +1,87 @@
+import heapq
+from typing import Dict, List
+
+
+class SpaceSaving:
+    """
+    Description: Space-Saving summary (Metwally et al., 2005) of the weighted counts of a stream of
+                 terms in a fixed number of counters. While there is a free counter, a new term gets
+                 its exact count; otherwise it replaces the term with the smallest counter and takes
+                 over that count as its possible overestimation. The smallest counter is found with a
+                 heap whose entries are refreshed lazily, as counters only grow.
+
+                 Guarantees, with N the total added weight and k the number of counters:
+                    - a monitored term t has count(t) - error(t) <= true(t) <= count(t),
+                    - a term that is not monitored has true(t) <= 'error_bound' <= N / k,
+                 so every term whose true count exceeds the error bound is monitored.
+
+    Attributes:
+        capacity (int)          : Number of counters.
+        counts (Dict[str, int]) : Upper bound of the count of each monitored term.
+        errors (Dict[str, int]) : Maximum overestimation of the count of each monitored term.
+        total (int)             : Total weight added.
+        error_bound (int)       : Largest counter evicted so far, an upper bound of the count of any
+                                  term that is not monitored.
+    """
+
+    def __init__(self, capacity :int):
+        assert capacity > 0, "Capacity should be a positive integer !"
+        self.capacity = capacity
+        self.counts = {}
+        self.errors = {}
+        self.total = 0
+        self.error_bound = 0
+        self._heap = []
+
+    def __len__(self):
+        return len(self.counts)
+
+    def __contains__(self, term :str):
+        return term in self.counts
+
+    def add(self, term :str, weight :int=1):
+        """
+        Description: Adds 'weight' occurrences of the term.
+        """
+        counts = self.counts
+        self.total += weight
+        count = counts.get(term)
+        if count is not None:
+            counts[term] = count + weight
+            return
+        error = 0
+        if len(counts) >= self.capacity:
+            error = self._evict()
+        counts[term] = error + weight
+        self.errors[term] = error
+        heapq.heappush(self._heap, (error + weight, term))
+
+    def update(self, weights :Dict[str, int]):
+        """
+        Description: Adds the weight of each term, e.g. the term counts of a document.
+        """
+        for term, weight in weights.items():
+            self.add(term, weight)
+        return self
+
+    def _evict(self):
+        # Removes the term with the smallest counter and returns the counter
+        heap, counts = self._heap, self.counts
+        while True:
+            count, term = heapq.heappop(heap)
+            current = counts[term]
+            if current == count:
+                break
+            heapq.heappush(heap, (current, term))
+        del counts[term]
+        del self.errors[term]
+        self.error_bound = max(self.error_bound, count)
+        return count
+
+    def candidates(self, min_count :int=0) -> List[str]:
+        """
+        Description: Returns the monitored terms whose count upper bound is at least 'min_count', so
+                     no term with a true count of at least 'min_count' is left out, as long as
+                     'min_count' is larger than 'error_bound'.
+        """
+        return [term for term, count in self.counts.items() if count >= min_count]
@@ -0,0 +1,203 @@
+import gzip
+import heapq
+import json
+from typing import List, Iterable, Iterator, Tuple
+
+
+TERM_STATS_FORMAT_VERSION = 1
+
+
+def _open_text(path :str, mode :str):
+    # '.gz' files are compressed, e.g. to move the shard statistics between machines
+    if str(path).endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+def read_term_stats_header(path :str):
+    """
+    Description: Reads the header of a term statistics file: its format version, the number of
+                 documents and the fingerprint and config of the model that counted them.
+    """
+    with _open_text(path, "r") as f:
+        header = json.loads(f.readline())
+    if header.get("format_version") != TERM_STATS_FORMAT_VERSION:
+        raise ValueError("Unsupported term statistics format version in '%s': %s !" % (
+            path, header.get("format_version")))
+    return header
+
+
+def iter_term_stats(path :str) -> Iterator[Tuple[str, int, int]]:
+    """
+    Description: Yields the (term, document frequency, term frequency) entries of a term statistics
+                 file in the sorted order of the terms, one line at a time.
+    """
+    with _open_text(path, "r") as f:
+        f.readline()
+        for line in f:
+            term, df, tf = json.loads(line)
+            yield term, df, tf
+
+
+def write_term_stats(path :str, header :dict, entries :Iterable[Tuple[str, int, int]]):
+    """
+    Description: Writes a term statistics file: a JSON header line, then a JSON [term, df, tf] line
+                 per term. The entries have to be sorted by term, so that files can be merged by
+                 streaming them side by side.
+    """
+    header = dict(header, format_version=TERM_STATS_FORMAT_VERSION)
+    with _open_text(path, "w") as f:
+        f.write(json.dumps(header, sort_keys=True) + "\n")
+        for entry in entries:
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+
+def merge_term_stats_files(inp_paths :List[str], out_path :str=None):
+    """
+    Description: Merges term statistics files of disjoint sets of documents, e.g. the shards of a
+                 corpus counted on different machines. The sorted entries of the files are merged
+                 side by side and the counts of equal terms are summed, so memory does not depend on
+                 the vocabulary size and the merge is associative: the files can be merged in a tree
+                 in any grouping and give the same result. The files have to share the fingerprint
+                 of their analysis settings.
+
+    Inputs:
+        inp_paths (List[string]) : Paths of the term statistics files.
+        out_path (string)        : Path of the merged file. If None, only the merged header and
+                                   entries are returned.
+
+    Outputs:
+        header (dict)            : Header of the merged statistics.
+        entries (Iterator[Tuple[str, int, int]]) : Merged entries, None if 'out_path' is given.
+    """
+    assert len(inp_paths) > 0, "At least one term statistics file is required !"
+
+    headers = [read_term_stats_header(path) for path in inp_paths]
+    for path, header in zip(inp_paths, headers):
+        if header["fingerprint"] != headers[0]["fingerprint"]:
+            raise ValueError("'%s' is counted with different analysis settings than '%s' !" % (
+                path, inp_paths[0]))
+
+    header = dict(headers[0], n_docs=sum(header["n_docs"] for header in headers))
+    entries = _merge_entries([iter_term_stats(path) for path in inp_paths])
+    if out_path is None:
+        return header, entries
+    write_term_stats(out_path, header, entries)
+    return header, None
+
+
+def _merge_entries(streams :List[Iterator[Tuple[str, int, int]]]):
+    # Sums the counts of the equal terms of sorted entry streams
+    term, df, tf = None, 0, 0
+    for entry in heapq.merge(*streams, key=lambda entry: entry[0]):
+        if entry[0] != term:
+            if term is not None:
+                yield term, df, tf
+            term, df, tf = entry
+        else:
+            df += entry[1]
+            tf += entry[2]
+    if term is not None:
+        yield term, df, tf
+
+
+class TermStatistics:
+    """
+    Description: Corpus-level term statistics that are enough to fit a TF-IDF vocabulary and
+                 idf vector without keeping the documents. Memory is bounded by the number of
+                 distinct terms, not by the number of documents.
+
+    Attributes:
+        dfs (Dict[str, int]) : Number of documents each term occurs in.
+        tfs (Dict[str, int]) : Total number of occurrences of each term in the corpus.
+        n_docs (int)         : Number of documents processed.
+    """
+
+    def __init__(self):
+        self.dfs = {}
+        self.tfs = {}
+        self.n_docs = 0
+
+    def __len__(self):
+        return len(self.dfs)
+
+    def add_document(self, terms :List[str]):
+        """
+        Description: Updates the statistics with the analyzed terms of a single document.
+
+        Inputs:
+            terms (List[str]) : Terms of the document after the analyzer is applied.
+        """
+        counts = {}
+        for term in terms:
+            counts[term] = counts.get(term, 0) + 1
+
+        dfs, tfs = self.dfs, self.tfs
+        for term, count in counts.items():
+            dfs[term] = dfs.get(term, 0) + 1
+            tfs[term] = tfs.get(term, 0) + count
+        self.n_docs += 1
+
+    def update(self, analyzed_docs :Iterable[List[str]]):
+        """
+        Description: Updates the statistics with a batch of analyzed documents.
+
+        Inputs:
+            analyzed_docs (Iterable[List[str]]) : Terms of each document after the analyzer is applied.
+        """
+        for terms in analyzed_docs:
+            self.add_document(terms)
+        return self
+
+    def merge(self, other :"TermStatistics"):
+        """
+        Description: Adds the statistics of another (disjoint) set of documents to this one.
+
+        Inputs:
+            other (TermStatistics) : Statistics to merge into this object.
+        """
+        assert isinstance(other, TermStatistics), "Only TermStatistics objects can be merged !"
+
+        dfs, tfs = self.dfs, self.tfs
+        for term, df in other.dfs.items():
+            dfs[term] = dfs.get(term, 0) + df
+            tfs[term] = tfs.get(term, 0) + other.tfs[term]
+        self.n_docs += other.n_docs
+        return self
+
+    def entries(self):
+        """
+        Description: Returns the (term, document frequency, term frequency) entries sorted by term.
+        """
+        return ((term, self.dfs[term], self.tfs[term]) for term in sorted(self.dfs))
+
+    def save(self, path :str, header :dict=None):
+        """
+        Description: Writes the statistics to a term statistics file, that 'merge_term_stats_files'
+                     can merge with the statistics of other documents.
+
+        Inputs:
+            path (string) : Path of the file, compressed if it ends with '.gz'.
+            header (dict) : Additional JSON serializable header fields, e.g. the fingerprint.
+        """
+        write_term_stats(path, dict(header or {}, n_docs=self.n_docs), self.entries())
+
+    @classmethod
+    def load(cls, paths :List[str]):
+        """
+        Description: Reads one or more term statistics files, merging them.
+
+        Inputs:
+            paths (List[string]) : Paths of the term statistics files.
+
+        Outputs:
+            stats (TermStatistics) : Statistics of all the documents.
+            header (dict)          : Header of the merged statistics.
+        """
+        header, entries = merge_term_stats_files(paths)
+        stats = cls()
+        for term, df, tf in entries:
+            stats.dfs[term] = df
+            stats.tfs[term] = tf
+        stats.n_docs = header["n_docs"]
+        return stats, header
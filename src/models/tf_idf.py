@@ -1,14 +1,38 @@
 # STD Libraries
-from typing import List, Tuple, Set, Dict, Union, Callable
+from typing import List, Tuple, Set, Union, Callable, Iterable
+from numbers import Integral
+import json
+import math
+import os
 # Custom Libraries
-from sklearn.feature_extraction.text import TfidfVectorizer
+import numpy as np
+import scipy.sparse as sp
+from sklearn.feature_extraction.text import TfidfVectorizer, TfidfTransformer
 # User-defined Files
-from ..tokenizers import LemmaTokenizer, StemTokenizer
-from ..preprocessors import DigitPreprocessor, PuncPreprocessor, MultiPreprocessor, ExternalPreprocessor
+from .base_model import BaseModel, _GrowingVocabulary
+from .term_stats import TermStatistics
+from .sorted_vocabulary import SortedVocabulary
+from .space_saving import SpaceSaving
+from .output_plan import OutputPlan
 from ..constants import ENGLISH_STOP_WORDS
 from ..types import TextOps
+from ..utils.io import IO
+from ..utils.analysis_cache import AnalysisCache, analysis_fingerprint
 
-class TfIdfModel(TfidfVectorizer):
+
+MODEL_FORMAT_VERSION = 1
+# Factor of the non-zero entries extrapolated from a sample of the documents, for the longer documents
+_NNZ_ESTIMATE_MARGIN = 1.25
+
+# Constructor parameters that are persisted in the config of a saved model
+_SAVED_PARAMS = [
+    "analyzer", "ngram_range", "max_df", "min_df", "max_features", "binary", "sparse_output",
+    "token_cache_size", "token_cache_policy", "word_tokenizer", "batch_normalize",
+    "vocabulary_budget", "memory_budget", "fuse_preprocessors", "norm", "use_idf",
+    "smooth_idf", "sublinear_tf", "token_pattern", "encoding", "decode_error",
+]
+
+class TfIdfModel(BaseModel, TfidfVectorizer):
     """
         Description: TF_IDF Model Object Class. The object is inherited from 
                      scikit-learn's TfidfVectorizer. The methods except the
@@ -23,6 +47,15 @@ class TfIdfModel(TfidfVectorizer):
             idf_ (array of shape (n_features,)) : Inverse document frequency vector.
             stop_words (Set[string])            : stop words that are given in constructor and / or 
                                                   occurred in too many / few documents (max_df & min_df).
+            term_stats_ (TermStatistics)        : document and term frequencies of every seen term, kept 
+                                                  by 'train_stream' and 'train_incremental'.
+            output_plan_ (OutputPlan)           : With 'memory_budget', the storage of the last 'train'
+                                                  or 'infer' result.
+            vocabulary_error_bound_ (int)       : With 'vocabulary_budget', the largest count (term
+                                                  frequency, document frequency if 'binary') a term
+                                                  that is not a candidate can have.
+            vocabulary_exact_ (bool)            : With 'vocabulary_budget', True if the error bound
+                                                  proves the vocabulary is the exact one.
     """
     
     def __init__(
@@ -36,6 +69,17 @@ class TfIdfModel(TfidfVectorizer):
         max_features : int                        = None,
         vocabulary   : Union[List[str], Set[str]] = None,
         binary       : bool                       = False,
+        sparse_output: bool                       = False,
+        dtype        : type                       = np.float64,
+        token_cache_size   : int                  = None,
+        token_cache_policy : str                  = "lru",
+        word_tokenizer     : str                  = "nltk",
+        batch_normalize    : bool                 = False,
+        normalize_n_jobs   : int                  = 1,
+        vocabulary_budget  : int                  = None,
+        memory_budget      : int                  = None,
+        fuse_preprocessors : bool                 = True,
+        analysis_cache     : Union[str, AnalysisCache] = None,
         **kwargs,
         ):
 
@@ -64,6 +108,34 @@ class TfIdfModel(TfidfVectorizer):
             binary (bool)                 : If True, all non-zero term counts are set to 1. This does not 
                                             mean outputs will have only 0/1 values, only that the tf term 
                                             in tf-idf is binary. (Set idf and normalization to False to get 0/1 outputs).
+            sparse_output (bool)          : If True, 'train' and 'infer' return the scipy CSR matrix as-is 
+                                            instead of converting it to a dense numpy array.
+            dtype (type)                  : Type of the output matrix. Options: [np.float64, np.float32]
+            token_cache_size (int)        : If not None, the lemmatizer / stemmer results of at most this 
+                                            many distinct tokens are cached by the tokenizer.
+            token_cache_policy (string)   : Eviction policy of the token cache. Options: ["lru", "fifo"]
+            word_tokenizer (string)       : Splitter of the text before lemmatization / stemming. Options: ["nltk", "regex"]
+                                            "regex" follows the rules of 'nltk.word_tokenize' several times
+                                            faster and without the Punkt models.
+            batch_normalize (bool)        : If True, the distinct tokens of each batch of documents are
+                                            lemmatized / stemmed once and the documents are mapped through
+                                            the results, instead of normalizing every token occurrence.
+            normalize_n_jobs (int)        : Number of worker processes normalizing the distinct tokens in
+                                            'batch_normalize' mode, -1 to use all the cores.
+            vocabulary_budget (int)       : If not None, the vocabulary is built in bounded memory: a
+                                            Space-Saving summary of at most this many terms finds the
+                                            candidate terms in a first pass over the documents, and only
+                                            the candidates are counted exactly in a second pass. See
+                                            'vocabulary_exact_' for when the result is exact.
+            memory_budget (int)           : If not None, byte limit of the 'train' and 'infer' results. The
+                                            output size is estimated from the non-zero entries before it
+                                            is allocated, and the result is made sparse and / or float32
+                                            if needed to fit, or written to disk in chunks. See OutputPlan.
+                                            'train' still builds the CSR matrix of the whole corpus first.
+            fuse_preprocessors (bool)     : If True, the preprocessing operations are compiled into a single
+                                            FusedPreprocessor instead of a chain of preprocessors.
+            analysis_cache (Union[str, AnalysisCache]) : If not None, path of the SQLite file or the cache
+                                            that keeps the analyzed documents across runs.
         """
 
         assert max_features is None or max_features > 0, "'max_features' should be a positive integer !"
@@ -83,8 +155,26 @@ class TfIdfModel(TfidfVectorizer):
             "ngram_range must have 2 items and each item has to be >= 1 !"
         assert vocabulary is None or type(vocabulary) in [list, set], \
             "Vocabulary must be either None or a list / set !"
+        assert dtype in [np.float64, np.float32], \
+            "dtype must be either np.float64 or np.float32 !"
+        assert normalize_n_jobs == -1 or normalize_n_jobs > 0, \
+            "normalize_n_jobs should be a positive integer or -1 !"
+        assert vocabulary_budget is None or vocabulary_budget > 0, \
+            "'vocabulary_budget' should be a positive integer !"
+        assert memory_budget is None or memory_budget > 0, \
+            "'memory_budget' should be a positive integer !"
 
         self.op_set = op_set if op_set is not None else {}
+        self.sparse_output = sparse_output
+        self.token_cache_size = token_cache_size
+        self.token_cache_policy = token_cache_policy
+        self.word_tokenizer = word_tokenizer
+        self.batch_normalize = batch_normalize
+        self.normalize_n_jobs = normalize_n_jobs
+        self.vocabulary_budget = vocabulary_budget
+        self.memory_budget = memory_budget
+        self.fuse_preprocessors = fuse_preprocessors
+        self._set_analysis_cache(analysis_cache)
         
         super().__init__(
             input="content",
@@ -99,44 +189,314 @@ class TfIdfModel(TfidfVectorizer):
             min_df=min_df,
             max_features=max_features,
             binary=binary,
+            dtype=dtype,
             **kwargs
             )
 
     
-    def train(self, corpus :List[str]):
+    def train(self, corpus :List[str], n_jobs :int=1, shard_size :int=None, out_path :str=None):
         """
-        Description: An alias to the 'fit_transform' method in scikit-learn.
+        Description: An alias to the 'fit_transform' method in scikit-learn. If 'n_jobs' is not 1, the
+                     documents are analyzed and counted in contiguous shards in a process pool, and
+                     the shard counts are merged into the same vocabulary, feature order, idf and
+                     matrix as the serial fit. With 'memory_budget', the storage of the result is
+                     planned from its non-zero entries, see 'infer'. The plan is made after the fit,
+                     so the CSR matrix of the whole corpus is still built in memory: the budget only
+                     bounds the dense / dtype conversion, and 'out_path' chunks are sliced from it.
 
         Inputs:
             corpus (List[string]) : list of string documents.
+            n_jobs (int)          : number of worker processes, -1 to use all the cores.
+            shard_size (int)      : number of documents in each shard. If None, the corpus is 
+                                    split into 4 shards per worker.
+            out_path (string)     : '.npz', '.mtx' or '.tsv' file the result is written to if it
+                                    does not fit 'memory_budget'.
 
         Outputs:
-            X (np.ndarray)        : 2D numpy Tf-idf-weighted document-term matrix
+            X (Union[np.ndarray, sp.csr_matrix]) : 2D Tf-idf-weighted document-term matrix, 
+                                                   sparse if 'sparse_output' is set, None if
+                                                   it is written to 'out_path'.
         """
         assert corpus is not None, "Corpus cannot be None !"
         assert type(corpus) == list, "Corpus has to be list of string documents !"
         assert len(corpus) > 0, "Corpus has to include at least one document!"
+        assert n_jobs == -1 or n_jobs > 0, "n_jobs should be a positive integer or -1 !"
+        assert shard_size is None or shard_size > 0, "Shard size should be a positive integer !"
 
-        return super().fit_transform(corpus).toarray()
+        self._clear_fit_attributes()
+        with self._stage("fit_transform"), self._parallel_fit(n_jobs, shard_size):
+            X = super().fit_transform(corpus)
+        if self.memory_budget is None:
+            return self._format_output(X)
 
+        plan = self._plan_output(X.shape[0], X.nnz, X.dtype, out_path)
+        if plan.to_disk:
+            chunks = (X[i:i + plan.chunk_rows].astype(plan.dtype, copy=False) for i in range(0, X.shape[0], plan.chunk_rows))
+            return self._write_output_chunks(chunks, out_path)
+        return self._format_output(X, plan)
 
-    def infer(self, corpus :List[str]):
+
+    def infer(self, corpus :List[str], n_jobs :int=1, shard_size :int=None, out_path :str=None):
         """
-        Description: An alias to the 'transform' method in scikit-learn.
+        Description: An alias to the 'transform' method in scikit-learn. If 'n_jobs' is not 1, the 
+                     documents are split into contiguous shards that are transformed in a process
+                     pool and stitched back together in the original order. With 'memory_budget',
+                     the non-zero entries of the result are estimated from a sample of the
+                     documents before it is allocated; the result is made sparse and / or float32 if
+                     needed to fit the budget, and otherwise transformed in chunks of documents that
+                     are written to 'out_path'. Without 'out_path', a MemoryError is raised instead.
 
         Inputs:
             corpus (List[string]) : list of string documents.
+            n_jobs (int)          : number of worker processes, -1 to use all the cores.
+            shard_size (int)      : number of documents in each shard. If None, the corpus is 
+                                    split into 4 shards per worker.
+            out_path (string)     : '.npz', '.mtx' or '.tsv' file the result is written to if it
+                                    does not fit 'memory_budget'.
 
         Outputs:
-            X (np.ndarray)        : 2D numpy Tf-idf-weighted document-term matrix
+            X (Union[np.ndarray, sp.csr_matrix]) : 2D Tf-idf-weighted document-term matrix, 
+                                                   sparse if 'sparse_output' is set, None if
+                                                   it is written to 'out_path'.
         """
         assert corpus is not None, "Corpus cannot be None !"
         assert type(corpus) == list, "Corpus has to be list of string documents !"
         assert len(corpus) > 0, "Corpus has to include at least one document!"
-        
-        return super().transform(corpus).toarray()
+        assert n_jobs == -1 or n_jobs > 0, "n_jobs should be a positive integer or -1 !"
+        assert shard_size is None or shard_size > 0, "Shard size should be a positive integer !"
+
+        if self.memory_budget is None:
+            return self._format_output(self._transform_documents(corpus, n_jobs, shard_size))
+
+        plan, X = self._plan_infer_output(corpus, n_jobs, shard_size, out_path)
+        if plan.to_disk:
+            chunks = (self._transform_documents(corpus[i:i + plan.chunk_rows], n_jobs, shard_size).astype(plan.dtype, copy=False)
+                      for i in range(0, len(corpus), plan.chunk_rows))
+            return self._write_output_chunks(chunks, out_path)
+        if X is None:
+            X = self._transform_documents(corpus, n_jobs, shard_size)
+        return self._format_output(X, plan)
+
+
+    def train_stream(self, corpus :Union[Iterable[str], str], chunk_size :int=10000):
+        """
+        Description: Out-of-core alternative to 'train'. Reads the documents in chunks, accumulates 
+                     the document frequencies incrementally and fits the same vocabulary and idf 
+                     as 'train' would. Memory is bounded by the vocabulary size, hence the 
+                     document-term matrix is not returned; 'infer' can be called chunk by chunk.
+                     With 'vocabulary_budget', the corpus is read twice and memory is bounded by
+                     the budget instead, so the corpus cannot be a one-shot iterator.
+
+        Inputs:
+            corpus (Union[Iterable[string], string]) : iterable of string documents or path of 
+                                                       the corpus .txt file.
+            chunk_size (int)                         : number of documents to analyze at once.
+
+        Outputs:
+            self (TfIdfModel)     : the fitted model itself.
+        """
+        assert corpus is not None, "Corpus cannot be None !"
+        assert chunk_size > 0, "Chunk size should be a positive integer !"
+
+        self._prepare_fit()
+        self._clear_fit_attributes()
+        candidates = None
+        if self.vocabulary_budget is not None and not self.fixed_vocabulary_:
+            assert type(corpus) == str or iter(corpus) is not corpus, \
+                "'vocabulary_budget' needs a corpus that can be read twice, a path or a collection !"
+            summary, n_docs = self._sketch_term_counts(corpus, chunk_size)
+            candidates = set(summary.candidates(self._get_doc_count_limits(n_docs)[1]))
+            error_bound = summary.error_bound
+            del summary
+
+        stats = self._count_term_stats(corpus, chunk_size, candidates)
+        if candidates is not None:
+            terms = list(stats.dfs)
+            counts = stats.dfs if self.binary else stats.tfs
+            self._set_vocabulary_bound(error_bound, stats.n_docs,
+                                       np.fromiter((stats.dfs[t] for t in terms), dtype=np.int64, count=len(terms)),
+                                       np.fromiter((counts[t] for t in terms), dtype=np.int64, count=len(terms)))
+        with self._stage("fit_from_term_stats"):
+            return self._fit_from_term_stats(stats)
+
+
+    def train_incremental(self, corpus :List[str]):
+        """
+        Description: Updates the document frequencies with a new batch of documents and refits the 
+                     vocabulary and idf, processing only the new batch. Terms that now satisfy 
+                     min_df / max_df / max_features are added to the vocabulary, so the result is 
+                     the same as calling 'train' on all the documents seen so far. The first call 
+                     on an unfitted model starts from empty statistics.
+
+        Inputs:
+            corpus (List[string]) : list of new string documents.
+
+        Outputs:
+            self (TfIdfModel)     : the updated model itself.
+        """
+        assert corpus is not None, "Corpus cannot be None !"
+        assert type(corpus) == list, "Corpus has to be list of string documents !"
+        assert len(corpus) > 0, "Corpus has to include at least one document!"
+        assert hasattr(self, "term_stats_") or not hasattr(self, "vocabulary_"), \
+            "Model is fitted without term statistics, use 'train_stream' or 'train_incremental' to fit it !"
+        assert self.vocabulary_budget is None, "'vocabulary_budget' is not supported by 'train_incremental' !"
+
+        self._prepare_fit()
+        stats = self.term_stats_ if hasattr(self, "term_stats_") else TermStatistics()
+        with self._stage("count_terms"):
+            if self._batch_normalizes():
+                stats.update(self._iter_batch_analyzed(corpus))
+            else:
+                analyze = self.build_analyzer()
+                stats.update(analyze(doc) for doc in corpus)
+        self._flush_analysis_cache()
+        with self._stage("fit_from_term_stats"):
+            return self._fit_from_term_stats(stats)
+
+
+    def collect_term_stats(self, corpus :Union[Iterable[str], str], path :str, chunk_size :int=10000):
+        """
+        Description: Counts the document and term frequencies of a shard of a corpus, as 'train_stream'
+                     does, and writes them to a term statistics file with the fingerprint of the
+                     analysis settings and the config of the model. The files of the shards, counted
+                     on different machines, can be merged with 'merge_term_stats_files' and fitted
+                     with 'from_term_stats' without moving the documents.
+
+        Inputs:
+            corpus (Union[Iterable[string], string]) : iterable of string documents or path of 
+                                                       the corpus .txt file.
+            path (string)                            : path of the term statistics file, compressed
+                                                       if it ends with '.gz'.
+            chunk_size (int)                         : number of documents to analyze at once.
+
+        Outputs:
+            stats (TermStatistics) : document and term frequencies of the shard.
+        """
+        assert corpus is not None, "Corpus cannot be None !"
+        assert chunk_size > 0, "Chunk size should be a positive integer !"
+        settings = self._analysis_settings()
+        assert settings is not None, \
+            "Models with a callable analyzer, preprocessor or tokenizer cannot collect term statistics !"
+
+        self._prepare_fit()
+        stats = self._count_term_stats(corpus, chunk_size)
+        op_set, params = self._get_config()
+        stats.save(path, {"fingerprint": analysis_fingerprint(settings).hex(), "op_set": op_set, "params": params})
+        return stats
+
+
+    @classmethod
+    def from_term_stats(cls, paths :List[str], **params):
+        """
+        Description: Fits a model from the term statistics files of the shards of a corpus, written
+                     by 'collect_term_stats' or 'merge_term_stats_files'. The model is created with
+                     the op_set and parameters the statistics are counted with, and the vocabulary
+                     and idf are the same as 'train' on the concatenation of the shards gives.
+
+        Inputs:
+            paths (List[string]) : Paths of the term statistics files.
+            params (dict)        : Parameters to override, e.g. 'min_df', 'max_df', 'max_features'.
+                                   The analysis settings cannot be changed.
+
+        Outputs:
+            model (TfIdfModel)   : the fitted model.
+        """
+        stats, header = TermStatistics.load(paths)
+        assert stats.n_docs > 0, "Corpus has to include at least one document!"
+        config = dict(header["params"], **params)
+        config["ngram_range"] = tuple(config["ngram_range"])
+        config["dtype"] = np.dtype(config["dtype"]).type
+        model = cls({TextOps[name] for name in header["op_set"]}, **config)
+        if analysis_fingerprint(model._analysis_settings()).hex() != header["fingerprint"]:
+            raise ValueError("The analysis settings of the model differ from the term statistics !")
+
+        model._prepare_fit()
+        with model._stage("fit_from_term_stats"):
+            return model._fit_from_term_stats(stats)
+
+
+    def save(self, dirpath :str):
+        """
+        Description: Saves the fitted model to a directory in a versioned format that can be 
+                     memory-mapped: 'terms.npy' keeps the sorted vocabulary terms, 'idf.npy' the 
+                     raw idf vector and 'config.json' the op_set and the constructor parameters.
+                     'term_index.npy' is only written if the feature order is not the sorted 
+                     order of the terms (e.g. for a user given vocabulary).
+
+        Inputs:
+            dirpath (string) : Path of the directory to save the model into.
+        """
+        assert hasattr(self, "vocabulary_"), "Model has to be fitted before saving !"
+        assert type(self.analyzer) == str, "Models with a callable analyzer cannot be saved !"
+        assert self.preprocessor is None, "Models with a custom preprocessor cannot be saved !"
+
+        os.makedirs(dirpath, exist_ok=True)
+
+        terms = np.array(list(self.vocabulary_.keys()), dtype=str)
+        indices = np.fromiter(self.vocabulary_.values(), dtype=np.int64, count=len(terms))
+        order = np.argsort(terms, kind="stable")
+        terms, indices = terms[order], indices[order]
+        np.save(os.path.join(dirpath, "terms.npy"), terms)
+        if not np.array_equal(indices, np.arange(len(indices))):
+            np.save(os.path.join(dirpath, "term_index.npy"), indices)
+        if self.use_idf:
+            np.save(os.path.join(dirpath, "idf.npy"), np.asarray(self.idf_))
+
+        op_set, params = self._get_config()
+        config = {
+            "format_version": MODEL_FORMAT_VERSION,
+            "op_set": op_set,
+            "fixed_vocabulary": bool(self.fixed_vocabulary_),
+            "params": params,
+        }
+        with open(os.path.join(dirpath, "config.json"), "w") as f:
+            json.dump(config, f, indent=2)
+
+
+    @classmethod
+    def load(cls, dirpath :str, mmap :bool=True):
+        """
+        Description: Loads a model that is saved with 'save'. With 'mmap', the term and idf arrays 
+                     are memory-mapped read-only and the vocabulary is looked up by binary search, 
+                     so processes that load the same model share the pages and start in milliseconds. 
+                     Otherwise the arrays are read into memory and a vocabulary dict is built, which 
+                     gives faster lookups at the cost of memory.
+
+        Inputs:
+            dirpath (string) : Path of the directory the model is saved into.
+            mmap (bool)      : If True, memory-maps the arrays instead of reading them.
+
+        Outputs:
+            model (TfIdfModel) : the fitted model.
+        """
+        with open(os.path.join(dirpath, "config.json"), "r") as f:
+            config = json.load(f)
+        assert config.get("format_version") == MODEL_FORMAT_VERSION, \
+            "Unsupported model format version: %s !" % config.get("format_version")
+
+        params = dict(config["params"])
+        params["ngram_range"] = tuple(params["ngram_range"])
+        params["dtype"] = np.dtype(params["dtype"]).type
+        model = cls({TextOps[name] for name in config["op_set"]}, **params)
+
+        mmap_mode = "r" if mmap else None
+        terms = np.load(os.path.join(dirpath, "terms.npy"), mmap_mode=mmap_mode)
+        index_path = os.path.join(dirpath, "term_index.npy")
+        indices = np.load(index_path, mmap_mode=mmap_mode) if os.path.exists(index_path) else None
+
+        if mmap:
+            model.vocabulary_ = SortedVocabulary(terms, indices)
+        else:
+            feature_indices = range(len(terms)) if indices is None else indices.tolist()
+            model.vocabulary_ = dict(zip(terms.tolist(), feature_indices))
+        model.fixed_vocabulary_ = config["fixed_vocabulary"]
+
+        model._create_tfidf(len(terms))
+        if model.use_idf:
+            model._tfidf.idf_ = np.load(os.path.join(dirpath, "idf.npy"), mmap_mode=mmap_mode)
+        return model
+
 
-    
     def get_feature_names(self):
         """
         Description: An alias to the 'get_feature_names_out' method in scikit-learn.
@@ -149,81 +509,342 @@ class TfIdfModel(TfidfVectorizer):
         """
         return super().get_feature_names_out().tolist()
 
-    
-    """ --------------------------------------------------------------------------------------
-    ----- GETTERS OF THE SKLEARN'S TFIDFVECTORIZER
-    -------------------------------------------------------------------------------------- """
-    
-    def _get_tokenizer(self):
+
+    def _get_config(self):
         """
-        Description: Sets Lemmatizer or Stemmer of NLTK as tokenizer, if requested.
+        Description: Returns the names of the op_set and the JSON serializable constructor parameters
+                     that recreate the model.
         """
-        assert TextOps.LEMMATIZE not in self.op_set or TextOps.STEM not in self.op_set, \
-            "Both Lemmatization and Stemmer cannot be applied together !"
-        
-        if TextOps.LEMMATIZE in self.op_set:
-            return LemmaTokenizer()
-        elif TextOps.STEM in self.op_set:
-            return StemTokenizer()
+        if self.stop_words is None or self.stop_words is ENGLISH_STOP_WORDS:
+            stop_words = None if self.stop_words is None else "#default"
         else:
-            return None
-    
+            stop_words = list(self.stop_words)
+
+        params = {name: getattr(self, name) for name in _SAVED_PARAMS}
+        params["ngram_range"] = list(self.ngram_range)
+        params["dtype"] = np.dtype(self.dtype).name
+        params["stop_words"] = stop_words
+        return sorted(op.name for op in self.op_set), params
 
-    def _get_strip_accent(self):
+
+    def _transform_documents(self, corpus :List[str], n_jobs :int, shard_size :int=None):
         """
-        Description: Gets the requested strip accents, checks the operation set correctness,
-                     and returns the correct strip accent text for scikit-learn
+        Description: Transforms the documents into the CSR result of scikit-learn, in a process pool
+                     if 'n_jobs' is not 1.
         """
-        assert TextOps.ASCII not in self.op_set or TextOps.UNICODE not in self.op_set, \
-            "Both ASCII and UNICODE cannot be applied together !"
-        
-        if TextOps.ASCII in self.op_set:
-            return "ascii"
-        elif TextOps.UNICODE in self.op_set:
-            return "unicode"
+        with self._stage("transform"):
+            if n_jobs == 1:
+                return super().transform(corpus)
+            return self._transform_parallel(corpus, n_jobs, shard_size)
+
+
+    def _plan_infer_output(self, corpus :List[str], n_jobs :int, shard_size :int, out_path :str):
+        """
+        Description: Plans the storage of the 'infer' result. Up to 'output_sample_size' documents
+                     spread evenly over the corpus are transformed and their mean number of non-zero
+                     entries per document is extrapolated to the corpus, with a margin. If the sample
+                     is the whole corpus, its result is returned to be reused.
+
+        Outputs:
+            plan (OutputPlan)      : the storage of the result.
+            X (sp.csr_matrix)      : result of the whole corpus, None if it was sampled.
+        """
+        step = max(1, len(corpus) // self.output_sample_size)
+        sample = corpus[::step][:self.output_sample_size]
+        X = self._transform_documents(sample, 1 if len(sample) < len(corpus) else n_jobs, shard_size)
+        if len(sample) == len(corpus):
+            return self._plan_output(X.shape[0], X.nnz, X.dtype, out_path), X
+
+        nnz = math.ceil(X.nnz / len(sample) * len(corpus) * _NNZ_ESTIMATE_MARGIN)
+        return self._plan_output(len(corpus), nnz, X.dtype, out_path), None
+
+
+    def _plan_output(self, n_rows :int, nnz :int, work_dtype :type, out_path :str):
+        """
+        Description: Plans the storage of an 'n_rows' result with 'nnz' non-zero entries within
+                     'memory_budget' and sets 'output_plan_'. Fails fast, before the result is
+                     allocated, if it has to be written to disk and 'out_path' cannot take it.
+        """
+        with self._stage("plan_output"):
+            plan = OutputPlan.create(n_rows, len(self.vocabulary_), nnz, self.memory_budget,
+                                     self.sparse_output, self.dtype, work_dtype)
+        if plan.to_disk:
+            if out_path is None:
+                raise MemoryError(
+                    "The result needs ~%d bytes in memory, more than the memory budget of %d bytes ! "
+                    "Pass 'out_path' to write it to disk in chunks of %d documents." % (
+                        OutputPlan.peak_nbytes(n_rows, plan.n_cols, nnz, True, np.float32, work_dtype),
+                        self.memory_budget, plan.chunk_rows))
+            assert out_path.endswith((".npz", ".mtx", ".tsv")), \
+                "A result written in chunks needs a '.npz', '.mtx' or '.tsv' out_path !"
+        self.output_plan_ = plan
+        return plan
+
+
+    def _write_output_chunks(self, chunks :Iterable[sp.csr_matrix], out_path :str):
+        """
+        Description: Writes the chunks of a result that does not fit in memory to 'out_path', with
+                     the feature names as column names.
+        """
+        with self._stage("write_output"):
+            IO.save_matrix(chunks, out_path, colnames=self.get_feature_names())
+        return None
+
+
+    def _iter_analyzed_chunks(self, corpus :Union[Iterable[str], str], chunk_size :int):
+        """
+        Description: Yields the analyzed documents of the corpus chunk by chunk, each chunk as an
+                     iterator of term lists. In 'batch_normalize' mode, the whole corpus is a single
+                     chunk, as the documents are already analyzed in batches.
+        """
+        if type(corpus) == str:
+            chunks = IO.iter_txt_corpus(corpus, chunk_size)
         else:
-            return None
+            chunks = self._iter_chunks(corpus, chunk_size)
 
-    
-    def _get_stop_words(self, stop_words: Union[str, list]):
+        if self._batch_normalizes():
+            yield self._iter_batch_analyzed(doc for chunk in chunks for doc in chunk)
+        else:
+            analyze = self.build_analyzer()
+            for chunk in chunks:
+                yield (analyze(doc) for doc in chunk)
+        self._flush_analysis_cache()
+
+
+    def _count_term_stats(self, corpus :Union[Iterable[str], str], chunk_size :int, candidates :Set[str]=None):
+        """
+        Description: Accumulates the document and term frequencies of the documents chunk by chunk,
+                     only of the 'candidates' terms if they are given.
         """
-        Description: Handles three different approaches:
-            1) If TextOps.STOP_WORD is not in op_set, then no stop words will be applied
-            2) If stop_words is a string and its value is '#default', detault stop words will be applied.
-            3) If a list of stop words are given, then these will be applied.
+        stats = TermStatistics()
+        for analyzed in self._iter_analyzed_chunks(corpus, chunk_size):
+            if candidates is not None:
+                analyzed = ([t for t in terms if t in candidates] for terms in analyzed)
+            with self._stage("count_terms"):
+                stats.update(analyzed)
+
+        assert stats.n_docs > 0, "Corpus has to include at least one document!"
+        return stats
+
+
+    def _sketch_term_counts(self, corpus :Union[Iterable[str], str], chunk_size :int):
+        """
+        Description: First pass of the bounded-memory vocabulary: adds the term frequencies of each
+                     document (the document frequencies if 'binary') to a Space-Saving summary of
+                     'vocabulary_budget' terms. As the document frequency of a term is at most its
+                     term frequency, the error bound of the summary bounds both.
 
         Outputs:
-            stop_words (List[string]) : final stop words to be applied to the corpus
+            summary (SpaceSaving) : the candidate terms and their count upper bounds.
+            n_docs (int)          : number of documents.
         """
+        summary, n_docs = SpaceSaving(self.vocabulary_budget), 0
+        for analyzed in self._iter_analyzed_chunks(corpus, chunk_size):
+            with self._stage("sketch_terms"):
+                for terms in analyzed:
+                    counts = {}
+                    for term in terms:
+                        counts[term] = counts.get(term, 0) + 1
+                    if self.binary:
+                        counts = dict.fromkeys(counts, 1)
+                    summary.update(counts)
+                    n_docs += 1
 
-        if TextOps.STOP_WORDS not in self.op_set:
-            return None
-        
-        assert stop_words is not None, \
-            "If stop words will be discarded from the data, stop_words must be specified !"
-        
-        if type(stop_words) == str:
-            assert stop_words == "#default", \
-                "If stop_words is given as a string, only supported value is 'default' !"
-        elif type(stop_words) == list:
-            assert len(stop_words) > 0, \
-                "If stop words are given, it cannot be empty !"
-
-        if (len(stop_words) == 1 and stop_words[0] == '#default') or stop_words == "#default":
-            return ENGLISH_STOP_WORDS
+        assert n_docs > 0, "Corpus has to include at least one document!"
+        return summary, n_docs
+
+
+    def _get_doc_count_limits(self, n_docs :int):
+        """
+        Description: Returns the max_df and min_df limits as document counts, as scikit-learn does.
+        """
+        max_doc_count = self.max_df if isinstance(self.max_df, Integral) else self.max_df * n_docs
+        min_doc_count = self.min_df if isinstance(self.min_df, Integral) else self.min_df * n_docs
+        return max_doc_count, min_doc_count
+
+
+    def _set_vocabulary_bound(self, error_bound :int, n_docs :int, dfs :np.ndarray, counts :np.ndarray):
+        """
+        Description: Sets 'vocabulary_error_bound_' and whether it proves the vocabulary built from the
+                     candidates is exact: either no term outside the candidates can reach min_df, or
+                     the max_features-th largest count of the candidates within min_df / max_df is
+                     above any count outside the candidates. With a max_features cut, the count at
+                     the cut must not be tied either, as scikit-learn breaks such ties by the
+                     positions of the terms among all the counted terms. Without any eviction, every
+                     term is a candidate and the vocabulary is exact.
+
+        Inputs:
+            error_bound (int)  : largest count of a term that is not a candidate.
+            n_docs (int)       : number of documents.
+            dfs (np.ndarray)   : exact document frequencies of the candidates.
+            counts (np.ndarray): exact counts the max_features are selected by, of the candidates.
+        """
+        max_doc_count, min_doc_count = self._get_doc_count_limits(n_docs)
+        if error_bound == 0:
+            # No term was evicted from the summary, every term is a candidate
+            self.vocabulary_error_bound_, self.vocabulary_exact_ = 0, True
+            return
+        exact = error_bound < min_doc_count
+        kept = -np.sort(-counts[(dfs <= max_doc_count) & (dfs >= min_doc_count)])
+        if self.max_features is not None and len(kept) >= self.max_features:
+            cut = kept[self.max_features - 1]
+            exact = (exact or cut > error_bound) and (len(kept) == self.max_features or kept[self.max_features] < cut)
+        self.vocabulary_error_bound_ = int(error_bound)
+        self.vocabulary_exact_ = bool(exact)
+
+
+    def _clear_fit_attributes(self):
+        """
+        Description: Removes the attributes of a previous fit that the next fit may not set.
+        """
+        for name in ["term_stats_", "vocabulary_error_bound_", "vocabulary_exact_"]:
+            if hasattr(self, name):
+                delattr(self, name)
+
+
+    def _prepare_fit(self):
+        """
+        Description: Runs the parameter and vocabulary checks that scikit-learn applies
+                     at the beginning of 'fit_transform'.
+        """
+        self._validate_params()
+        self._check_params()
+        self._validate_ngram_range()
+        self._warn_for_unused_params()
+        self._validate_vocabulary()
+
+
+    def _count_vocab(self, raw_documents :Iterable[str], fixed_vocab :bool):
+        """
+        Description: Records scikit-learn's analysis and counting of the documents as the
+                     'count_vocab' stage, if stats are enabled, and writes the newly analyzed
+                     documents to the analysis cache. In 'batch_normalize' mode, the documents are
+                     analyzed in two phases and counted from their terms. In a parallel 'train', the
+                     shards of the documents are counted by the workers and merged. With
+                     'vocabulary_budget', only the candidate terms of the first pass are counted.
+        """
+        if not fixed_vocab and self.vocabulary_budget is not None:
+            return self._count_vocab_approximate(raw_documents)
+
+        with self._stage("count_vocab"):
+            if self._fit_parallelism is not None:
+                result = self._count_vocab_parallel(raw_documents, fixed_vocab)
+            elif self._batch_normalizes():
+                with self._analyzed_input():
+                    result = super()._count_vocab(self._iter_batch_analyzed(raw_documents), fixed_vocab)
+            else:
+                result = super()._count_vocab(raw_documents, fixed_vocab)
+        self._flush_analysis_cache()
+        return result
+
+
+    def _count_vocab_approximate(self, raw_documents :List[str]):
+        """
+        Description: Bounded-memory alternative of scikit-learn's '_count_vocab' for 'train': finds
+                     the candidate terms with a Space-Saving summary, drops those that cannot reach
+                     min_df, and counts the documents with a vocabulary restricted to the candidates.
+                     The candidates get their indices in the order of their first occurrences, as in
+                     the exact count, and scikit-learn then applies min_df, max_df and max_features
+                     to their exact counts.
+        """
+        summary, n_docs = self._sketch_term_counts(raw_documents, 10000)
+        candidates = set(summary.candidates(self._get_doc_count_limits(n_docs)[1]))
+        error_bound = summary.error_bound
+        del summary
+        if len(candidates) == 0:
+            raise ValueError("empty vocabulary; perhaps the documents only contain stop words")
+
+        self._vocabulary_candidates = candidates
+        try:
+            if self._fit_parallelism is not None:
+                with self._stage("count_vocab"):
+                    vocabulary, X = self._count_vocab_parallel(raw_documents, False)
+            else:
+                self.vocabulary_ = _GrowingVocabulary(candidates)
+                vocabulary, X = self._count_vocab(raw_documents, True)
+                vocabulary = dict(vocabulary)
+        finally:
+            self._vocabulary_candidates = None
+        dfs = np.bincount(X.indices, minlength=len(vocabulary))
+        counts = dfs if self.binary else np.asarray(X.sum(axis=0)).ravel().astype(np.int64)
+        self._set_vocabulary_bound(error_bound, n_docs, dfs, counts)
+        return vocabulary, X
+
+
+    def _fit_from_term_stats(self, stats :TermStatistics):
+        """
+        Description: Fits the vocabulary and idf from accumulated term statistics. Applies 
+                     min_df, max_df and max_features exactly as scikit-learn's 'fit_transform' 
+                     does on the document-term matrix, so that both paths give the same 
+                     'vocabulary_' and 'idf_'.
+
+        Inputs:
+            stats (TermStatistics) : document and term frequencies of the whole corpus.
+
+        Outputs:
+            self (TfIdfModel)      : the fitted model itself.
+        """
+        if self.fixed_vocabulary_:
+            terms = sorted(self.vocabulary_, key=self.vocabulary_.get)
+            dfs = np.array([stats.dfs.get(t, 0) for t in terms], dtype=np.int64)
         else:
-            return stop_words
-    
-    
-    def build_preprocessor(self):
-        """
-        Description: Overrides of its parent's method since additional preprocessing 
-                     operations are also required. May add DigitPreprocessor or / and 
-                     PuncPreprocessor to the default preprocessor of scikit-learn's if requested.
-        """
-        preprocessors = [ExternalPreprocessor(super().build_preprocessor())]
-        if TextOps.DIGITS in self.op_set:
-            preprocessors.append(DigitPreprocessor())
-        if TextOps.PUNCTUATIONS in self.op_set:
-            preprocessors.append(PuncPreprocessor())
-        return MultiPreprocessor(preprocessors)
+            if len(stats) == 0:
+                raise ValueError("empty vocabulary; perhaps the documents only contain stop words")
+
+            terms = sorted(stats.dfs)
+            dfs = np.fromiter((stats.dfs[t] for t in terms), dtype=np.int64, count=len(terms))
+
+            max_doc_count, min_doc_count = self._get_doc_count_limits(stats.n_docs)
+            if max_doc_count < min_doc_count:
+                raise ValueError("max_df corresponds to < documents than min_df")
+
+            mask = (dfs <= max_doc_count) & (dfs >= min_doc_count)
+            if self.max_features is not None and mask.sum() > self.max_features:
+                # same dtype and ordering as the column sums in scikit-learn, so ties break alike
+                counts = stats.dfs if self.binary else stats.tfs
+                tfs = np.fromiter((counts[t] for t in terms), dtype=self.dtype, count=len(terms))
+                mask_inds = (-tfs[mask]).argsort()[:self.max_features]
+                new_mask = np.zeros(len(dfs), dtype=bool)
+                new_mask[np.where(mask)[0][mask_inds]] = True
+                mask = new_mask
+
+            kept_indices = np.where(mask)[0]
+            if len(kept_indices) == 0:
+                raise ValueError("After pruning, no terms remain. Try a lower min_df or a higher max_df.")
+
+            terms = [terms[i] for i in kept_indices]
+            dfs = dfs[kept_indices]
+            self.vocabulary_ = {t: i for i, t in enumerate(terms)}
+
+        self._set_idf(dfs, stats.n_docs)
+        self.term_stats_ = stats
+        return self
+
+
+    def _set_idf(self, dfs :np.ndarray, n_docs :int):
+        """
+        Description: Creates the inner TfidfTransformer of scikit-learn and sets its idf
+                     from the document frequencies of the vocabulary terms.
+
+        Inputs:
+            dfs (np.ndarray) : document frequency of each feature, ordered by feature index.
+            n_docs (int)     : number of documents the frequencies are counted from.
+        """
+        self._create_tfidf(len(dfs))
+
+        if self.use_idf:
+            self._tfidf.idf_ = self._compute_idf(dfs, n_docs)
+
+
+    def _create_tfidf(self, n_features :int):
+        """
+        Description: Creates the inner TfidfTransformer of scikit-learn with the parameters of 
+                     the model, as a fitted transformer of 'n_features' features.
+        """
+        self._tfidf = TfidfTransformer(
+            norm=self.norm,
+            use_idf=self.use_idf,
+            smooth_idf=self.smooth_idf,
+            sublinear_tf=self.sublinear_tf,
+            )
+        self._tfidf.n_features_in_ = n_features
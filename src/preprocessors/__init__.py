@@ -1,4 +1,5 @@
 from .digit_preprocessor import DigitPreprocessor
 from .punc_preprocessor import PuncPreprocessor
 from .multi_preprocessor import MultiPreprocessor
-from .external_preprocessor import ExternalPreprocessor
\ No newline at end of file
+from .external_preprocessor import ExternalPreprocessor
+from .fused_preprocessor import FusedPreprocessor
\ No newline at end of file
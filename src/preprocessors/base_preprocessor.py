@@ -1,5 +1,8 @@
 class BasePreprocessor:
 
+    # PipelineStats the calls are recorded into, None when not instrumented
+    stats = None
+
     def __init__(self):
         self.fn = None
 
@@ -8,4 +11,17 @@ class BasePreprocessor:
         Description: Applies the fn that is set by other child constructors.
         """
         assert text is not None, "Text to preprocess cannot be None"
-        return self.fn(text)
\ No newline at end of file
+        if self.stats is None:
+            return self.fn(text)
+        frame = self.stats.enter()
+        try:
+            return self.fn(text)
+        finally:
+            self.stats.exit(type(self).__name__, frame, chars=len(text))
+
+    def instrument(self, stats):
+        """
+        Description: Records the calls into the given PipelineStats, under the class name of the
+                     preprocessor. Passing None stops recording.
+        """
+        self.stats = stats
@@ -0,0 +1,49 @@
+import re
+import string
+from typing import Set
+
+from sklearn.feature_extraction.text import strip_accents_ascii, strip_accents_unicode
+
+from .base_preprocessor import BasePreprocessor
+from ..types import TextOps
+
+_MULTI_SPACE = re.compile(r' {2,}')
+
+class FusedPreprocessor(BasePreprocessor):
+    """
+    Description: Compiles the preprocessing operations of an op_set into a single callable. Lowering,
+                 accent stripping, digit removal, punctuation removal and whitespace collapsing are
+                 applied in as few passes as possible: digits and punctuations are handled together
+                 by one precompiled translation table. The output is the same as scikit-learn's
+                 preprocessor followed by DigitPreprocessor and PuncPreprocessor.
+    """
+
+    def __init__(self, op_set :Set[TextOps]):
+        op_set = op_set if op_set is not None else {}
+        assert TextOps.ASCII not in op_set or TextOps.UNICODE not in op_set, \
+            "Both ASCII and UNICODE cannot be applied together !"
+
+        self.lower = TextOps.LOWER in op_set
+        if TextOps.ASCII in op_set:
+            self.strip_accents = strip_accents_ascii
+        elif TextOps.UNICODE in op_set:
+            self.strip_accents = strip_accents_unicode
+        else:
+            self.strip_accents = None
+
+        table = {}
+        if TextOps.DIGITS in op_set:
+            table.update({ord(c): None for c in string.digits})
+        if TextOps.PUNCTUATIONS in op_set:
+            table.update({ord(c): " " for c in string.punctuation})
+        self.table = table if len(table) > 0 else None
+        self.fn = self.process_fused
+
+    def process_fused(self, text :str):
+        if self.lower:
+            text = text.lower()
+        if self.strip_accents is not None and not text.isascii():
+            text = self.strip_accents(text)
+        if self.table is not None:
+            text = _MULTI_SPACE.sub(" ", text.translate(self.table)).strip()
+        return text
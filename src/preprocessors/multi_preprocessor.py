@@ -22,4 +22,13 @@ class MultiPreprocessor(BasePreprocessor):
     def process_multi(self, text :str):
         for p in self.preprocessors:
             text = p(text)
-        return text
\ No newline at end of file
+        return text
+
+    def instrument(self, stats):
+        """
+        Description: Records the calls of the chain and of each preprocessor in it.
+        """
+        self.stats = stats
+        for p in self.preprocessors:
+            if isinstance(p, BasePreprocessor):
+                p.instrument(stats)
@@ -0,0 +1 @@
+from .inverted_index import InvertedIndex
\ No newline at end of file
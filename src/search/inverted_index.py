@@ -0,0 +1,188 @@
+import threading
+from typing import List, Tuple
+
+import numpy as np
+import scipy.sparse as sp
+
+from ..models.base_model import BaseModel
+
+
+class InvertedIndex:
+    """
+    Description: Inverted index of a fitted model's document-term matrix for top-k cosine queries.
+                 The posting list of each feature is a slice of two compact arrays, the ids of the
+                 documents containing the feature in increasing order and their weights, and the
+                 largest weight of each list is kept as a score upper bound.
+
+                 Queries are scored term-at-a-time with MaxScore pruning. The query terms are
+                 visited in decreasing order of their score upper bound, and their posting lists
+                 are scanned fully while a document outside the candidates could still enter the
+                 top-k. Once the upper bounds of the remaining terms add up to less than the k-th
+                 best partial score, no new document can enter. From then on the remaining (long,
+                 low-idf) posting lists are only probed for the candidates with binary searches,
+                 and the candidates that cannot reach the k-th score are dropped.
+
+    Attributes:
+        model (BaseModel)        : Fitted model used to analyze and weight the queries.
+        indptr (np.ndarray)      : Posting list boundaries, list of feature j is indptr[j]:indptr[j+1].
+        doc_ids (np.ndarray)     : Document ids of all posting lists, increasing within each list.
+        weights (np.ndarray)     : L2-normalized document weights of all posting lists.
+        max_weights (np.ndarray) : Largest weight of each posting list.
+        labels (list)            : Returned in place of the document ids if given.
+        last_stats (dict)        : Number of scanned / probed postings and candidates of the last query.
+    """
+
+    def __init__(self, model :BaseModel, X, labels :list=None):
+        X = sp.csr_matrix(X)
+        n_features = model.n_features if hasattr(model, "n_features") else len(model.vocabulary_)
+        assert X.ndim == 2 and X.shape[1] == n_features, \
+            "Document-term matrix should have a column for each feature of the model !"
+        assert X.nnz == 0 or X.data.min() >= 0, "Inverted index requires non-negative weights !"
+        assert labels is None or len(labels) == X.shape[0], "Each document should have a label !"
+
+        # Cosine similarity is the dot product of L2-normalized rows
+        norms = np.sqrt(np.asarray(X.multiply(X).sum(axis=1)).ravel())
+        norms[norms == 0] = 1.0
+        X = sp.csr_matrix(sp.diags(1.0 / norms) @ X)
+        X.eliminate_zeros()
+
+        postings = X.tocsc()
+        postings.sort_indices()
+        self.model = model
+        self.n_docs = X.shape[0]
+        self.indptr = postings.indptr.astype(np.int64)
+        self.doc_ids = postings.indices.astype(np.int32)
+        self.weights = postings.data
+        self.max_weights = np.zeros(X.shape[1], dtype=self.weights.dtype)
+        non_empty = np.diff(self.indptr) > 0
+        if non_empty.any():
+            self.max_weights[non_empty] = np.maximum.reduceat(self.weights, self.indptr[:-1][non_empty])
+        self.labels = labels
+        self.last_stats = {}
+        self._preprocess = model.build_preprocessor()
+        self._local = threading.local()
+
+    def __len__(self):
+        return self.n_docs
+
+    def _scratch(self):
+        """
+        Description: Returns the score accumulator and the seen-document mask of the calling thread.
+                     They are allocated once per thread and only the touched entries are reset after
+                     each query, so that a query does not pay for the size of the corpus.
+        """
+        if not hasattr(self._local, "scores"):
+            self._local.scores = np.zeros(self.n_docs)
+            self._local.seen = np.zeros(self.n_docs, dtype=bool)
+        return self._local.scores, self._local.seen
+
+    def posting_list(self, feature :int):
+        """
+        Description: Returns the document ids and weights of the feature's posting list.
+        """
+        start, end = self.indptr[feature], self.indptr[feature + 1]
+        return self.doc_ids[start:end], self.weights[start:end]
+
+    def query_vector(self, query :str):
+        """
+        Description: Runs the query through the model and returns its features and L2-normalized
+                     weights, sorted by decreasing score upper bound. A query that is empty after
+                     preprocessing has no features, as the tokenizers do not accept empty texts.
+        """
+        if len(self._preprocess(query).strip()) == 0:
+            return np.empty(0, dtype=np.int32), np.empty(0), np.empty(0)
+        q = sp.csr_matrix(self.model.transform([query]))
+        features, values = q.indices, q.data.astype(np.float64)
+        norm = np.sqrt(np.dot(values, values))
+        if norm > 0:
+            values = values / norm
+        bounds = values * self.max_weights[features]
+        order = np.argsort(-bounds, kind="stable")
+        return features[order], values[order], bounds[order]
+
+    def search(self, query :str, k :int=10):
+        """
+        Description: Returns the 'k' documents with the highest cosine similarity to the query.
+                     Documents that share no term with the query are never returned.
+
+        Inputs:
+            query (string) : Raw query text, analyzed like the documents.
+            k (int)        : Number of documents to return.
+
+        Outputs:
+            results (List[Tuple[int, float]]) : (document id or label, score) pairs in decreasing
+                                                score order, ties broken by document id.
+        """
+        assert type(query) == str, "Query has to be a string !"
+        assert k is not None and k > 0, "k should be a positive integer !"
+
+        features, values, bounds = self.query_vector(query)
+        remaining = np.cumsum(bounds[::-1])[::-1] - bounds  # upper bound of the later terms
+        scores, seen = self._scratch()
+        touched, candidates = [], None
+        stats = {"scanned_postings": 0, "probed_postings": 0, "full_terms": 0, "probed_terms": 0}
+
+        try:
+            for t in range(len(features)):
+                doc_ids, weights = self.posting_list(features[t])
+                if candidates is None:
+                    # A document outside the candidates can still enter the top-k
+                    stats["full_terms"] += 1
+                    stats["scanned_postings"] += len(doc_ids)
+                    new = doc_ids[~seen[doc_ids]]
+                    seen[new] = True
+                    touched.append(new)
+                    scores[doc_ids] += values[t] * weights
+
+                    if len(touched) > 1:
+                        touched = [np.concatenate(touched)]
+                    if len(touched[0]) >= k and t + 1 < len(features):
+                        threshold = np.partition(scores[touched[0]], -k)[-k]
+                        if remaining[t] < threshold:
+                            # Documents outside the candidates cannot reach the k-th score anymore
+                            candidates = np.sort(touched[0][scores[touched[0]] + remaining[t] >= threshold])
+                else:
+                    # Drop the candidates that cannot reach the k-th score, probe the others
+                    threshold = np.partition(scores[candidates], -k)[-k]
+                    candidates = candidates[scores[candidates] + remaining[t] + bounds[t] >= threshold]
+                    stats["probed_terms"] += 1
+                    stats["probed_postings"] += len(candidates)
+                    if len(doc_ids) == 0:
+                        continue
+                    pos = np.searchsorted(doc_ids, candidates)
+                    pos[pos == len(doc_ids)] = 0
+                    found = doc_ids[pos] == candidates
+                    scores[candidates[found]] += values[t] * weights[pos[found]]
+
+            all_touched = np.concatenate(touched) if len(touched) > 0 else np.empty(0, dtype=np.int32)
+            if candidates is None:
+                candidates = all_touched
+            stats["candidates"] = len(candidates)
+            self.last_stats = stats
+            return self._top_k(candidates, scores[candidates], k)
+        finally:
+            for ids in touched:
+                scores[ids] = 0.0
+                seen[ids] = False
+
+    def search_exhaustive(self, query :str, k :int=10):
+        """
+        Description: Scores every posting of the query terms without pruning. Gives the same
+                     results as 'search' and is kept as a reference.
+        """
+        features, values, _ = self.query_vector(query)
+        scores = np.zeros(self.n_docs)
+        for feature, value in zip(features, values):
+            doc_ids, weights = self.posting_list(feature)
+            scores[doc_ids] += value * weights
+        candidates = np.flatnonzero(scores > 0)
+        return self._top_k(candidates, scores[candidates], k)
+
+    def _top_k(self, candidates :np.ndarray, scores :np.ndarray, k :int) -> List[Tuple[int, float]]:
+        if len(candidates) > k:
+            # Keep every candidate tied with the k-th score, so that ties are broken by document id
+            keep = scores >= np.partition(scores, -k)[-k]
+            candidates, scores = candidates[keep], scores[keep]
+        order = np.lexsort((candidates, -scores))[:k]
+        return [(int(candidates[i]) if self.labels is None else self.labels[candidates[i]], float(scores[i]))
+                for i in order]
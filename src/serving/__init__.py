@@ -0,0 +1 @@
+from .micro_batcher import MicroBatcher, BatchMetrics
\ No newline at end of file
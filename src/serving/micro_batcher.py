@@ -0,0 +1,217 @@
+import asyncio
+import time
+from collections import Counter
+from concurrent.futures import Executor, ThreadPoolExecutor
+
+import scipy.sparse as sp
+
+from ..models.base_model import BaseModel
+
+
+class BatchMetrics:
+    """
+    Description: Queue-depth and batch-size statistics of a MicroBatcher.
+
+    Attributes:
+        n_requests (int)          : Number of documents submitted.
+        n_batches (int)           : Number of inference calls made.
+        batch_sizes (Counter)     : Number of batches of each size.
+        queue_depth (int)         : Number of requests waiting in the queue at the last batch.
+        max_queue_depth (int)     : Maximum number of requests seen waiting in the queue.
+        infer_seconds (float)     : Total time spent in the inference calls.
+    """
+
+    def __init__(self):
+        self.n_requests = 0
+        self.n_batches = 0
+        self.batch_sizes = Counter()
+        self.queue_depth = 0
+        self.max_queue_depth = 0
+        self.infer_seconds = 0.0
+
+    def record_queue_depth(self, depth :int):
+        self.queue_depth = depth
+        self.max_queue_depth = max(self.max_queue_depth, depth)
+
+    def record_batch(self, size :int, seconds :float):
+        self.n_batches += 1
+        self.batch_sizes[size] += 1
+        self.infer_seconds += seconds
+
+    def info(self):
+        """
+        Description: Returns the statistics as a dictionary.
+
+        Outputs:
+            info (dict) : request / batch counts, mean and max batch size, queue depths, the batch
+                          size histogram and the mean inference time per batch.
+        """
+        return {
+            "requests": self.n_requests,
+            "batches": self.n_batches,
+            "mean_batch_size": self.n_requests / self.n_batches if self.n_batches > 0 else 0.0,
+            "max_batch_size": max(self.batch_sizes) if len(self.batch_sizes) > 0 else 0,
+            "batch_sizes": dict(sorted(self.batch_sizes.items())),
+            "queue_depth": self.queue_depth,
+            "max_queue_depth": self.max_queue_depth,
+            "mean_infer_seconds": self.infer_seconds / self.n_batches if self.n_batches > 0 else 0.0,
+        }
+
+
+class MicroBatcher:
+    """
+    Description: Coalesces concurrent single-document transform requests into batches. A batch is
+                 dispatched when it reaches 'max_batch_size' documents or when its first document
+                 has waited 'max_wait' seconds. Each batch is transformed with one call to the model
+                 in an executor, off the event loop, and the rows are sent back to the callers.
+                 While a batch is being transformed new requests queue up, so the batches grow with
+                 the load and a lone request is answered after at most 'max_wait' seconds.
+
+    Usage:
+        async with MicroBatcher(model, max_batch_size=64, max_wait=0.002) as batcher:
+            row = await batcher.transform("some document")
+
+    Attributes:
+        model (BaseModel)      : Fitted model whose 'transform' is called on each batch.
+        max_batch_size (int)   : Maximum number of documents in a batch.
+        max_wait (float)       : Maximum seconds to wait for a batch to fill up.
+        executor (Executor)    : Executor of the inference calls. If None, a single thread is used.
+        metrics (BatchMetrics) : Queue-depth and batch-size statistics.
+    """
+
+    def __init__(self, model :BaseModel, max_batch_size :int=64, max_wait :float=0.002,
+                 executor :Executor=None):
+        assert max_batch_size is not None and max_batch_size > 0, "Batch size should be a positive integer !"
+        assert max_wait >= 0, "Maximum wait should be non-negative !"
+
+        self.model = model
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.executor = executor
+        self.metrics = BatchMetrics()
+
+        self._own_executor = executor is None
+        self._queue = None
+        self._worker = None
+
+    async def __aenter__(self):
+        self.start()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.stop()
+
+    def start(self):
+        """
+        Description: Starts the batching task on the running event loop.
+        """
+        assert self._worker is None, "Batcher is already started !"
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="micro-batcher")
+        self._queue = asyncio.Queue()
+        self._worker = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        """
+        Description: Answers the requests already queued and stops the batching task.
+        """
+        if self._worker is None:
+            return
+        await self._queue.put(None)
+        await self._worker
+        self._worker = None
+        if self._own_executor:
+            self.executor.shutdown(wait=False)
+            self.executor = None
+
+    async def transform(self, document :str):
+        """
+        Description: Queues a document and waits for its Tf-idf-weighted row.
+
+        Inputs:
+            document (string)  : Raw document.
+
+        Outputs:
+            row (sp.csr_matrix) : 1 x n_features row of the document.
+        """
+        assert type(document) == str, "Document has to be a string !"
+        assert self._worker is not None, "Batcher has to be started before transforming !"
+
+        future = asyncio.get_running_loop().create_future()
+        self.metrics.n_requests += 1
+        self._queue.put_nowait((document, future))
+        return await future
+
+    async def _collect(self, first :tuple):
+        """
+        Description: Gathers the requests of a batch, starting with 'first'. Returns the batch and
+                     whether the stop signal was received.
+        """
+        loop = asyncio.get_running_loop()
+        batch, deadline = [first], loop.time() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            if not self._queue.empty():
+                item = self._queue.get_nowait()
+            else:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+            if item is None:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def _infer(self, documents :list):
+        start = time.perf_counter()
+        X = sp.csr_matrix(self.model.transform(documents))
+        return X, time.perf_counter() - start
+
+    def _infer_each(self, documents :list):
+        # Transforms the documents one by one, so that a failing document only fails its own request
+        results = []
+        for document in documents:
+            try:
+                results.append(sp.csr_matrix(self.model.transform([document])))
+            except Exception as e:
+                results.append(e)
+        return results
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        stopping = False
+        while not stopping:
+            first = await self._queue.get()
+            if first is None:
+                break
+            self.metrics.record_queue_depth(self._queue.qsize() + 1)
+            batch, stopping = await self._collect(first)
+            futures = [future for _, future in batch]
+
+            try:
+                X, seconds = await loop.run_in_executor(self.executor, self._infer, [doc for doc, _ in batch])
+            except Exception as e:
+                # Retry the documents of a failed batch separately, only the failing ones get the error
+                results = [e] if len(batch) == 1 else \
+                    await loop.run_in_executor(self.executor, self._infer_each, [doc for doc, _ in batch])
+                for future, result in zip(futures, results):
+                    if not future.done():
+                        if isinstance(result, Exception):
+                            future.set_exception(result)
+                        else:
+                            future.set_result(result)
+                continue
+
+            self.metrics.record_batch(len(batch), seconds)
+            for i, future in enumerate(futures):
+                if not future.done():
+                    future.set_result(X[i])
+
+        # Requests queued after the stop signal are not answered
+        while not self._queue.empty():
+            item = self._queue.get_nowait()
+            if item is not None and not item[1].done():
+                item[1].set_exception(RuntimeError("Batcher is stopped !"))
@@ -1,2 +1,5 @@
 from .lemma_tokenizer import LemmaTokenizer
-from .stem_tokenizer import StemTokenizer
\ No newline at end of file
+from .stem_tokenizer import StemTokenizer
+from .token_cache import TokenCache
+from .resources import check_nltk_resources, ensure_nltk_resources, has_nltk_resource
+from .regex_word_tokenizer import RegexWordTokenizer
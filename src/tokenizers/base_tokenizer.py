@@ -1,16 +1,51 @@
-from typing import List
+from typing import Dict, Iterable, List
 
-import nltk
-nltk.download('punkt', quiet=True)
-nltk.download('omw-1.4', quiet=True)
+from .token_cache import TokenCache
+from .resources import ensure_nltk_resources, tokenizer_resources
 
-from nltk import word_tokenize  
+# Word tokenizers that split the text before the normalization of each token
+WORD_TOKENIZERS = ["nltk", "regex"]
+
+_WORKER_TOKENIZER = None
+
+def _init_normalize_worker(tokenizer):
+    """
+    Description: Process pool initializer that keeps the tokenizer in the worker, so that the
+                 lemmatizer / stemmer is handed over once per worker instead of once per chunk.
+    """
+    global _WORKER_TOKENIZER
+    _WORKER_TOKENIZER = tokenizer
+    tokenizer._prepare()
+
+def _normalize_chunk(tokens :List[str]):
+    return [_WORKER_TOKENIZER.tokenizer_fn(t) for t in tokens]
 
 class BaseTokenizer:
 
-    def __init__(self):
+    # PipelineStats the calls are recorded into, None when not instrumented
+    stats = None
+
+    def __init__(self, cache_size :int=None, cache_policy :str="lru", word_tokenizer :str="nltk"):
+        """
+        Description: Sets the optional token cache and the word tokenizer. Child constructors set the
+                     tokenizer, tokenizer_fn and the NLTK resources that tokenizer_fn needs.
+
+        Inputs:
+            cache_size (int)        : If not None, the normalized forms of at most this many tokens are cached.
+            cache_policy (string)   : Eviction policy of the cache. Options: ["lru", "fifo"]
+            word_tokenizer (string) : Splitter of the text into tokens. Options: ["nltk", "regex"]
+                                      "nltk" uses 'nltk.word_tokenize', "regex" the RegexWordTokenizer
+                                      that follows the same rules without the Punkt models, several
+                                      times faster.
+        """
+        assert word_tokenizer in WORD_TOKENIZERS, "Word tokenizer can be one of nltk or regex !"
+
+        self.word_tokenizer = word_tokenizer
         self.tokenizer = None
         self.tokenizer_fn = None
+        self.resources = []
+        self.word_tokenize = None
+        self.cache = TokenCache(cache_size, cache_policy) if cache_size is not None else None
     
     def __call__(self, text : str):
         """
@@ -19,6 +54,82 @@ class BaseTokenizer:
         assert text is not None and len(text) > 0, "Text to tokenize cannot be None or empty !"
         assert self.tokenizer is not None, "Tokenizer cannot be empty !"
         assert callable(self.tokenizer_fn), "Tokenizer function must be a callable !"
-        return [self.tokenizer_fn(t) for t in word_tokenize(text)]
+        if self.word_tokenize is None:
+            self._prepare()
+        if self.stats is not None:
+            return self._call_instrumented(text)
+        if self.cache is None:
+            return [self.tokenizer_fn(t) for t in self.word_tokenize(text)]
+        return self.cache.map(self.tokenizer_fn, self.word_tokenize(text))
+
+    def split(self, text :str):
+        """
+        Description: Splits the text into its surface tokens with the word tokenizer, without
+                     normalizing them. '__call__' is 'split' followed by the normalization of each token.
+        """
+        assert text is not None and len(text) > 0, "Text to tokenize cannot be None or empty !"
+        if self.word_tokenize is None:
+            self._prepare()
+        return self.word_tokenize(text)
+
+    def normalize_vocabulary(self, tokens :Iterable[str], pool=None, chunk_size :int=10000) -> Dict[str, str]:
+        """
+        Description: Normalizes each of the distinct tokens exactly once.
+
+        Inputs:
+            tokens (Iterable[str]) : Distinct surface tokens.
+            pool (mp.Pool)         : If not None, a process pool created with '_init_normalize_worker'
+                                     that normalizes chunks of the tokens.
+            chunk_size (int)       : Number of tokens sent to a worker at once.
+
+        Outputs:
+            normalized (Dict[str, str]) : Surface token to normalized form mapping.
+        """
+        tokens = list(tokens)
+        if self.word_tokenize is None:
+            self._prepare()
+        if pool is None or len(tokens) <= chunk_size:
+            return {t: self.tokenizer_fn(t) for t in tokens}
+        chunks = [tokens[i:i + chunk_size] for i in range(0, len(tokens), chunk_size)]
+        normalized = {}
+        for chunk, forms in zip(chunks, pool.map(_normalize_chunk, chunks, chunksize=1)):
+            normalized.update(zip(chunk, forms))
+        return normalized
+
+    def _call_instrumented(self, text :str):
+        """
+        Description: Same as '__call__', recording the word tokenization and the normalization of the
+                     tokens as separate stages.
+        """
+        frame = self.stats.enter()
+        tokens = self.word_tokenize(text)
+        self.stats.exit("word_tokenize", frame, chars=len(text), tokens=len(tokens))
 
-    
\ No newline at end of file
+        frame = self.stats.enter()
+        if self.cache is None:
+            normalized = [self.tokenizer_fn(t) for t in tokens]
+        else:
+            normalized = self.cache.map(self.tokenizer_fn, tokens)
+        self.stats.exit(type(self).__name__, frame, tokens=len(normalized))
+        return normalized
+
+    def _prepare(self):
+        """
+        Description: Verifies the NLTK resources and imports the word tokenizer on the first call,
+                     so that creating a tokenizer does not need network access. The regex word
+                     tokenizer does not need the Punkt resources.
+        """
+        if self.word_tokenizer == "regex":
+            from .regex_word_tokenizer import RegexWordTokenizer
+            ensure_nltk_resources(self.resources)
+            self.word_tokenize = RegexWordTokenizer()
+        else:
+            from nltk import word_tokenize
+            ensure_nltk_resources(tokenizer_resources() + self.resources)
+            self.word_tokenize = word_tokenize
+
+    def cache_info(self):
+        """
+        Description: Returns the hit / miss statistics of the token cache, None if caching is disabled.
+        """
+        return self.cache.info() if self.cache is not None else None
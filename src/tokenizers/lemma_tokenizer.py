@@ -1,14 +1,13 @@
-import nltk
-nltk.download('wordnet', quiet=True)
-
-from nltk.stem import WordNetLemmatizer 
-
 from .base_tokenizer import BaseTokenizer
 
 class LemmaTokenizer(BaseTokenizer):
     """
     Desription: Applies lemmatizing operation of 'WordNetLemmatizer' in NLTK as tokenization.
     """
-    def __init__(self):
+    def __init__(self, cache_size :int=None, cache_policy :str="lru", word_tokenizer :str="nltk"):
+        from nltk.stem import WordNetLemmatizer 
+
+        super().__init__(cache_size, cache_policy, word_tokenizer)
         self.tokenizer = WordNetLemmatizer()
-        self.tokenizer_fn = self.tokenizer.lemmatize
\ No newline at end of file
+        self.tokenizer_fn = self.tokenizer.lemmatize
+        self.resources = ["wordnet", "omw-1.4"]
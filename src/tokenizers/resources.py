@@ -0,0 +1,89 @@
+import os
+import sys
+from typing import List
+
+# Name of each NLTK resource and its path in the NLTK data directory
+NLTK_RESOURCES = {
+    "punkt_tab": "tokenizers/punkt_tab",
+    "punkt"    : "tokenizers/punkt",
+    "wordnet"  : "corpora/wordnet",
+    "omw-1.4"  : "corpora/omw-1.4",
+}
+
+# Set this environment variable to never download a missing resource
+OFFLINE_ENV = "TFIDF_NLTK_OFFLINE"
+
+_verified = set()
+
+
+def tokenizer_resources():
+    """
+    Description: Returns the resources that 'nltk.word_tokenize' needs in the installed NLTK version.
+                 NLTK >= 3.8.2 reads the Punkt parameters from 'punkt_tab' instead of 'punkt'.
+    """
+    from nltk.tokenize import punkt
+    return ["punkt_tab"] if hasattr(punkt, "PunktTokenizer") else ["punkt"]
+
+
+def has_nltk_resource(name :str):
+    """
+    Description: Checks if the NLTK resource is installed, without downloading it.
+
+    Inputs:
+        name (string) : Name of the resource, one of the keys of NLTK_RESOURCES.
+    """
+    assert name in NLTK_RESOURCES, "Unknown NLTK resource: %s !" % name
+    import nltk
+    for path in [NLTK_RESOURCES[name], NLTK_RESOURCES[name] + ".zip"]:
+        try:
+            nltk.data.find(path)
+            return True
+        except LookupError:
+            continue
+    return False
+
+
+def ensure_nltk_resources(names :List[str]):
+    """
+    Description: Makes sure that the NLTK resources are installed. A missing resource is downloaded
+                 unless the TFIDF_NLTK_OFFLINE environment variable is set, in which case a
+                 LookupError tells how to install it. Verified resources are not checked again.
+
+    Inputs:
+        names (List[string]) : Names of the resources, keys of NLTK_RESOURCES.
+    """
+    for name in names:
+        if name in _verified:
+            continue
+        if not has_nltk_resource(name):
+            if not os.environ.get(OFFLINE_ENV):
+                import nltk
+                nltk.download(name, quiet=True)
+            if not has_nltk_resource(name):
+                raise LookupError(
+                    "NLTK resource '%s' is not installed. Install it with "
+                    "'python -m src.tokenizers.resources --download' or "
+                    "'python -m nltk.downloader %s'." % (name, name))
+        _verified.add(name)
+
+
+def check_nltk_resources():
+    """
+    Description: Reports which of the NLTK resources used by the tokenizers are installed, offline.
+
+    Outputs:
+        status (Dict[str, bool]) : Resource name to installation status.
+    """
+    return {name: has_nltk_resource(name) for name in tokenizer_resources() + ["wordnet", "omw-1.4"]}
+
+
+if __name__ == "__main__":
+    if "--download" in sys.argv:
+        import nltk
+        for name in tokenizer_resources() + ["wordnet", "omw-1.4"]:
+            nltk.download(name, quiet=True)
+
+    status = check_nltk_resources()
+    for name, installed in status.items():
+        print("%-10s: %s" % (name, "installed" if installed else "missing"))
+    sys.exit(0 if all(status.values()) else 1)
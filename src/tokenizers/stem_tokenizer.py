@@ -1,10 +1,12 @@
-from nltk.stem.porter import PorterStemmer
 from .base_tokenizer import BaseTokenizer
 
 class StemTokenizer(BaseTokenizer):
     """
     Desription: Applies stemming operation of 'PorterStemmer' in NLTK as tokenization.
     """
-    def __init__(self):
+    def __init__(self, cache_size :int=None, cache_policy :str="lru", word_tokenizer :str="nltk"):
+        from nltk.stem.porter import PorterStemmer
+
+        super().__init__(cache_size, cache_policy, word_tokenizer)
         self.tokenizer = PorterStemmer()
-        self.tokenizer_fn = self.tokenizer.stem
\ No newline at end of file
+        self.tokenizer_fn = self.tokenizer.stem
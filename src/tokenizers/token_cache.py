@@ -0,0 +1,92 @@
+from collections import OrderedDict
+from typing import Callable, Iterable
+
+
+class TokenCache:
+    """
+    Description: Bounded memoization cache of token -> normalized form mappings. Since the token
+                 streams of natural language are Zipfian, a few thousand entries serve most of the
+                 lemmatizer / stemmer calls.
+
+    Attributes:
+        max_size (int)  : Maximum number of tokens to keep in the cache.
+        policy (string) : Eviction policy when the cache is full. Options: ["lru", "fifo"]
+                          "lru" evicts the least recently used token, "fifo" evicts the oldest
+                          inserted token and is cheaper on hits.
+        hits (int)      : Number of lookups answered from the cache.
+        misses (int)    : Number of lookups that called the normalization function.
+        evictions (int) : Number of tokens removed due to the size bound.
+    """
+
+    def __init__(self, max_size :int=100000, policy :str="lru"):
+        assert max_size is not None and max_size > 0, "Cache size should be a positive integer !"
+        assert policy in ["lru", "fifo"], "Cache policy can be one of lru or fifo !"
+
+        self.max_size = max_size
+        self.policy = policy
+        self.clear()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __getstate__(self):
+        # Worker processes start with an empty cache of the same configuration
+        return {"max_size": self.max_size, "policy": self.policy}
+
+    def __setstate__(self, state :dict):
+        self.__init__(state["max_size"], state["policy"])
+
+    def clear(self):
+        """
+        Description: Removes all the cached tokens and resets the statistics.
+        """
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def map(self, fn :Callable[[str], str], tokens :Iterable[str]):
+        """
+        Description: Applies 'fn' to each token, answering the repeated tokens from the cache.
+
+        Inputs:
+            fn (Callable[[str], str]) : Normalization function such as a lemmatizer or a stemmer.
+            tokens (Iterable[str])    : Tokens to normalize.
+
+        Outputs:
+            normalized (List[str])    : Normalized forms of the tokens in the same order.
+        """
+        entries, lru = self.entries, self.policy == "lru"
+        normalized = []
+        for token in tokens:
+            value = entries.get(token)
+            if value is not None:
+                self.hits += 1
+                if lru:
+                    entries.move_to_end(token)
+            else:
+                self.misses += 1
+                value = fn(token)
+                entries[token] = value
+                if len(entries) > self.max_size:
+                    entries.popitem(last=False)
+                    self.evictions += 1
+            normalized.append(value)
+        return normalized
+
+    def info(self):
+        """
+        Description: Returns the hit / miss statistics of the cache.
+
+        Outputs:
+            info (dict) : hits, misses, evictions, current size, max size and hit rate.
+        """
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "size": len(self.entries),
+            "max_size": self.max_size,
+            "hit_rate": self.hits / lookups if lookups > 0 else 0.0,
+        }
@@ -1,2 +1,4 @@
 from .io import IO
-from .visualize import Visualizer
\ No newline at end of file
+from .visualize import Visualizer
+from .pipeline_stats import PipelineStats, StageStats
+from .analysis_cache import AnalysisCache
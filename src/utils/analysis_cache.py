@@ -0,0 +1,250 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Callable, List, Union
+
+# Version of the stored token format, part of every fingerprint
+ANALYSIS_CACHE_VERSION = 1
+
+_SCHEMA = [
+    "CREATE TABLE IF NOT EXISTS entries (key BLOB PRIMARY KEY, tokens BLOB NOT NULL, "
+    "size INTEGER NOT NULL, last_used REAL NOT NULL) WITHOUT ROWID",
+    "CREATE INDEX IF NOT EXISTS entries_last_used ON entries (last_used)",
+    "CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value INTEGER NOT NULL)",
+    "INSERT OR IGNORE INTO meta VALUES ('total_bytes', 0)",
+]
+
+
+def analysis_fingerprint(settings :dict):
+    """
+    Description: Digest of the settings that determine the analyzer output, used as the key of the
+                 document hashes. Documents analyzed with different settings never share entries.
+
+    Inputs:
+        settings (dict) : JSON serializable analyzer settings.
+
+    Outputs:
+        fingerprint (bytes) : 32 bytes digest.
+    """
+    settings = dict(settings, cache_version=ANALYSIS_CACHE_VERSION)
+    return hashlib.blake2b(json.dumps(settings, sort_keys=True).encode("utf-8"), digest_size=32).digest()
+
+
+class AnalysisCache:
+    """
+    Description: Persistent cache of analyzed documents in a SQLite file, addressed by the hash of
+                 the document text keyed with the fingerprint of the analyzer settings. Repeated runs
+                 and 'infer' calls on already seen documents read the token sequences back instead of
+                 running the preprocessing, tokenization and lemmatization / stemming again.
+
+                 New entries and the access times of the hits are buffered and written in a single
+                 transaction every 'batch_size' operations and when 'flush' is called. When the
+                 stored tokens exceed 'max_bytes', the least recently used entries are evicted down
+                 to 90% of it. The file is opened in WAL mode with a busy timeout, so several
+                 processes (e.g. the workers of a parallel inference) can read and write it at once;
+                 each process and each thread opens its own connection, as SQLite connections cannot
+                 be shared across threads (e.g. the executor of a MicroBatcher or threaded WSGI
+                 workers). The buffers are shared by the threads behind a lock.
+
+    Attributes:
+        path (string)    : Path of the SQLite file.
+        max_bytes (int)  : Size cap of the stored keys and token sequences.
+        batch_size (int) : Number of buffered writes that triggers a flush.
+        timeout (float)  : Seconds to wait for the lock of another process.
+        hits (int)       : Number of documents answered from the cache.
+        misses (int)     : Number of documents that are analyzed.
+        writes (int)     : Number of entries written to the file.
+        evictions (int)  : Number of entries evicted by this process.
+    """
+
+    def __init__(self, path :str, max_bytes :int=1 << 30, batch_size :int=1000, timeout :float=30.0):
+        assert max_bytes > 0, "Cache size should be a positive integer !"
+        assert batch_size > 0, "Batch size should be a positive integer !"
+
+        self.path = path
+        self.max_bytes = max_bytes
+        self.batch_size = batch_size
+        self.timeout = timeout
+        self._local = threading.local()
+        self._lock = threading.RLock()
+        self._pending = {}
+        self._touched = {}
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+
+    def __getstate__(self):
+        # Copies in worker processes open their own connection and start with empty buffers
+        return {"path": self.path, "max_bytes": self.max_bytes, "batch_size": self.batch_size,
+                "timeout": self.timeout}
+
+    def __setstate__(self, state :dict):
+        self.__init__(**state)
+
+    def __len__(self):
+        return self._connect().execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    def _connect(self):
+        # A connection cannot be shared with a forked process or another thread, each (pid, thread) has its own
+        local = self._local
+        if getattr(local, "conn", None) is None or local.pid != os.getpid():
+            directory = os.path.dirname(os.path.abspath(self.path))
+            os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                for statement in _SCHEMA:
+                    conn.execute(statement)
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            local.conn, local.pid = conn, os.getpid()
+        return local.conn
+
+    def key(self, fingerprint :bytes, document :Union[str, bytes]):
+        """
+        Description: Returns the 16 bytes address of the document analyzed with the fingerprinted settings.
+        """
+        if type(document) == str:
+            document = document.encode("utf-8", "surrogatepass")
+        return hashlib.blake2b(document, digest_size=16, key=fingerprint).digest()
+
+    def get(self, key :bytes):
+        """
+        Description: Returns the cached token sequence of the key, None if it is not cached.
+        """
+        tokens = self._pending.get(key)
+        if tokens is None:
+            row = self._connect().execute("SELECT tokens FROM entries WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            tokens = json.loads(row[0])
+            with self._lock:
+                self._touched[key] = time.time()
+                if len(self._touched) >= self.batch_size:
+                    self.flush()
+        return tokens
+
+    def put(self, key :bytes, tokens :List[str]):
+        """
+        Description: Buffers the token sequence of the key, to be written on the next flush.
+        """
+        with self._lock:
+            self._pending[key] = tokens
+            if len(self._pending) >= self.batch_size:
+                self.flush()
+
+    def wrap(self, fingerprint :bytes, analyze :Callable[[str], List[str]]):
+        """
+        Description: Returns a callable that answers the documents from the cache and calls 'analyze'
+                     on the others, caching their token sequences.
+        """
+        def cached_analyze(document):
+            key = self.key(fingerprint, document)
+            tokens = self.get(key)
+            if tokens is not None:
+                self.hits += 1
+                return tokens
+            self.misses += 1
+            tokens = analyze(document)
+            self.put(key, tokens)
+            return tokens
+        return cached_analyze
+
+    def flush(self):
+        """
+        Description: Writes the buffered entries and access times in a single transaction and evicts
+                     the least recently used entries if the size cap is exceeded.
+        """
+        with self._lock:
+            if len(self._pending) == 0 and len(self._touched) == 0:
+                return
+            conn = self._connect()
+            now = time.time()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                added = 0
+                for key, tokens in self._pending.items():
+                    blob = json.dumps(tokens, ensure_ascii=False).encode("utf-8")
+                    size = len(key) + len(blob)
+                    # Another process may have cached the same document in the meantime
+                    if conn.execute("INSERT OR IGNORE INTO entries VALUES (?, ?, ?, ?)",
+                                    (key, blob, size, now)).rowcount > 0:
+                        added += size
+                        self.writes += 1
+                conn.executemany("UPDATE entries SET last_used = ? WHERE key = ?",
+                                 [(used, key) for key, used in self._touched.items()])
+                conn.execute("UPDATE meta SET value = value + ? WHERE name = 'total_bytes'", (added,))
+                total = conn.execute("SELECT value FROM meta WHERE name = 'total_bytes'").fetchone()[0]
+                if total > self.max_bytes:
+                    self._evict(conn, total - int(0.9 * self.max_bytes))
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            self._pending.clear()
+            self._touched.clear()
+
+    def _evict(self, conn :sqlite3.Connection, n_bytes :int):
+        # Deletes the least recently used entries until at least 'n_bytes' bytes are freed
+        freed, keys = 0, []
+        for key, size in conn.execute("SELECT key, size FROM entries ORDER BY last_used"):
+            if freed >= n_bytes:
+                break
+            keys.append((key,))
+            freed += size
+        conn.executemany("DELETE FROM entries WHERE key = ?", keys)
+        conn.execute("UPDATE meta SET value = value - ? WHERE name = 'total_bytes'", (freed,))
+        self.evictions += len(keys)
+
+    def clear(self):
+        """
+        Description: Removes all the entries from the file and resets the statistics.
+        """
+        conn = self._connect()
+        with self._lock:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute("DELETE FROM entries")
+            conn.execute("UPDATE meta SET value = 0 WHERE name = 'total_bytes'")
+            conn.execute("COMMIT")
+            self._pending.clear()
+            self._touched.clear()
+        self.hits = self.misses = self.writes = self.evictions = 0
+
+    def close(self):
+        """
+        Description: Flushes the buffers and closes the connection of the calling thread.
+        """
+        local = self._local
+        if getattr(local, "conn", None) is not None and local.pid == os.getpid():
+            self.flush()
+            local.conn.close()
+        local.conn = None
+
+    def info(self):
+        """
+        Description: Returns the hit / miss statistics of this process and the size of the file.
+
+        Outputs:
+            info (dict) : hits, misses, writes, evictions, hit rate, number of entries and their bytes.
+        """
+        self.flush()
+        conn = self._connect()
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "writes": self.writes,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups > 0 else 0.0,
+            "entries": conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0],
+            "bytes": conn.execute("SELECT value FROM meta WHERE name = 'total_bytes'").fetchone()[0],
+            "max_bytes": self.max_bytes,
+        }
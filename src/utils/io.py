@@ -1,69 +1,83 @@
 import os
-import json
-from typing import List, Union, Any
+import shutil
+import tempfile
+import zipfile
+from itertools import islice
+from typing import List, Union, Any, Iterable
 
 import numpy as np 
-import pandas as pd
+import scipy.sparse as sp
 
 class IO:
     """
     Description: A collection of basic data reading and writing operations.
     """
     
-    def create_corpus_txt_from_json_list_file(inp_path :str, out_path :str, key :Any):
+    def create_corpus_txt_from_json_list_file(inp_path :str, out_path :str, key :Any, n_jobs :int=1, chunk_bytes :int=1 << 24):
         """
-        Description: Reads the corpus '.json' or '.jsonl' file that includes a list of 
-                     dictionaries. Iterates through the dictionaries and selects the 
-                     items that has the 'key'.
+        Description: Reads the corpus '.jsonl' file that includes a JSON dictionary at each line, 
+                     optionally compressed as '.gz', '.bz2' or '.xz'. Streams the file in chunks,
+                     parses them in 'n_jobs' processes and writes the items that have the 'key' 
+                     in the order of the lines. Malformed lines are skipped and reported.
         
         Inputs:
             inp_path (string) : Path of the corpus .json or .jsonl file
             out_path (string) : Path to write the extracted corpus .txt
             key (Union[int, string, float]) : key to select from each json dict.
+            n_jobs (int)      : number of worker processes, -1 to use all the cores.
+            chunk_bytes (int) : approximate number of bytes parsed by a worker at once.
+
+        Outputs:
+            stats (dict)      : numbers of lines, records and skipped malformed lines, line numbers 
+                                of the first skipped lines, bytes read, seconds and throughputs.
         """
         assert ".json" in inp_path or ".jsonl" in inp_path
         assert ".txt" in out_path
 
-        try:
-            with open(inp_path, "r") as f:
-                lines = f.readlines()
-            
-            f_out = open(out_path, "w")
-            for line in lines:
-                d = json.loads(line)
-                f_out.write(d[key].replace("\n", "").strip() + "\n")
-            f_out.close()
-        except:
-            raise UnicodeDecodeError("File to read or write is not correct !") 
+        from .jsonl import extract_jsonl_corpus
+        return extract_jsonl_corpus(inp_path, out_path, key, n_jobs=n_jobs, chunk_bytes=chunk_bytes)
     
     
-    def create_corpus_txt_from_json_file(inp_path :str, out_path :str, key :Union[int, str, float]):
+    def create_corpus_txt_from_json_file(inp_path :str, out_path :str, key :Union[int, str, float], chunk_size :int=1 << 16):
         """
         Description: Reads the corpus '.json' file that includes a series of keys and values. Iterates through
-                     the values that are dicts and selects the items that has the 'key'.
+                     the values that are lists of dicts and selects the items that has the 'key'. The file is 
+                     parsed incrementally, so memory does not grow with the file size.
 
         Inputs:
             inp_path (string) : Path of the corpus .json file
             out_path (string) : Path to write the extracted corpus .txt
             key (Union[int, string, float]) : key to select from the json in the 2nd depth.
+            chunk_size (int)  : number of characters read from the file at once.
+
+        Outputs:
+            stats (dict)      : numbers of elements, written documents and skipped elements, and seconds.
         """
         assert ".json" in inp_path
         assert ".txt" in out_path
 
-        try:
-            with open(inp_path, "r") as f:
-                d = json.load(f)
+        from .json_stream import extract_json_file
+        return extract_json_file(inp_path, out_path, key, chunk_size)
 
-            f_out = open(out_path, "w")
 
-            for k in d.keys():
-                for el in d[k]:
-                    txt = el[k].replace("\n", "").strip()
-                    f_out.write(txt + "\n")
-            f_out.close()
-        
-        except:
-            raise UnicodeDecodeError("File to read or write is not correct !") 
+    def create_corpus_txt_from_json_files(inp_paths :List[str], out_paths :List[str], key :Union[int, str, float], n_jobs :int=1):
+        """
+        Description: Runs 'create_corpus_txt_from_json_file' on several files, 'n_jobs' of them concurrently.
+
+        Inputs:
+            inp_paths (List[string]) : Paths of the corpus .json files
+            out_paths (List[string]) : Paths to write the extracted corpus .txt files
+            key (Union[int, string, float]) : key to select from the json in the 2nd depth.
+            n_jobs (int)      : number of worker processes, -1 to use all the cores.
+
+        Outputs:
+            stats (List[dict]) : stats of each file, in the order of the inputs.
+        """
+        assert all(".json" in path for path in inp_paths)
+        assert all(".txt" in path for path in out_paths)
+
+        from .json_stream import extract_json_files
+        return extract_json_files(inp_paths, out_paths, key, n_jobs=n_jobs)
 
     
     def read_txt_corpus(filepath :str):
@@ -84,34 +98,322 @@ class IO:
             return lines
         except:
             raise UnicodeDecodeError("File to read is not correct !")
+
+
+    def iter_txt_corpus(filepath :str, chunk_size :int=10000):
+        """
+        Description: Lazily reads the corpus '.txt' file that includes a document at each line,
+                     so that at most 'chunk_size' documents are kept in memory at once.
+        
+        Inputs:
+            filepath (string) : Path of the corpus .txt
+            chunk_size (int)  : Maximum number of documents in each yielded chunk.
+        
+        Outputs:
+            chunk (List[str]) : Next list of documents that are in string format.
+        """
+        assert ".txt" in filepath
+        assert chunk_size > 0, "Chunk size should be a positive integer !"
+
+        with open(filepath, "r") as f:
+            while True:
+                chunk = list(islice(f, chunk_size))
+                if len(chunk) == 0:
+                    break
+                yield chunk
         
 
     
     def save_to_csv(
-        data     :np.ndarray, 
-        filepath :str, 
-        rownames :List[Union[str, int, float]]=None, 
-        colnames :List[Union[str, int, float]]=None):
+        data       :Union[np.ndarray, sp.spmatrix], 
+        filepath   :str, 
+        rownames   :List[Union[str, int, float]]=None, 
+        colnames   :List[Union[str, int, float]]=None,
+        chunk_size :int=10000):
     
         """
-        Description: Saves the 2D np.array data to a csv file.
+        Description: Saves the 2D np.array or scipy sparse data to a csv file. Sparse data is 
+                     densified and written in chunks of rows, so that the whole matrix is never 
+                     converted to a dense array at once.
 
         Inputs:
-            data (np.array, 2D) : data to save
+            data (Union[np.ndarray, sp.spmatrix], 2D) : data to save
             filepath (str)      : file path to save the data
             rownames (List[Union[str, int, float]]) : name of the rows to save in CSV
             colnames (List[Union[str, int, float]]) : name of the cols to save in CSV
+            chunk_size (int)    : number of rows to densify at once for the sparse data
         """
         assert len(filepath) > 4 and filepath[-4:] == ".csv", \
             "Filepath should have '.csv' extension !"
         assert rownames is None or data.shape[0] == len(rownames)
         assert colnames is None or data.shape[1] == len(colnames)
         assert len(data.shape) == 2, "Given data should be a 2D numpy array"
+        assert chunk_size > 0, "Chunk size should be a positive integer !"
+
+        import pandas as pd
 
         if rownames is None:
             rownames = np.arange(data.shape[0])
         if colnames is None:
             colnames = np.arange(data.shape[1])
 
-        df = pd.DataFrame(data=data, index=rownames, columns=colnames)
-        df.to_csv(filepath)
\ No newline at end of file
+        if not sp.issparse(data):
+            df = pd.DataFrame(data=data, index=rownames, columns=colnames)
+            df.to_csv(filepath)
+            return
+
+        data = sp.csr_matrix(data)
+        for start in range(0, max(data.shape[0], 1), chunk_size):
+            end = min(start + chunk_size, data.shape[0])
+            df = pd.DataFrame(data=data[start:end].toarray(), index=rownames[start:end], columns=colnames)
+            df.to_csv(filepath, mode="w" if start == 0 else "a", header=start == 0)
+
+
+    def _iter_row_chunks(data :Union[np.ndarray, sp.spmatrix, Iterable[sp.spmatrix]], chunk_size :int):
+        """
+        Description: Yields the rows of a matrix as CSR chunks of at most 'chunk_size' rows. An
+                     iterable of matrices, e.g. the 'infer' results of corpus chunks, is yielded
+                     chunk by chunk as is, so that it never has to be in memory as a whole.
+        """
+        assert chunk_size > 0, "Chunk size should be a positive integer !"
+        if isinstance(data, np.ndarray) or sp.issparse(data):
+            assert len(data.shape) == 2, "Given data should be a 2D numpy array"
+            if sp.issparse(data):
+                data = sp.csr_matrix(data)
+            for start in range(0, data.shape[0], chunk_size):
+                yield sp.csr_matrix(data[start:start + chunk_size])
+        else:
+            for chunk in data:
+                assert len(chunk.shape) == 2, "Each chunk should be a 2D matrix !"
+                yield sp.csr_matrix(chunk)
+
+
+    def _write_npy_entry(archive :zipfile.ZipFile, name :str, dtype :np.dtype, count :int, src_path :str=None, array :np.ndarray=None):
+        """
+        Description: Writes a 1D '.npy' entry to the archive, either from an array or from the raw
+                     bytes of 'count' items in 'src_path', which are copied in blocks.
+        """
+        header = {"descr": np.lib.format.dtype_to_descr(np.dtype(dtype)), "fortran_order": False, "shape": (count,)}
+        with archive.open(name + ".npy", "w", force_zip64=True) as f:
+            if array is not None:
+                np.lib.format.write_array(f, array)
+                return
+            np.lib.format.write_array_header_1_0(f, header)
+            with open(src_path, "rb") as src:
+                shutil.copyfileobj(src, f, 1 << 20)
+
+
+    def save_to_npz(
+        data       :Union[np.ndarray, sp.spmatrix, Iterable[sp.spmatrix]],
+        filepath   :str,
+        rownames   :List[Union[str, int, float]]=None,
+        colnames   :List[Union[str, int, float]]=None,
+        chunk_size :int=10000):
+
+        """
+        Description: Saves the rows of the data in chunks to a compressed '.npz' file in the format of
+                     'scipy.sparse.save_npz', readable by 'scipy.sparse.load_npz'. The CSR arrays of
+                     each chunk are appended to temporary files, which are then compressed into the
+                     archive, so that at most one chunk is in memory. Row and column names are kept
+                     in the archive as 'rownames' and 'colnames'.
+
+        Inputs:
+            data (Union[np.ndarray, sp.spmatrix, Iterable[sp.spmatrix]]) : matrix or row chunks to save
+            filepath (str)      : file path to save the data
+            rownames (List[Union[str, int, float]]) : name of the rows to save
+            colnames (List[Union[str, int, float]]) : name of the cols to save
+            chunk_size (int)    : number of rows to convert at once for the matrix data
+        """
+        assert filepath.endswith(".npz"), "Filepath should have '.npz' extension !"
+
+        tmpdir = tempfile.mkdtemp(dir=os.path.dirname(os.path.abspath(filepath)))
+        try:
+            data_path, indices_path = os.path.join(tmpdir, "data"), os.path.join(tmpdir, "indices")
+            indptr, n_rows, n_cols, nnz, dtype = [np.zeros(1, dtype=np.int64)], 0, None, 0, None
+            with open(data_path, "wb") as f_data, open(indices_path, "wb") as f_indices:
+                for chunk in IO._iter_row_chunks(data, chunk_size):
+                    assert n_cols is None or chunk.shape[1] == n_cols, "Chunks should have the same number of columns !"
+                    assert dtype is None or chunk.dtype == dtype, "Chunks should have the same dtype !"
+                    n_cols, dtype = chunk.shape[1], chunk.dtype
+                    f_data.write(chunk.data.tobytes())
+                    f_indices.write(chunk.indices.astype(np.int32).tobytes())
+                    indptr.append(chunk.indptr[1:].astype(np.int64) + nnz)
+                    n_rows, nnz = n_rows + chunk.shape[0], nnz + chunk.nnz
+
+            assert n_cols is not None, "Data should have at least one row !"
+            assert rownames is None or len(rownames) == n_rows
+            assert colnames is None or len(colnames) == n_cols
+            indptr = np.concatenate(indptr)
+            if nnz < np.iinfo(np.int32).max:
+                indptr = indptr.astype(np.int32)
+
+            with zipfile.ZipFile(filepath, "w", compression=zipfile.ZIP_DEFLATED, allowZip64=True) as archive:
+                IO._write_npy_entry(archive, "indices", np.int32, nnz, src_path=indices_path)
+                IO._write_npy_entry(archive, "indptr", indptr.dtype, len(indptr), array=indptr)
+                IO._write_npy_entry(archive, "format", None, 0, array=np.array("csr"))
+                IO._write_npy_entry(archive, "shape", None, 0, array=np.array([n_rows, n_cols]))
+                IO._write_npy_entry(archive, "data", dtype, nnz, src_path=data_path)
+                if rownames is not None:
+                    IO._write_npy_entry(archive, "rownames", None, 0, array=np.array([str(n) for n in rownames]))
+                if colnames is not None:
+                    IO._write_npy_entry(archive, "colnames", None, 0, array=np.array([str(n) for n in colnames]))
+        finally:
+            shutil.rmtree(tmpdir, ignore_errors=True)
+
+
+    def save_to_mtx(
+        data       :Union[np.ndarray, sp.spmatrix, Iterable[sp.spmatrix]],
+        filepath   :str,
+        chunk_size :int=10000,
+        precision  :int=9):
+
+        """
+        Description: Saves the rows of the data in chunks to a MatrixMarket coordinate '.mtx' file.
+                     The size line is reserved at the beginning and filled in once the number of
+                     rows and entries is known, so that at most one chunk is in memory.
+
+        Inputs:
+            data (Union[np.ndarray, sp.spmatrix, Iterable[sp.spmatrix]]) : matrix or row chunks to save
+            filepath (str)      : file path to save the data
+            chunk_size (int)    : number of rows to convert at once for the matrix data
+            precision (int)     : number of significant digits of the written weights
+        """
+        assert filepath.endswith(".mtx"), "Filepath should have '.mtx' extension !"
+
+        n_rows, n_cols, nnz = 0, None, 0
+        with open(filepath, "w") as f:
+            f.write("%%MatrixMarket matrix coordinate real general\n")
+            size_offset = f.tell()
+            f.write(" " * 64 + "\n")
+            for chunk in IO._iter_row_chunks(data, chunk_size):
+                assert n_cols is None or chunk.shape[1] == n_cols, "Chunks should have the same number of columns !"
+                n_cols = chunk.shape[1]
+                rows = np.repeat(np.arange(chunk.shape[0]), np.diff(chunk.indptr)) + n_rows + 1
+                f.write("".join("%d %d %.*g\n" % (r, c, precision, w)
+                                for r, c, w in zip(rows.tolist(), (chunk.indices + 1).tolist(), chunk.data.tolist())))
+                n_rows, nnz = n_rows + chunk.shape[0], nnz + chunk.nnz
+            assert n_cols is not None, "Data should have at least one row !"
+            f.seek(size_offset)
+            f.write("%d %d %d" % (n_rows, n_cols, nnz))
+
+
+    def save_to_tsv(
+        data       :Union[np.ndarray, sp.spmatrix, Iterable[sp.spmatrix]],
+        filepath   :str,
+        rownames   :List[Union[str, int, float]]=None,
+        colnames   :List[Union[str, int, float]]=None,
+        chunk_size :int=10000,
+        precision  :int=9):
+
+        """
+        Description: Saves the non-zero entries of the data in chunks of rows to a '.tsv' file with
+                     a "doc_id term weight" line per entry. Documents are named by 'rownames' (or
+                     their row index) and terms by 'colnames' (or their column index). Documents
+                     without any non-zero entry do not appear in the file.
+
+        Inputs:
+            data (Union[np.ndarray, sp.spmatrix, Iterable[sp.spmatrix]]) : matrix or row chunks to save
+            filepath (str)      : file path to save the data
+            rownames (List[Union[str, int, float]]) : name of the rows
+            colnames (List[Union[str, int, float]]) : name of the cols, e.g. the feature words
+            chunk_size (int)    : number of rows to convert at once for the matrix data
+            precision (int)     : number of significant digits of the written weights
+        """
+        assert filepath.endswith(".tsv"), "Filepath should have '.tsv' extension !"
+
+        n_rows = 0
+        with open(filepath, "w") as f:
+            f.write("doc_id\tterm\tweight\n")
+            for chunk in IO._iter_row_chunks(data, chunk_size):
+                assert colnames is None or chunk.shape[1] == len(colnames)
+                rows = np.repeat(np.arange(chunk.shape[0]), np.diff(chunk.indptr)) + n_rows
+                docs = rows.tolist() if rownames is None else [rownames[r] for r in rows.tolist()]
+                terms = chunk.indices.tolist() if colnames is None else [colnames[c] for c in chunk.indices.tolist()]
+                f.write("".join("%s\t%s\t%.*g\n" % (d, t, precision, w) for d, t, w in zip(docs, terms, chunk.data.tolist())))
+                n_rows += chunk.shape[0]
+        assert rownames is None or len(rownames) == n_rows
+
+
+    def save_matrix(
+        data       :Union[np.ndarray, sp.spmatrix, Iterable[sp.spmatrix]],
+        filepath   :str,
+        rownames   :List[Union[str, int, float]]=None,
+        colnames   :List[Union[str, int, float]]=None,
+        chunk_size :int=10000):
+
+        """
+        Description: Saves the data with the writer of the file extension: '.csv', '.npz', '.mtx'
+                     or '.tsv'. MatrixMarket files do not keep the row and column names.
+        """
+        if filepath.endswith(".csv"):
+            IO.save_to_csv(data, filepath, rownames, colnames, chunk_size)
+        elif filepath.endswith(".npz"):
+            IO.save_to_npz(data, filepath, rownames, colnames, chunk_size)
+        elif filepath.endswith(".mtx"):
+            IO.save_to_mtx(data, filepath, chunk_size)
+        elif filepath.endswith(".tsv"):
+            IO.save_to_tsv(data, filepath, rownames, colnames, chunk_size)
+        else:
+            raise ValueError("Unsupported output format of '%s', use .csv, .npz, .mtx or .tsv !" % filepath)
+
+
+    def read_npz(filepath :str):
+        """
+        Description: Reads a '.npz' file written by 'save_to_npz' or 'scipy.sparse.save_npz'.
+
+        Outputs:
+            X (sp.csr_matrix) : the saved matrix.
+            rownames (list)   : name of the rows, None if not saved.
+            colnames (list)   : name of the cols, None if not saved.
+        """
+        assert filepath.endswith(".npz"), "Filepath should have '.npz' extension !"
+        with np.load(filepath) as archive:
+            rownames = archive["rownames"].tolist() if "rownames" in archive else None
+            colnames = archive["colnames"].tolist() if "colnames" in archive else None
+        return sp.csr_matrix(sp.load_npz(filepath)), rownames, colnames
+
+
+    def read_mtx(filepath :str):
+        """
+        Description: Reads a MatrixMarket '.mtx' file as a CSR matrix.
+        """
+        assert filepath.endswith(".mtx"), "Filepath should have '.mtx' extension !"
+        from scipy.io import mmread
+        return sp.csr_matrix(mmread(filepath))
+
+
+    def read_tsv(filepath :str, colnames :List[Union[str, int, float]]=None, chunk_size :int=1000000):
+        """
+        Description: Reads a "doc_id term weight" '.tsv' file in chunks of lines.
+
+        Inputs:
+            filepath (str)  : path of the '.tsv' file
+            colnames (List[Union[str, int, float]]) : terms of the columns. If None, the columns are
+                              the terms in the order they first appear in the file.
+            chunk_size (int): number of lines to parse at once
+
+        Outputs:
+            X (sp.csr_matrix) : document-term matrix, a row per document in the order they first appear.
+            rownames (list)   : doc id of each row.
+            colnames (list)   : term of each column.
+        """
+        assert filepath.endswith(".tsv"), "Filepath should have '.tsv' extension !"
+        import pandas as pd
+
+        doc_index, term_index = {}, {} if colnames is None else {str(t): i for i, t in enumerate(colnames)}
+        rows, cols, weights = [], [], []
+        for df in pd.read_csv(filepath, sep="\t", dtype={"doc_id": str, "term": str}, keep_default_na=False,
+                              quoting=3, chunksize=chunk_size):
+            for doc in df["doc_id"].tolist():
+                rows.append(doc_index.setdefault(doc, len(doc_index)))
+            for term in df["term"].tolist():
+                if colnames is None:
+                    cols.append(term_index.setdefault(term, len(term_index)))
+                else:
+                    cols.append(term_index[term])
+            weights.append(df["weight"].to_numpy(dtype=np.float64))
+
+        weights = np.concatenate(weights) if len(weights) > 0 else np.zeros(0)
+        shape = (len(doc_index), len(term_index))
+        X = sp.csr_matrix((weights, (np.array(rows, dtype=np.int64), np.array(cols, dtype=np.int64))), shape=shape)
+        return X, list(doc_index), list(term_index) if colnames is None else list(colnames)
@@ -0,0 +1,156 @@
+import json
+import multiprocessing as mp
+import re
+import time
+from typing import Any, Iterator, List, Tuple
+
+_DECODER = json.JSONDecoder()
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_NUMBER_START = set("-0123456789")
+_NUMBER_CHARS = set("0123456789.eE+-")
+
+
+class JsonStreamReader:
+    """
+    Description: Incremental reader of a JSON file whose top-level object maps keys to containers,
+                 e.g. {"episode-1": [{"utterance": ...}, ...], ...}. The file is read in chunks and
+                 the two outer levels are scanned event by event; each second-level element is
+                 decoded on its own and yielded as soon as it is complete. Memory is bounded by the
+                 chunk size and the largest element, not by the file size.
+
+    Attributes:
+        filepath (string) : Path of the .json file.
+        chunk_size (int)  : Number of characters read at once.
+    """
+
+    def __init__(self, filepath :str, chunk_size :int=1 << 16):
+        assert chunk_size > 0, "Chunk size should be a positive integer !"
+        self.filepath = filepath
+        self.chunk_size = chunk_size
+
+    def _fill(self, size :int=0):
+        # Appends at least the next chunk to the buffer, returns False at the end of the file
+        chunk = self.f.read(max(size, self.chunk_size))
+        if len(chunk) == 0:
+            self.eof = True
+            return False
+        if self.pos > len(self.buf) // 2:
+            self.buf, self.pos = self.buf[self.pos:], 0
+        self.buf += chunk
+        return True
+
+    def _peek(self):
+        # Skips the whitespace and returns the next character, None at the end of the file
+        while True:
+            self.pos = _WHITESPACE.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._fill():
+                return None
+
+    def _expect(self, chars :str):
+        char = self._peek()
+        if char is None or char not in chars:
+            raise ValueError("Expected one of '%s' at character %d of '%s', found %r !" % (
+                chars, self.pos, self.filepath, char))
+        self.pos += 1
+        return char
+
+    def _value(self):
+        # Decodes the next complete JSON value, reading more of the file until it is complete
+        self._peek()
+        while True:
+            try:
+                value, end = _DECODER.raw_decode(self.buf, self.pos)
+                # A number is only complete once a character that cannot continue it is read,
+                # e.g. "1." at the end of the buffer is decoded as 1 but may continue as 1.5
+                if self.eof or (end < len(self.buf) and (self.buf[self.pos] not in _NUMBER_START
+                                                         or self.buf[end] not in _NUMBER_CHARS)):
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            # Doubles the pending characters, so that a large element is decoded a few times only
+            self._fill(len(self.buf) - self.pos)
+
+    def __iter__(self) -> Iterator[Tuple[str, Any]]:
+        """
+        Description: Yields (top-level key, element) pairs in the order of the file. The elements of
+                     a list are yielded one by one, the members of an object as their values, and a
+                     scalar as itself.
+        """
+        self.buf, self.pos, self.eof = "", 0, False
+        with open(self.filepath, "r", encoding="utf-8") as f:
+            self.f = f
+            self._expect("{")
+            if self._peek() == "}":
+                return
+            while True:
+                key = self._value()
+                self._expect(":")
+                container = self._peek()
+                if container in ["[", "{"]:
+                    self.pos += 1
+                    end = "]" if container == "[" else "}"
+                    if self._peek() == end:
+                        self.pos += 1
+                    else:
+                        while True:
+                            if container == "{":
+                                self._value()
+                                self._expect(":")
+                            yield key, self._value()
+                            if self._expect("," + end) == end:
+                                break
+                else:
+                    yield key, self._value()
+                if self._expect(",}") == "}":
+                    return
+
+
+def extract_json_file(inp_path :str, out_path :str, field :str, chunk_size :int=1 << 16):
+    """
+    Description: Writes the 'field' of every second-level element of the JSON file as a line of the
+                 corpus .txt file, with the new lines removed. Elements without a string 'field'
+                 are skipped and counted.
+
+    Outputs:
+        stats (dict) : Path and numbers of elements, written documents and skipped elements, and seconds.
+    """
+    start = time.perf_counter()
+    stats = {"path": inp_path, "elements": 0, "documents": 0, "skipped": 0}
+    with open(out_path, "w", encoding="utf-8") as f_out:
+        for _, element in JsonStreamReader(inp_path, chunk_size):
+            stats["elements"] += 1
+            value = element.get(field) if isinstance(element, dict) else None
+            if type(value) != str:
+                stats["skipped"] += 1
+                continue
+            f_out.write(value.replace("\n", "").strip() + "\n")
+            stats["documents"] += 1
+    stats["seconds"] = time.perf_counter() - start
+    return stats
+
+
+def _extract_json_file(args :tuple):
+    return extract_json_file(*args)
+
+
+def extract_json_files(inp_paths :List[str], out_paths :List[str], field :str, n_jobs :int=1,
+                       chunk_size :int=1 << 16):
+    """
+    Description: Runs 'extract_json_file' on each input / output pair, 'n_jobs' files at a time.
+
+    Outputs:
+        stats (List[dict]) : Stats of each file, in the order of the inputs.
+    """
+    assert len(inp_paths) == len(out_paths), "Each input file should have an output file !"
+    assert n_jobs == -1 or n_jobs > 0, "n_jobs should be a positive integer or -1 !"
+
+    tasks = [(inp, out, field, chunk_size) for inp, out in zip(inp_paths, out_paths)]
+    n_jobs = min(mp.cpu_count() if n_jobs == -1 else n_jobs, max(len(tasks), 1))
+    if n_jobs == 1:
+        return [_extract_json_file(task) for task in tasks]
+    with mp.Pool(n_jobs) as pool:
+        return pool.map(_extract_json_file, tasks, chunksize=1)
@@ -0,0 +1,167 @@
+import bz2
+import gzip
+import json
+import lzma
+import multiprocessing as mp
+import os
+import time
+from collections import deque
+from typing import Any, Iterator, List, Tuple
+
+# Openers of the compressed inputs, by extension
+COMPRESSED_OPENERS = {".gz": gzip.open, ".bz2": bz2.open, ".xz": lzma.open}
+
+_DECODER = json.JSONDecoder()
+
+# Errors of a record that cannot be parsed or does not have a string value for the key
+RECORD_ERRORS = (ValueError, KeyError, IndexError, TypeError, AttributeError)
+
+
+def open_binary(filepath :str):
+    """
+    Description: Opens the file for binary reading, decompressing '.gz', '.bz2' and '.xz' files.
+    """
+    opener = COMPRESSED_OPENERS.get(os.path.splitext(filepath)[1], open)
+    return opener(filepath, "rb")
+
+
+def extract_lines(lines :List[bytes], key :Any, max_reported :int=10):
+    """
+    Description: Parses the JSON records of the lines and selects their 'key' values, with the new
+                 lines removed, as lines of the corpus. Blank lines are ignored.
+
+    Outputs:
+        text (string)          : Extracted corpus lines.
+        n_records (int)        : Number of extracted records.
+        skipped (List[int])    : Offsets of the malformed records in 'lines', at most 'max_reported'.
+        n_skipped (int)        : Number of malformed records.
+    """
+    out, skipped, n_skipped = [], [], 0
+    decode = _DECODER.decode
+    for i, line in enumerate(lines):
+        if len(line.strip()) == 0:
+            continue
+        try:
+            out.append(decode(line.decode("utf-8"))[key].replace("\n", "").strip())
+        except RECORD_ERRORS:
+            n_skipped += 1
+            if len(skipped) < max_reported:
+                skipped.append(i)
+    text = "\n".join(out) + "\n" if len(out) > 0 else ""
+    return text, len(out), skipped, n_skipped
+
+
+def read_byte_range(filepath :str, start :int, end :int):
+    """
+    Description: Reads the lines that start in the [start, end) byte range of an uncompressed file
+                 as a single block. A line crossing 'start' belongs to the previous range.
+    """
+    with open(filepath, "rb") as f:
+        if start > 0:
+            f.seek(start - 1)
+            f.readline()
+        begin = f.tell()
+        if begin >= end:
+            return b""
+        data = f.read(end - begin)
+        if not data.endswith(b"\n"):
+            data += f.readline()
+    return data
+
+
+def iter_byte_ranges(filepath :str, chunk_bytes :int) -> Iterator[Tuple[str, int, int]]:
+    size = os.path.getsize(filepath)
+    for start in range(0, size, chunk_bytes):
+        yield ("range", filepath, start, min(start + chunk_bytes, size))
+
+
+def iter_line_batches(filepath :str, chunk_bytes :int) -> Iterator[Tuple[str, bytes]]:
+    """
+    Description: Reads a (compressed) file sequentially and yields blocks of whole lines of about
+                 'chunk_bytes' bytes.
+    """
+    with open_binary(filepath) as f:
+        while True:
+            data = f.read(chunk_bytes)
+            if len(data) == 0:
+                break
+            if not data.endswith(b"\n"):
+                data += f.readline()
+            yield ("lines", data)
+
+
+def extract_task(task :tuple, key :Any, max_reported :int):
+    """
+    Description: Extracts the corpus lines of a byte range or of a block of lines.
+
+    Outputs:
+        result (tuple) : text, number of lines, number of bytes, number of records, offsets of the
+                         reported malformed records and number of malformed records.
+    """
+    data = read_byte_range(*task[1:]) if task[0] == "range" else task[1]
+    lines = data.split(b"\n")
+    if lines[-1] == b"":
+        lines.pop()
+    text, n_records, skipped, n_skipped = extract_lines(lines, key, max_reported)
+    return text, len(lines), len(data), n_records, skipped, n_skipped
+
+
+def extract_jsonl_corpus(inp_path :str, out_path :str, key :Any, n_jobs :int=1,
+                         chunk_bytes :int=1 << 24, max_reported :int=10):
+    """
+    Description: Extracts the 'key' values of the records of a JSON lines file as a corpus '.txt'
+                 file with a document at each line, in the order of the records. Uncompressed
+                 files are split into byte ranges that the workers read themselves; '.gz', '.bz2'
+                 and '.xz' files are decompressed sequentially and blocks of their lines are sent
+                 to the workers. At most 2 * n_jobs chunks are in flight, so memory does not
+                 grow with the file. Malformed records are skipped and reported.
+
+    Inputs:
+        inp_path (string)  : Path of the .jsonl file, optionally compressed.
+        out_path (string)  : Path to write the extracted corpus .txt
+        key (Any)          : Key to select from each JSON record.
+        n_jobs (int)       : Number of worker processes, -1 to use all the cores.
+        chunk_bytes (int)  : Approximate number of bytes of each chunk.
+        max_reported (int) : Maximum number of malformed line numbers to report.
+
+    Outputs:
+        stats (dict)       : Numbers of lines, records and malformed records, line numbers of the
+                             first malformed records, bytes read, seconds and throughputs.
+    """
+    assert n_jobs == -1 or n_jobs > 0, "n_jobs should be a positive integer or -1 !"
+    assert chunk_bytes > 0, "Chunk size should be a positive integer !"
+
+    n_jobs = mp.cpu_count() if n_jobs == -1 else n_jobs
+    compressed = os.path.splitext(inp_path)[1] in COMPRESSED_OPENERS
+    tasks = iter_line_batches(inp_path, chunk_bytes) if compressed else iter_byte_ranges(inp_path, chunk_bytes)
+    stats = {"lines": 0, "records": 0, "skipped": 0, "skipped_lines": [], "bytes": 0}
+    start = time.perf_counter()
+
+    with open(out_path, "w", encoding="utf-8") as f_out:
+        def write(result):
+            text, n_lines, n_bytes, n_records, skipped, n_skipped = result
+            f_out.write(text)
+            room = max_reported - len(stats["skipped_lines"])
+            stats["skipped_lines"].extend(stats["lines"] + i + 1 for i in skipped[:room])
+            stats["lines"] += n_lines
+            stats["bytes"] += n_bytes
+            stats["records"] += n_records
+            stats["skipped"] += n_skipped
+
+        if n_jobs == 1:
+            for task in tasks:
+                write(extract_task(task, key, max_reported))
+        else:
+            with mp.Pool(n_jobs) as pool:
+                pending = deque()
+                for task in tasks:
+                    pending.append(pool.apply_async(extract_task, (task, key, max_reported)))
+                    if len(pending) >= 2 * n_jobs:
+                        write(pending.popleft().get())
+                while len(pending) > 0:
+                    write(pending.popleft().get())
+
+    stats["seconds"] = time.perf_counter() - start
+    stats["mb_per_sec"] = stats["bytes"] / 1024 ** 2 / max(stats["seconds"], 1e-9)
+    stats["records_per_sec"] = stats["records"] / max(stats["seconds"], 1e-9)
+    return stats
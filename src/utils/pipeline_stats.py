@@ -0,0 +1,183 @@
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Callable
+
+
+class StageStats:
+    """
+    Description: Counters of a single pipeline stage.
+
+    Attributes:
+        calls (int)          : Number of calls of the stage.
+        seconds (float)      : Cumulative wall-clock time, including the nested stages.
+        self_seconds (float) : Cumulative time spent in the stage itself, excluding the nested stages.
+        chars (int)          : Number of input characters processed.
+        tokens (int)         : Number of tokens produced.
+        peak_bytes (int)     : Largest allocation peak of a call above the memory at its start.
+                               Only tracked if the stats are created with 'track_memory'.
+    """
+
+    __slots__ = ["calls", "seconds", "self_seconds", "chars", "tokens", "peak_bytes"]
+
+    def __init__(self):
+        self.calls = 0
+        self.seconds = 0.0
+        self.self_seconds = 0.0
+        self.chars = 0
+        self.tokens = 0
+        self.peak_bytes = 0
+
+    def info(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class PipelineStats:
+    """
+    Description: Per-stage call counts, timings, processed characters / tokens and allocation peaks
+                 of the analysis pipeline. Instrumented objects (preprocessors, tokenizers, models)
+                 only record into the stats while they are attached to them; detached objects only
+                 pay for a single 'is None' check per call.
+
+                 Stages can be nested, e.g. 'analyze' calls the preprocessor and the tokenizer: the
+                 'seconds' of a stage include its nested stages, 'self_seconds' do not.
+
+    Usage:
+        stats = tf_idf.enable_stats()
+        tf_idf.train(corpus)
+        print(stats.report())
+
+    Attributes:
+        stages (Dict[str, StageStats]) : Counters of each stage, by name.
+        track_memory (bool)            : Whether allocation peaks are tracked with tracemalloc. It
+                                         slows down every allocation, so it is off by default.
+    """
+
+    def __init__(self, track_memory :bool=False):
+        self.track_memory = track_memory
+        self._started_tracing = False
+        if track_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        self.clear()
+
+    def __getstate__(self):
+        # Copies in worker processes start empty and do not trace the memory
+        return {"track_memory": False}
+
+    def __setstate__(self, state :dict):
+        self.__init__(**state)
+
+    def clear(self):
+        """
+        Description: Resets the counters of all the stages.
+        """
+        self.stages = {}
+        self._frames = []
+
+    def close(self):
+        """
+        Description: Stops tracing the memory, if it was started by these stats.
+        """
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+        self.track_memory = False
+
+    def enter(self):
+        """
+        Description: Marks the start of a stage call and returns its frame, to be passed to 'exit'.
+        """
+        frame = [time.perf_counter(), 0.0, 0, 0]
+        if self.track_memory:
+            current, peak = tracemalloc.get_traced_memory()
+            if len(self._frames) > 0:
+                # The peak is reset below, keep the peak reached so far by the enclosing stage
+                self._frames[-1][3] = max(self._frames[-1][3], peak)
+            tracemalloc.reset_peak()
+            frame[2] = frame[3] = current
+        self._frames.append(frame)
+        return frame
+
+    def exit(self, name :str, frame :list, chars :int=0, tokens :int=0):
+        """
+        Description: Records a stage call that started with the given frame.
+
+        Inputs:
+            name (string) : Name of the stage.
+            frame (list)  : Frame returned by 'enter'.
+            chars (int)   : Number of input characters processed by the call.
+            tokens (int)  : Number of tokens produced by the call.
+        """
+        elapsed = time.perf_counter() - frame[0]
+        while len(self._frames) > 0 and self._frames.pop() is not frame:
+            continue
+
+        stage = self.stages.get(name)
+        if stage is None:
+            stage = self.stages[name] = StageStats()
+        stage.calls += 1
+        stage.seconds += elapsed
+        stage.self_seconds += elapsed - frame[1]
+        stage.chars += chars
+        stage.tokens += tokens
+
+        if len(self._frames) > 0:
+            self._frames[-1][1] += elapsed
+        if self.track_memory:
+            peak = max(frame[3], tracemalloc.get_traced_memory()[1])
+            stage.peak_bytes = max(stage.peak_bytes, peak - frame[2])
+            if len(self._frames) > 0:
+                self._frames[-1][3] = max(self._frames[-1][3], peak)
+
+    @contextmanager
+    def stage(self, name :str, chars :int=0):
+        """
+        Description: Records the enclosed block as a call of the stage.
+        """
+        frame = self.enter()
+        try:
+            yield
+        finally:
+            self.exit(name, frame, chars=chars)
+
+    def wrap(self, name :str, fn :Callable[[str], object], count_tokens :bool=False):
+        """
+        Description: Returns a callable that records each call of 'fn' on a text as a call of the
+                     stage, counting the characters of the text and, if 'count_tokens' is set, the
+                     length of the output.
+        """
+        def instrumented(text):
+            frame = self.enter()
+            out = None
+            try:
+                out = fn(text)
+                return out
+            finally:
+                self.exit(name, frame, chars=len(text) if type(text) == str else 0,
+                          tokens=len(out) if count_tokens and out is not None else 0)
+        return instrumented
+
+    def info(self):
+        """
+        Description: Returns the counters of every stage as a dictionary.
+
+        Outputs:
+            info (Dict[str, dict]) : Stage name to its counters.
+        """
+        return {name: stage.info() for name, stage in self.stages.items()}
+
+    def report(self):
+        """
+        Description: Formats the counters as a table, sorted by the time spent in each stage itself.
+
+        Outputs:
+            report (string) : One line per stage.
+        """
+        lines = ["%-22s %10s %10s %10s %12s %12s %12s" % (
+            "stage", "calls", "seconds", "self", "chars", "tokens", "peak (MB)")]
+        for name, stage in sorted(self.stages.items(), key=lambda item: -item[1].self_seconds):
+            lines.append("%-22s %10d %10.4f %10.4f %12d %12d %12s" % (
+                name, stage.calls, stage.seconds, stage.self_seconds, stage.chars, stage.tokens,
+                "%.2f" % (stage.peak_bytes / 1024 ** 2) if self.track_memory else "-"))
+        return "\n".join(lines)
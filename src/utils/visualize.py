@@ -1,54 +1,139 @@
-import numpy as np
-import pandas as pd
-from sklearn.metrics.pairwise import cosine_similarity
+from typing import Union
 
-import matplotlib.pyplot as plt
-import seaborn as sns
+import numpy as np
+import scipy.sparse as sp
 
 class Visualizer:
     """
-    Description: Collection of basic visualization operations.
+    Description: Collection of basic visualization operations. Plotting libraries are imported 
+                 when a figure is drawn, so that importing the package stays fast.
     """
-    def vis_heatmap(data :np.ndarray, filepath :str, color :str="coolwarm"):
+    def vis_heatmap(data :Union[np.ndarray, sp.spmatrix], filepath :str, color :str="coolwarm", max_items :int=None):
         """
-        Description: Visualizes a heatmap from the given data.
+        Description: Visualizes a heatmap from the given data. Only the 'max_items' rows and columns
+                     with the largest L2 norms are plotted, in their original order, and only that
+                     slice of sparse data is densified, since every cell of the heatmap is rendered.
 
         Inputs:
-            data (np.ndarray) : 2D numpy array to visualize.
+            data (Union[np.ndarray, sp.spmatrix]) : 2D numpy array or sparse matrix to visualize.
             filepath (string) : Path to save the figure.
             color (string)    : Color class of heatmap.
+            max_items (int)   : Maximum number of rows and of columns to plot. If None, all of them are plotted.
+
+        Outputs:
+            rows (np.ndarray) : Indices of the plotted rows.
+            cols (np.ndarray) : Indices of the plotted columns.
         """
         assert ".png" in filepath or ".jpg" in filepath, \
             "File path to visualize should be an image file !"
         assert len(data.shape) == 2, \
             "Given data should be a 2D numpy array"
+        assert max_items is None or max_items > 0, "Maximum number of items should be a positive integer !"
+
+        import matplotlib.pyplot as plt
+
+        squares = data.multiply(data) if sp.issparse(data) else np.square(data)
+        selected = []
+        for axis in [1, 0]:
+            indices = np.arange(data.shape[1 - axis])
+            if max_items is not None and len(indices) > max_items:
+                norms = np.asarray(squares.sum(axis=axis)).ravel()
+                indices = np.sort(np.argsort(-norms, kind="stable")[:max_items])
+            selected.append(indices)
+        rows, cols = selected
+
+        if sp.issparse(data):
+            data = sp.csr_matrix(data)[rows][:, cols].toarray()
+        else:
+            data = data[np.ix_(rows, cols)]
 
         plt.imshow(data, cmap=color, aspect='auto')
         plt.savefig(filepath)
+        return rows, cols
     
-    def vis_closeness(data :np.ndarray, filepath :str, labels:list=None, axis :int=1, color :str="coolwarm"):
+    def closeness_blocks(vecs :Union[np.ndarray, sp.spmatrix], block_size :int=1024):
         """
-        Description: Visualizes the similarities of feature words given the data.
+        Description: Computes the cosine similarities of the rows of 'vecs' in blocks of rows, so that
+                     only a 'block_size' x n slice of the n x n similarity matrix is in memory at once.
 
         Inputs:
-            data (np.ndarray) : 2D numpy array to visualize.
+            vecs (Union[np.ndarray, sp.spmatrix]) : 2D numpy array or sparse matrix, one vector per row.
+            block_size (int) : Number of rows of each block.
+
+        Outputs:
+            blocks (Iterator[Tuple[int, np.ndarray]]) : Start row of each block and its dense similarities.
+        """
+        assert block_size > 0, "Block size should be a positive integer !"
+        vecs = sp.csr_matrix(vecs, dtype=np.float64)
+        norms = np.sqrt(np.asarray(vecs.multiply(vecs).sum(axis=1)).ravel())
+        norms[norms == 0] = 1.0
+        vecs = sp.csr_matrix(sp.diags(1.0 / norms) @ vecs)
+        vecs_t = vecs.T.tocsc()
+        for start in range(0, vecs.shape[0], block_size):
+            yield start, (vecs[start:start + block_size] @ vecs_t).toarray()
+
+    def vis_closeness(data :Union[np.ndarray, sp.spmatrix], filepath :str, labels:list=None, axis :int=1, color :str="coolwarm",
+                      max_items :int=50, reorder :bool=True, block_size :int=1024):
+        """
+        Description: Visualizes the similarities of feature words given the data. Only the 'max_items'
+                     vectors with the largest L2 norms, the most weighted features or documents, are
+                     plotted, so the memory and time do not grow quadratically with the vocabulary or
+                     the corpus. Their similarities are computed in blocks from the sparse data and
+                     reordered by hierarchical clustering, so that the similar vectors are adjacent.
+
+        Inputs:
+            data (Union[np.ndarray, sp.spmatrix]) : 2D numpy array or sparse matrix to visualize.
             filepath (string) : Path to save the figure.
+            labels (list)     : Labels of the vectors, feature words or document names.
             axis (int)        : Visualize either by the axis 0 or 1.
             color (string)    : Color class of heatmap.
+            max_items (int)   : Maximum number of vectors to plot. If None, all of them are plotted.
+            reorder (bool)    : Whether to reorder the vectors by hierarchical clustering.
+            block_size (int)  : Number of rows of each similarity block.
+
+        Outputs:
+            selected (np.ndarray) : Indices of the plotted vectors, in their plotted order.
         """
         assert axis in [0, 1], "Axis should be either 0 or 1 for 2D array !"
         assert ".png" in filepath or ".jpg" in filepath, \
             "File path to visualize should be an image file !"
         assert len(data.shape) == 2, \
             "Given data should be a 2D numpy array"
+        assert max_items is None or max_items > 0, "Maximum number of items should be a positive integer !"
+
+        import matplotlib.pyplot as plt
+        import seaborn as sns
+        from scipy.cluster.hierarchy import leaves_list, linkage
+        from scipy.spatial.distance import squareform
 
         if axis == 0:
-            vecs = data
+            vecs = sp.csr_matrix(data)
         else:
-            vecs = data.T
+            vecs = sp.csr_matrix(data.T)
+        assert labels is None or len(labels) == vecs.shape[0], \
+            "Each vector should have a label !"
 
-        result = cosine_similarity(vecs, vecs)
-        if labels is not None:
-            result = pd.DataFrame(data=result, index=labels, columns=labels)
-        sns.heatmap(result)
-        plt.savefig(filepath)
\ No newline at end of file
+        selected = np.arange(vecs.shape[0])
+        if max_items is not None and vecs.shape[0] > max_items:
+            norms = np.asarray(vecs.multiply(vecs).sum(axis=1)).ravel()
+            selected = np.sort(np.argsort(-norms, kind="stable")[:max_items])
+        vecs = vecs[selected]
+
+        result = np.empty((len(selected), len(selected)))
+        for start, block in Visualizer.closeness_blocks(vecs, block_size):
+            result[start:start + len(block)] = block
+
+        if reorder and len(selected) > 2:
+            distances = np.clip(1.0 - result, 0.0, None)
+            np.fill_diagonal(distances, 0.0)
+            order = leaves_list(linkage(squareform((distances + distances.T) / 2, checks=False), method="average"))
+            selected, result = selected[order], result[np.ix_(order, order)]
+
+        ticks = [labels[i] for i in selected] if labels is not None else "auto"
+        size = max(6.4, 0.2 * len(selected))
+        fig = plt.figure(figsize=(size, size * 0.8))
+        sns.heatmap(result, xticklabels=ticks, yticklabels=ticks, cmap=color)
+        plt.tight_layout()
+        plt.savefig(filepath)
+        plt.close(fig)
+        return selected
@@ -1,4 +1,6 @@
 from test_src.utils import *
 from test_src.models import *
 from test_src.tokenizers import *
-from test_src.preprocessors import *
\ No newline at end of file
+from test_src.preprocessors import *
+from test_src.serving import *
+from test_src.search import *
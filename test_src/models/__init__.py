@@ -1 +1,6 @@
-from .tf_idf import *
\ No newline at end of file
+from .tf_idf import *
+from .hashing_tf_idf import *
+from .term_stats import *
+from .sorted_vocabulary import *
+from .space_saving import *
+from .output_plan import *
\ No newline at end of file
@@ -0,0 +1,71 @@
+import pytest
+import numpy as np
+import scipy.sparse as sp
+
+from src.models import TfIdfModel, HashingTfIdfModel
+from src.types import TextOps
+
+DOCS = [
+    "We're trying to manipulate the Radio Playhouse listeners, are we?",
+    "I guess \"manipulate\" has the tune of a negative connotation.",
+    "Keep going, baby. You're on a roll. You're on such a roll here. Sure.",
+    "Well, let's seduce them with this phone number.",
+    "What is the phone number?"]
+
+
+def test_train_and_infer_hashing():
+    tf_idf = HashingTfIdfModel({TextOps.LOWER, TextOps.DIGITS, TextOps.PUNCTUATIONS}, n_features=64)
+    out = tf_idf.train(DOCS)
+    assert out.shape == (len(DOCS), 64)
+    assert np.allclose(tf_idf.infer(DOCS), out)
+    assert tf_idf.n_docs_ == len(DOCS) and tf_idf.idf_.shape == (64,)
+
+
+def test_signed_hashing_has_negative_values_hashing():
+    tf_idf = HashingTfIdfModel({TextOps.LOWER}, n_features=64, sparse_output=True)
+    out = tf_idf.train(DOCS)
+    assert sp.isspmatrix_csr(out)
+    assert out.data.min() < 0 < out.data.max()
+
+
+@pytest.mark.parametrize("params", [dict(), dict(sublinear_tf=True), dict(binary=True, norm="l1")])
+def test_no_collision_matches_vocabulary_model_hashing(params):
+    op_set = {TextOps.LOWER, TextOps.PUNCTUATIONS}
+    tf_idf = TfIdfModel(op_set, sparse_output=True, **params)
+    hashing = HashingTfIdfModel(
+        op_set, n_features=2 ** 24, alternate_sign=False, sparse_output=True, max_reverse_terms=1000, **params)
+    out, hashed_out = tf_idf.train(DOCS), hashing.train(DOCS)
+
+    assert hashing.collision_report()["observed_collision_rate"] == 0.0
+    for term, index in tf_idf.vocabulary_.items():
+        bucket = hashing.get_bucket(term)
+        assert hashing.reverse_map_[bucket] == [term]
+        assert np.allclose(hashed_out[:, bucket].toarray(), out[:, index].toarray())
+
+
+def test_reverse_map_bounded_hashing():
+    tf_idf = HashingTfIdfModel({TextOps.LOWER}, n_features=32, max_reverse_terms=5)
+    tf_idf.train(DOCS)
+    assert sum(len(terms) for terms in tf_idf.reverse_map_.values()) == 5
+    assert not tf_idf.reverse_map_complete_
+    assert "observed_collision_rate" not in tf_idf.collision_report()
+    assert len(tf_idf.get_feature_names()) == 32
+
+
+def test_collision_report_single_bucket_hashing():
+    tf_idf = HashingTfIdfModel({TextOps.LOWER}, n_features=1, max_reverse_terms=1000)
+    tf_idf.train(DOCS)
+    report = tf_idf.collision_report()
+    assert report["occupied_buckets"] == 1 and report["estimated_collision_rate"] == 1.0
+    assert report["observed_collision_rate"] == 1.0
+
+
+def test_infer_before_train_hashing():
+    tf_idf = HashingTfIdfModel({TextOps.LOWER}, n_features=32)
+    with pytest.raises(AssertionError, match="Model has to be fitted before inference !"):
+        tf_idf.infer(DOCS)
+
+
+def test_invalid_n_features_hashing():
+    with pytest.raises(AssertionError, match="'n_features' should be a positive integer !"):
+        HashingTfIdfModel({TextOps.LOWER}, n_features=0)
@@ -0,0 +1,33 @@
+import pytest
+import numpy as np
+
+from src.models import OutputPlan
+
+
+def test_plan_prefers_dense_float64_output_plan():
+    plan = OutputPlan.create(100, 50, 500, 10 ** 6, False, np.float64)
+    assert not plan.sparse and plan.dtype == np.float64 and not plan.to_disk
+    assert plan.nbytes == OutputPlan.peak_nbytes(100, 50, 500, False, np.float64, np.float64)
+
+
+def test_plan_lowers_storage_to_fit_output_plan():
+    dense64 = OutputPlan.peak_nbytes(1000, 1000, 5000, False, np.float64, np.float64)
+    dense32 = OutputPlan.peak_nbytes(1000, 1000, 5000, False, np.float32, np.float64)
+    sparse64 = OutputPlan.peak_nbytes(1000, 1000, 5000, True, np.float64, np.float64)
+    assert sparse64 < dense32 < dense64
+
+    plan = OutputPlan.create(1000, 1000, 5000, dense32, False, np.float64)
+    assert not plan.sparse and plan.dtype == np.float32
+    plan = OutputPlan.create(1000, 1000, 5000, dense32 - 1, False, np.float64)
+    assert plan.sparse and plan.dtype == np.float64
+    # Configured sparse float32 output is never made dense or float64
+    plan = OutputPlan.create(1000, 1000, 5000, dense64, True, np.float32)
+    assert plan.sparse and plan.dtype == np.float32
+
+
+def test_plan_chunks_to_disk_output_plan():
+    plan = OutputPlan.create(1000, 1000, 5000, 2000, False, np.float64)
+    assert plan.to_disk and plan.sparse and plan.dtype == np.float64
+    assert 1 <= plan.chunk_rows < 1000 and plan.nbytes <= 2000
+    with pytest.raises(MemoryError, match="A single row of the result needs"):
+        OutputPlan.create(1000, 1000, 5000, 10, False, np.float64)
@@ -0,0 +1,24 @@
+import pytest
+import numpy as np
+
+from src.models import SortedVocabulary
+
+
+def test_lookup_sorted_vocabulary():
+    vocab = SortedVocabulary(np.array(["apple", "banana", "cherry"]))
+    assert vocab["banana"] == 1
+    assert "cherry" in vocab and "durian" not in vocab and "banan" not in vocab
+    assert dict(vocab) == {"apple": 0, "banana": 1, "cherry": 2}
+    with pytest.raises(KeyError):
+        vocab["bananas"]
+
+
+def test_lookup_with_indices_sorted_vocabulary():
+    vocab = SortedVocabulary(np.array(["apple", "banana", "cherry"]), np.array([2, 0, 1]))
+    assert vocab["apple"] == 2 and vocab["banana"] == 0
+    assert len(vocab) == 3
+
+
+def test_invalid_indices_sorted_vocabulary():
+    with pytest.raises(AssertionError, match="Terms and indices should have the same length !"):
+        SortedVocabulary(np.array(["apple"]), np.array([0, 1]))
@@ -0,0 +1,39 @@
+import random
+from collections import Counter
+
+import pytest
+
+from src.models import SpaceSaving
+
+
+def test_exact_counts_within_capacity_space_saving():
+    summary = SpaceSaving(5).update({"a": 3, "b": 1})
+    summary.add("a")
+    summary.add("c", 2)
+    assert summary.counts == {"a": 4, "b": 1, "c": 2}
+    assert summary.error_bound == 0 and summary.total == 7
+    assert sorted(summary.candidates(2)) == ["a", "c"]
+
+
+def test_error_bounds_space_saving():
+    random.seed(0)
+    stream = [str(int(random.paretovariate(1.0))) for _ in range(5000)]
+    true_counts = Counter(stream)
+    summary = SpaceSaving(20)
+    for term in stream:
+        summary.add(term)
+
+    assert len(summary) == 20 and summary.total == len(stream)
+    assert 0 < summary.error_bound <= len(stream) / 20
+    for term, count in summary.counts.items():
+        assert count - summary.errors[term] <= true_counts[term] <= count
+    for term, count in true_counts.items():
+        if term not in summary:
+            assert count <= summary.error_bound
+    heavy = [term for term, count in true_counts.items() if count > summary.error_bound]
+    assert set(heavy) <= set(summary.candidates(summary.error_bound + 1))
+
+
+def test_invalid_capacity_space_saving():
+    with pytest.raises(AssertionError, match="Capacity should be a positive integer !"):
+        SpaceSaving(0)
@@ -0,0 +1,67 @@
+import pytest
+
+from src.models import TermStatistics, merge_term_stats_files
+from src.models.term_stats import iter_term_stats, read_term_stats_header
+
+
+def test_add_document_term_stats():
+    stats = TermStatistics()
+    stats.add_document(["a", "b", "a"])
+    stats.add_document(["b", "c"])
+    assert stats.n_docs == 2
+    assert stats.dfs == {"a": 1, "b": 2, "c": 1}
+    assert stats.tfs == {"a": 2, "b": 2, "c": 1}
+    assert len(stats) == 3
+
+
+def test_merge_term_stats():
+    docs = [["a", "b", "a"], ["b", "c"], ["c"], ["d", "a"]]
+    full = TermStatistics().update(docs)
+    merged = TermStatistics().update(docs[:1]).merge(TermStatistics().update(docs[1:]))
+    assert merged.dfs == full.dfs and merged.tfs == full.tfs and merged.n_docs == full.n_docs
+
+
+def test_merge_invalid_type_term_stats():
+    with pytest.raises(AssertionError, match="Only TermStatistics objects can be merged !"):
+        TermStatistics().merge({"a": 1})
+
+
+@pytest.mark.parametrize("suffix", [".jsonl", ".jsonl.gz"])
+def test_save_and_load_term_stats(tmp_path, suffix):
+    stats = TermStatistics().update([["b", "a", "b"], ["c\tx", "\u00e7"]])
+    path = str(tmp_path / ("stats" + suffix))
+    stats.save(path, {"fingerprint": "f"})
+    assert read_term_stats_header(path)["n_docs"] == 2
+    assert list(iter_term_stats(path)) == list(stats.entries())
+
+    loaded, header = TermStatistics.load([path])
+    assert header["fingerprint"] == "f"
+    assert loaded.dfs == stats.dfs and loaded.tfs == stats.tfs and loaded.n_docs == stats.n_docs
+
+
+def test_merge_files_associative_term_stats(tmp_path):
+    docs = [["a", "b", "a"], ["b", "c"], ["c"], ["d", "a"], ["e"], ["a", "e"]]
+    paths = []
+    for i in range(3):
+        paths.append(str(tmp_path / ("shard_%d" % i)))
+        TermStatistics().update(docs[2 * i:2 * i + 2]).save(paths[-1], {"fingerprint": "f"})
+
+    left, right = str(tmp_path / "left"), str(tmp_path / "right")
+    merge_term_stats_files(paths[:2], left)
+    merge_term_stats_files([left, paths[2]], left + "_all")
+    merge_term_stats_files(paths[1:], right)
+    merge_term_stats_files([paths[0], right], right + "_all")
+
+    full = TermStatistics().update(docs)
+    header, entries = merge_term_stats_files(paths)
+    assert header["n_docs"] == len(docs)
+    assert list(entries) == list(full.entries())
+    assert list(iter_term_stats(left + "_all")) == list(iter_term_stats(right + "_all")) == list(full.entries())
+    assert read_term_stats_header(left + "_all") == read_term_stats_header(right + "_all")
+
+
+def test_merge_files_different_fingerprints_term_stats(tmp_path):
+    TermStatistics().update([["a"]]).save(str(tmp_path / "a"), {"fingerprint": "f"})
+    TermStatistics().update([["a"]]).save(str(tmp_path / "b"), {"fingerprint": "g"})
+    with pytest.raises(ValueError, match="different analysis settings"):
+        merge_term_stats_files([str(tmp_path / "a"), str(tmp_path / "b")])
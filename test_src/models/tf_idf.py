@@ -1,10 +1,14 @@
+import multiprocessing as mp
 import pytest
+import numpy as np
+import scipy.sparse as sp
 
 from sklearn.feature_extraction.text import TfidfVectorizer
 
-from src.models import TfIdfModel
+from src.models import TfIdfModel, OutputPlan, merge_term_stats_files
 from src.types import TextOps
 from src.constants import ENGLISH_STOP_WORDS
+from src.utils import IO
 
 def test_all_parameters_set_correct_tfidf():
     tf_idf = TfIdfModel(
@@ -246,4 +250,359 @@ def test_train_and_infer_methods_correct_input_tfidf():
         "Your Radio Playhouse. 312-832-3160.",
         "Check back with you later, Shirley."]
     val_out = tf_idf.infer(val_docs)
-    assert val_out.shape[0] == len(val_docs)
\ No newline at end of file
+    assert val_out.shape[0] == len(val_docs)
+
+def test_sparse_output_train_and_infer_tfidf():
+    tr_docs = [
+        "We're trying to manipulate the Radio Playhouse listeners, are we?",
+        "Well, let's seduce them with this phone number.",
+        "What is the phone number?"]
+    val_docs = ["Your Radio Playhouse. 312-832-3160."]
+
+    dense_model = TfIdfModel({TextOps.LOWER, TextOps.DIGITS, TextOps.PUNCTUATIONS})
+    sparse_model = TfIdfModel(
+        {TextOps.LOWER, TextOps.DIGITS, TextOps.PUNCTUATIONS}, sparse_output=True, dtype=np.float32)
+
+    out = sparse_model.train(tr_docs)
+    val_out = sparse_model.infer(val_docs)
+    assert sp.isspmatrix_csr(out) and sp.isspmatrix_csr(val_out)
+    assert out.dtype == np.float32 and val_out.dtype == np.float32
+    assert np.allclose(out.toarray(), dense_model.train(tr_docs))
+    assert np.allclose(val_out.toarray(), dense_model.infer(val_docs))
+
+
+def test_invalid_dtype_tfidf():
+    op_set = { TextOps.LOWER }
+    with pytest.raises(AssertionError, match="dtype must be either np.float64 or np.float32 !"):
+        tf_idf = TfIdfModel(op_set, dtype=np.int32)
+
+
+STREAM_DOCS = [
+    "We're trying to manipulate the Radio Playhouse listeners, are we?",
+    "I guess \"manipulate\" has the tune of a negative connotation.",
+    "Oh, encourage, cajole, lure, maybe?",
+    "Entice, how about?",
+    "Keep going, baby. You're on a roll. You're on such a roll here. Sure.",
+    "Well, let's seduce them with this phone number.",
+    "What is the phone number?"]
+
+
+@pytest.mark.parametrize("params", [
+    dict(),
+    dict(min_df=2, max_df=0.9),
+    dict(max_features=7),
+    dict(max_features=5, binary=True, ngram_range=(1, 2)),
+    dict(vocabulary=["phone", "number", "roll"]),
+])
+def test_train_stream_matches_train_tfidf(params):
+    op_set = {TextOps.LOWER, TextOps.DIGITS, TextOps.PUNCTUATIONS}
+    tf_idf = TfIdfModel(op_set, **params)
+    stream_tf_idf = TfIdfModel(op_set, **params)
+
+    tf_idf.train(STREAM_DOCS)
+    assert stream_tf_idf.train_stream(iter(STREAM_DOCS), chunk_size=2) is stream_tf_idf
+    assert stream_tf_idf.vocabulary_ == tf_idf.vocabulary_
+    assert np.array_equal(stream_tf_idf.idf_, tf_idf.idf_)
+    assert np.array_equal(stream_tf_idf.infer(STREAM_DOCS), tf_idf.infer(STREAM_DOCS))
+
+
+def test_train_stream_from_txt_file_tfidf(tmp_path):
+    corpus_path = tmp_path / "corpus.txt"
+    corpus_path.write_text("\n".join(STREAM_DOCS) + "\n")
+    tf_idf = TfIdfModel({TextOps.LOWER}, max_features=10)
+    stream_tf_idf = TfIdfModel({TextOps.LOWER}, max_features=10)
+
+    tf_idf.train([doc + "\n" for doc in STREAM_DOCS])
+    stream_tf_idf.train_stream(str(corpus_path), chunk_size=3)
+    assert stream_tf_idf.get_feature_names() == tf_idf.get_feature_names()
+    assert np.array_equal(stream_tf_idf.idf_, tf_idf.idf_)
+
+
+def test_train_stream_empty_input_tfidf():
+    tf_idf = TfIdfModel({TextOps.LOWER})
+    with pytest.raises(AssertionError, match="Corpus has to include at least one document!"):
+        tf_idf.train_stream(iter([]))
+
+
+@pytest.mark.parametrize("params", [
+    dict(),
+    dict(min_df=2),
+    dict(max_features=6, ngram_range=(1, 2)),
+])
+def test_train_incremental_matches_train_tfidf(params):
+    op_set = {TextOps.LOWER, TextOps.DIGITS, TextOps.PUNCTUATIONS}
+    tf_idf = TfIdfModel(op_set, **params)
+    incremental_tf_idf = TfIdfModel(op_set, **params)
+
+    incremental_tf_idf.train_incremental(STREAM_DOCS[:3])
+    tf_idf.train(STREAM_DOCS[:3])
+    assert incremental_tf_idf.vocabulary_ == tf_idf.vocabulary_
+
+    incremental_tf_idf.train_incremental(STREAM_DOCS[3:5])
+    assert incremental_tf_idf.train_incremental(STREAM_DOCS[5:]) is incremental_tf_idf
+    tf_idf.train(STREAM_DOCS)
+    assert incremental_tf_idf.term_stats_.n_docs == len(STREAM_DOCS)
+    assert incremental_tf_idf.vocabulary_ == tf_idf.vocabulary_
+    assert np.array_equal(incremental_tf_idf.idf_, tf_idf.idf_)
+
+
+def _collect_shard(args):
+    shard, path = args
+    tf_idf = TfIdfModel({TextOps.LOWER, TextOps.STOP_WORDS}, stop_words=["the", "we", "a", "on"], ngram_range=(1, 2))
+    return tf_idf.collect_term_stats(shard, path).n_docs
+
+
+@pytest.mark.parametrize("params", [dict(), dict(min_df=2, max_df=0.9), dict(max_features=6)])
+def test_from_term_stats_matches_train_tfidf(tmp_path, params):
+    paths = [str(tmp_path / ("shard_%d.jsonl" % i)) for i in range(3)]
+    shards = [STREAM_DOCS[:2], STREAM_DOCS[2:5], STREAM_DOCS[5:]]
+    with mp.Pool(2) as pool:
+        assert pool.map(_collect_shard, zip(shards, paths)) == [2, 3, 2]
+    merge_term_stats_files(paths[1:], str(tmp_path / "merged.jsonl"))
+
+    tf_idf = TfIdfModel({TextOps.LOWER, TextOps.STOP_WORDS}, stop_words=["the", "we", "a", "on"],
+                        ngram_range=(1, 2), **params)
+    tf_idf.train(STREAM_DOCS)
+    out = tf_idf.infer(STREAM_DOCS)
+    for inputs in [paths, [paths[0], str(tmp_path / "merged.jsonl")]]:
+        fitted = TfIdfModel.from_term_stats(inputs, **params)
+        assert fitted.vocabulary_ == tf_idf.vocabulary_
+        assert np.array_equal(fitted.idf_, tf_idf.idf_)
+        assert np.array_equal(fitted.infer(STREAM_DOCS), out)
+
+
+def test_from_term_stats_changed_analysis_tfidf(tmp_path):
+    path = str(tmp_path / "stats.jsonl")
+    TfIdfModel({TextOps.LOWER}).collect_term_stats(STREAM_DOCS, path)
+    with pytest.raises(ValueError, match="analysis settings of the model differ"):
+        TfIdfModel.from_term_stats([path], ngram_range=(1, 2))
+
+
+def test_train_incremental_after_train_tfidf():
+    tf_idf = TfIdfModel({TextOps.LOWER})
+    tf_idf.train(STREAM_DOCS)
+    with pytest.raises(AssertionError, match="Model is fitted without term statistics"):
+        tf_idf.train_incremental(STREAM_DOCS)
+
+
+@pytest.mark.parametrize("shard_size", [None, 1, 3])
+def test_parallel_infer_matches_serial_tfidf(shard_size):
+    tf_idf = TfIdfModel({TextOps.LOWER, TextOps.DIGITS, TextOps.PUNCTUATIONS}, ngram_range=(1, 2))
+    tf_idf.train(STREAM_DOCS)
+    out = tf_idf.infer(STREAM_DOCS)
+    assert np.array_equal(tf_idf.infer(STREAM_DOCS, n_jobs=2, shard_size=shard_size), out)
+
+    tf_idf.sparse_output = True
+    sparse_out = tf_idf.infer(STREAM_DOCS, n_jobs=2, shard_size=shard_size)
+    assert sp.isspmatrix_csr(sparse_out)
+    assert np.array_equal(sparse_out.toarray(), out)
+
+
+@pytest.mark.parametrize("params", [
+    dict(ngram_range=(1, 2)),
+    dict(max_features=5),
+    dict(min_df=2, max_df=0.8, binary=True),
+    dict(vocabulary=["document", "second", "missing"]),
+    dict(stop_words=["the", "we", "a", "on"]),
+])
+@pytest.mark.parametrize("shard_size", [None, 1, 3])
+def test_parallel_train_matches_serial_tfidf(params, shard_size):
+    op_set = {TextOps.LOWER, TextOps.DIGITS, TextOps.PUNCTUATIONS}
+    if "stop_words" in params:
+        op_set.add(TextOps.STOP_WORDS)
+    tf_idf = TfIdfModel(op_set, sparse_output=True, **params)
+    parallel_tf_idf = TfIdfModel(op_set, sparse_output=True, **params)
+    out = tf_idf.train(STREAM_DOCS)
+    parallel_out = parallel_tf_idf.train(STREAM_DOCS, n_jobs=2, shard_size=shard_size)
+
+    assert list(parallel_tf_idf.vocabulary_.items()) == list(tf_idf.vocabulary_.items())
+    assert np.array_equal(parallel_tf_idf.idf_, tf_idf.idf_)
+    assert (parallel_out != out).nnz == 0
+    assert np.array_equal(parallel_out.indices, out.indices)
+    assert np.array_equal(parallel_tf_idf.infer(STREAM_DOCS).toarray(), tf_idf.infer(STREAM_DOCS).toarray())
+
+
+def test_parallel_train_empty_vocabulary_tfidf():
+    tf_idf = TfIdfModel({TextOps.LOWER, TextOps.STOP_WORDS}, stop_words=["the", "a"])
+    with pytest.raises(ValueError, match="empty vocabulary"):
+        tf_idf.train(["the a", "a the", "the"], n_jobs=2, shard_size=1)
+    assert tf_idf._fit_parallelism is None
+
+
+def test_parallel_infer_invalid_n_jobs_tfidf():
+    tf_idf = TfIdfModel({TextOps.LOWER})
+    tf_idf.train(STREAM_DOCS)
+    with pytest.raises(AssertionError, match="n_jobs should be a positive integer or -1 !"):
+        tf_idf.infer(STREAM_DOCS, n_jobs=0)
+    with pytest.raises(AssertionError, match="n_jobs should be a positive integer or -1 !"):
+        tf_idf.train(STREAM_DOCS, n_jobs=0)
+
+
+@pytest.mark.parametrize("params", [
+    dict(),
+    dict(vocabulary=["phone", "number", "roll"]),
+    dict(ngram_range=(1, 2), max_features=10, dtype=np.float32, sublinear_tf=True),
+    dict(use_idf=False),
+])
+@pytest.mark.parametrize("mmap", [True, False])
+def test_save_and_load_tfidf(tmp_path, params, mmap):
+    tf_idf = TfIdfModel({TextOps.LOWER, TextOps.DIGITS, TextOps.PUNCTUATIONS}, **params)
+    tf_idf.train(STREAM_DOCS)
+    tf_idf.save(str(tmp_path))
+
+    loaded = TfIdfModel.load(str(tmp_path), mmap=mmap)
+    assert loaded.op_set == tf_idf.op_set
+    assert loaded.get_feature_names() == tf_idf.get_feature_names()
+    assert np.array_equal(loaded.infer(STREAM_DOCS), tf_idf.infer(STREAM_DOCS))
+    if mmap and tf_idf.use_idf:
+        assert isinstance(loaded.idf_, np.memmap)
+
+
+def test_save_unfitted_tfidf(tmp_path):
+    tf_idf = TfIdfModel({TextOps.LOWER})
+    with pytest.raises(AssertionError, match="Model has to be fitted before saving !"):
+        tf_idf.save(str(tmp_path))
+
+
+@pytest.mark.parametrize("ngram_range", [(1, 1), (1, 2)])
+def test_batch_normalize_matches_per_token_tfidf(ngram_range):
+    params = dict(stop_words=["the", "we", "a", "on"], ngram_range=ngram_range, word_tokenizer="regex", sparse_output=True)
+    op_set = {TextOps.LOWER, TextOps.STOP_WORDS, TextOps.STEM}
+    expected = TfIdfModel(op_set, **params)
+    batched = TfIdfModel(op_set, batch_normalize=True, **params)
+    batched.normalize_batch_size = 2
+
+    calls = []
+    stem = batched.tokenizer.tokenizer_fn
+    batched.tokenizer.tokenizer_fn = lambda token: calls.append(token) or stem(token)
+
+    assert (batched.train(STREAM_DOCS) != expected.train(STREAM_DOCS)).nnz == 0
+    assert batched.get_feature_names() == expected.get_feature_names()
+    assert len(calls) == len(set(calls))
+    assert (batched.infer(STREAM_DOCS[:3]) != expected.infer(STREAM_DOCS[:3])).nnz == 0
+
+
+def test_batch_normalize_stream_and_incremental_tfidf():
+    op_set = {TextOps.LOWER, TextOps.PUNCTUATIONS, TextOps.STEM}
+    expected = TfIdfModel(op_set, word_tokenizer="regex").train_stream(STREAM_DOCS, chunk_size=2)
+    streamed = TfIdfModel(op_set, word_tokenizer="regex", batch_normalize=True).train_stream(STREAM_DOCS, chunk_size=2)
+    incremental = TfIdfModel(op_set, word_tokenizer="regex", batch_normalize=True, normalize_n_jobs=2)
+    incremental.normalize_batch_size = 2
+    incremental.train_incremental(STREAM_DOCS[:3])
+    incremental.train_incremental(STREAM_DOCS[3:])
+
+    for model in [streamed, incremental]:
+        assert model.vocabulary_ == expected.vocabulary_
+        assert np.array_equal(model.idf_, expected.idf_)
+
+
+@pytest.mark.parametrize("params", [
+    dict(min_df=2),
+    dict(min_df=2, max_df=0.9, binary=True),
+    dict(ngram_range=(1, 2), max_features=3),
+    dict(analyzer="char", ngram_range=(2, 3), max_features=10),
+])
+@pytest.mark.parametrize("n_jobs", [1, 2])
+def test_vocabulary_budget_matches_exact_tfidf(params, n_jobs):
+    op_set = {TextOps.LOWER, TextOps.PUNCTUATIONS}
+    expected = TfIdfModel(op_set, sparse_output=True, **params)
+    out = expected.train(STREAM_DOCS)
+    # A budget as large as the number of candidate terms loses nothing
+    budgeted = TfIdfModel(op_set, sparse_output=True, vocabulary_budget=10000, **params)
+    budgeted_out = budgeted.train(STREAM_DOCS, n_jobs=n_jobs, shard_size=3)
+
+    assert budgeted.vocabulary_error_bound_ == 0 and budgeted.vocabulary_exact_
+    assert budgeted.vocabulary_ == expected.vocabulary_
+    assert np.array_equal(budgeted.idf_, expected.idf_)
+    assert (budgeted_out != out).nnz == 0
+
+    streamed = TfIdfModel(op_set, vocabulary_budget=10000, **params).train_stream(STREAM_DOCS, chunk_size=2)
+    assert streamed.vocabulary_exact_ and streamed.vocabulary_ == expected.vocabulary_
+    assert np.array_equal(streamed.idf_, expected.idf_)
+
+
+@pytest.mark.parametrize("params", [
+    dict(min_df=3),
+    dict(max_features=5),
+    dict(ngram_range=(1, 2), min_df=2, max_features=8),
+])
+def test_vocabulary_budget_error_bound_tfidf(params):
+    docs = STREAM_DOCS * 3 + ["phone number phone number roll"] * 4
+    op_set = {TextOps.LOWER, TextOps.PUNCTUATIONS}
+    expected = TfIdfModel(op_set, **params)
+    expected.train(docs)
+    budgeted = TfIdfModel(op_set, vocabulary_budget=12, **params)
+    budgeted.train(docs)
+
+    analyze = expected.build_analyzer()
+    counts = {}
+    for doc in docs:
+        for term in analyze(doc):
+            counts[term] = counts.get(term, 0) + 1
+    bound = budgeted.vocabulary_error_bound_
+    assert bound <= sum(counts.values()) / 12
+    if "max_features" not in params:
+        # Candidates are counted exactly, and only terms counted at most 'bound' times can be missed
+        assert set(budgeted.vocabulary_) <= set(expected.vocabulary_)
+        assert all(counts[term] <= bound for term in set(expected.vocabulary_) - set(budgeted.vocabulary_))
+    if budgeted.vocabulary_exact_:
+        assert budgeted.vocabulary_ == expected.vocabulary_
+        assert np.allclose(budgeted.idf_, expected.idf_)
+
+
+def test_vocabulary_budget_needs_two_passes_tfidf():
+    tf_idf = TfIdfModel({TextOps.LOWER}, vocabulary_budget=10)
+    with pytest.raises(AssertionError, match="'vocabulary_budget' needs a corpus that can be read twice"):
+        tf_idf.train_stream(iter(STREAM_DOCS))
+    with pytest.raises(AssertionError, match="'vocabulary_budget' is not supported by 'train_incremental' !"):
+        tf_idf.train_incremental(STREAM_DOCS)
+    with pytest.raises(AssertionError, match="'vocabulary_budget' should be a positive integer !"):
+        TfIdfModel({TextOps.LOWER}, vocabulary_budget=0)
+
+
+@pytest.mark.parametrize("sample_size", [1000, 3])
+def test_memory_budget_output_tfidf(sample_size):
+    op_set = {TextOps.LOWER, TextOps.PUNCTUATIONS}
+    expected = TfIdfModel(op_set, sparse_output=True)
+    out = expected.train(STREAM_DOCS)
+    n_rows, n_cols = out.shape
+
+    tf_idf = TfIdfModel(op_set, memory_budget=10 ** 9)
+    tf_idf.output_sample_size = sample_size
+    assert isinstance(tf_idf.train(STREAM_DOCS), np.ndarray)
+    result = tf_idf.infer(STREAM_DOCS)
+    assert isinstance(result, np.ndarray) and result.dtype == np.float64
+    assert np.array_equal(result, expected.infer(STREAM_DOCS).toarray())
+
+    # A budget below the dense float32 peak keeps the result sparse
+    tf_idf.output_sample_size = 1000
+    tf_idf.memory_budget = OutputPlan.peak_nbytes(n_rows, n_cols, out.nnz, True, np.float64, np.float64)
+    assert tf_idf.memory_budget < OutputPlan.peak_nbytes(n_rows, n_cols, out.nnz, False, np.float32, np.float64)
+    result = tf_idf.infer(STREAM_DOCS)
+    assert sp.issparse(result) and tf_idf.output_plan_.sparse
+    assert np.allclose(result.toarray(), out.toarray())
+
+
+def test_memory_budget_written_to_disk_tfidf(tmp_path):
+    op_set = {TextOps.LOWER, TextOps.PUNCTUATIONS}
+    expected = TfIdfModel(op_set, sparse_output=True)
+    out = expected.train(STREAM_DOCS)
+
+    tf_idf = TfIdfModel(op_set, memory_budget=500)
+    tf_idf.output_sample_size = 3
+    with pytest.raises(MemoryError, match="Pass 'out_path' to write it to disk"):
+        tf_idf.train(STREAM_DOCS)
+    path = str(tmp_path / "train.npz")
+    assert tf_idf.train(STREAM_DOCS, out_path=path) is None
+    assert tf_idf.output_plan_.to_disk and tf_idf.output_plan_.chunk_rows < len(STREAM_DOCS)
+    X, _, colnames = IO.read_npz(path)
+    assert colnames == expected.get_feature_names()
+    assert np.allclose(X.toarray(), out.toarray())
+
+    path = str(tmp_path / "infer.npz")
+    with pytest.raises(MemoryError, match="more than the memory budget of 500 bytes"):
+        tf_idf.infer(STREAM_DOCS)
+    with pytest.raises(AssertionError, match="needs a '.npz', '.mtx' or '.tsv' out_path"):
+        tf_idf.infer(STREAM_DOCS, out_path=str(tmp_path / "infer.csv"))
+    assert tf_idf.infer(STREAM_DOCS, out_path=path) is None
+    assert np.allclose(IO.read_npz(path)[0].toarray(), out.toarray())
@@ -1,4 +1,5 @@
 from .digit_preprocessor import *
 from .punc_preprocessor import *
 from .external_preprocessor import *
-from .multi_preprocessor import *
\ No newline at end of file
+from .multi_preprocessor import *
+from .fused_preprocessor import *
\ No newline at end of file
@@ -0,0 +1,46 @@
+import random
+import itertools
+import pytest
+
+from src.models import TfIdfModel
+from src.preprocessors import FusedPreprocessor
+from src.types import TextOps
+
+ALPHABET = "aZ09 \t\n" + "!\"#$%&'()*+,-./:;<=>?@[\\]^_`{|}~" + "āÉışöçğ€ﬁ²"
+
+OP_SETS = [
+    {op for op in ops if op is not None}
+    for ops in itertools.product(
+        [None, TextOps.LOWER], [None, TextOps.ASCII, TextOps.UNICODE],
+        [None, TextOps.DIGITS], [None, TextOps.PUNCTUATIONS])
+]
+
+
+@pytest.mark.parametrize("op_set", OP_SETS)
+def test_fused_equals_chain(op_set):
+    rng = random.Random(0)
+    texts = ["", " ", "  Mr. O'Neil paid $1,250.75 -- twice!\n", "āăą 2ndFloor\t ÉCOLE,,  "]
+    texts += ["".join(rng.choice(ALPHABET) for _ in range(rng.randint(0, 40))) for _ in range(500)]
+
+    chain = TfIdfModel(op_set, fuse_preprocessors=False).build_preprocessor()
+    fused = TfIdfModel(op_set).build_preprocessor()
+    assert type(fused) == FusedPreprocessor
+    for text in texts:
+        assert fused(text) == chain(text)
+
+
+def test_custom_preprocessor_not_fused():
+    tf_idf = TfIdfModel({TextOps.DIGITS}, preprocessor=str.upper)
+    assert type(tf_idf.build_preprocessor()) != FusedPreprocessor
+    assert tf_idf.build_preprocessor()("ab1 c") == "AB C"
+
+
+def test_both_strip_accents_fused():
+    with pytest.raises(AssertionError, match="Both ASCII and UNICODE cannot be applied together !"):
+        FusedPreprocessor({TextOps.ASCII, TextOps.UNICODE})
+
+
+def test_none_text_fused():
+    fp = FusedPreprocessor({TextOps.DIGITS})
+    with pytest.raises(AssertionError, match="Text to preprocess cannot be None"):
+        fp(None)
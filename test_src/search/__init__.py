@@ -0,0 +1 @@
+from .inverted_index import *
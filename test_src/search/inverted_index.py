@@ -0,0 +1,90 @@
+import pytest
+import numpy as np
+
+from src.models import TfIdfModel
+from src.search import InvertedIndex
+from src.types import TextOps
+
+DOCS = [
+    "We're trying to manipulate the Radio Playhouse listeners, are we?",
+    "I guess \"manipulate\" has the tune of a negative connotation.",
+    "Keep going, baby. You're on a roll. You're on such a roll here. Sure.",
+    "Well, let's seduce them with this phone number.",
+    "What is the phone number?"]
+
+
+def zipf_corpus(n_docs :int, n_terms :int=300, doc_length :int=30):
+    rng = np.random.default_rng(0)
+    probs = 1.0 / np.arange(1, n_terms + 1)
+    ids = rng.choice(n_terms, size=(n_docs, doc_length), p=probs / probs.sum())
+    return [" ".join("w%d" % i for i in row) for row in ids]
+
+
+def brute_force(tf_idf, X, query, k):
+    q = tf_idf.infer([query])[0]
+    X = X / np.maximum(np.linalg.norm(X, axis=1, keepdims=True), 1e-12)
+    scores = X @ (q / max(np.linalg.norm(q), 1e-12))
+    order = np.lexsort((np.arange(len(scores)), -scores))
+    return [(int(i), float(scores[i])) for i in order[:k] if scores[i] > 0]
+
+
+def test_posting_lists_index():
+    tf_idf = TfIdfModel({TextOps.LOWER, TextOps.PUNCTUATIONS})
+    index = InvertedIndex(tf_idf, tf_idf.train(DOCS))
+    doc_ids, weights = index.posting_list(tf_idf.vocabulary_["phone"])
+    assert doc_ids.tolist() == [3, 4] and np.all(weights > 0)
+    assert len(index) == len(DOCS) and index.max_weights.shape == (len(tf_idf.vocabulary_),)
+
+
+def test_search_with_labels_index():
+    tf_idf = TfIdfModel({TextOps.LOWER, TextOps.PUNCTUATIONS})
+    index = InvertedIndex(tf_idf, tf_idf.train(DOCS), labels=["a", "b", "c", "d", "e"])
+    results = index.search("phone number", k=2)
+    assert [label for label, _ in results] == ["e", "d"]
+    assert index.search("unseen words only") == []
+
+
+@pytest.mark.parametrize("k", [1, 5, 20])
+def test_pruned_search_matches_brute_force_index(k):
+    docs = zipf_corpus(500)
+    tf_idf = TfIdfModel({TextOps.LOWER}, norm=None, sublinear_tf=True)
+    X = tf_idf.train(docs)
+    index = InvertedIndex(tf_idf, X)
+
+    rng = np.random.default_rng(1)
+    for _ in range(50):
+        query = " ".join(rng.choice(docs).split()[:rng.integers(1, 10)])
+        results, expected = index.search(query, k), brute_force(tf_idf, X, query, k)
+        assert [d for d, _ in results] == [d for d, _ in expected]
+        assert np.allclose([s for _, s in results], [s for _, s in expected])
+        assert index.search_exhaustive(query, k) == pytest.approx(results)
+
+
+def test_pruning_skips_postings_index():
+    docs = zipf_corpus(2000)
+    tf_idf = TfIdfModel({TextOps.LOWER}, sparse_output=True)
+    index = InvertedIndex(tf_idf, tf_idf.train(docs))
+    features, _, _ = index.query_vector("w0 w1 w250")
+    index.search("w0 w1 w250", k=3)
+    total = sum(len(index.posting_list(f)[0]) for f in features)
+    assert index.last_stats["probed_terms"] > 0
+    assert index.last_stats["scanned_postings"] + index.last_stats["probed_postings"] < total
+
+
+def test_invalid_index():
+    tf_idf = TfIdfModel({TextOps.LOWER})
+    X = tf_idf.train(DOCS)
+    with pytest.raises(AssertionError):
+        InvertedIndex(tf_idf, X[:, :-1])
+    with pytest.raises(AssertionError):
+        InvertedIndex(tf_idf, X, labels=["a"])
+    with pytest.raises(AssertionError):
+        InvertedIndex(tf_idf, X).search("phone", k=0)
+
+
+def test_stem_model_and_empty_query_index():
+    tf_idf = TfIdfModel({TextOps.LOWER, TextOps.PUNCTUATIONS, TextOps.STEM}, word_tokenizer="regex")
+    index = InvertedIndex(tf_idf, tf_idf.train(DOCS))
+    assert index.search("phone numbers", k=2)[0][0] in (3, 4)
+    assert index.search("", k=2) == [] and index.search("?!", k=2) == []
+    assert index.search_exhaustive("?!", k=2) == []
@@ -0,0 +1,2 @@
+from .micro_batcher import *
+from .app import *
\ No newline at end of file
@@ -0,0 +1,68 @@
+import pytest
+import numpy as np
+
+from app import create_app
+from src.models import TfIdfModel
+from src.types import TextOps
+
+DOCS = [
+    "We're trying to manipulate the Radio Playhouse listeners, are we?",
+    "Well, let's seduce them with this phone number.",
+    "What is the phone number?"]
+
+
+@pytest.fixture
+def fitted_client():
+    tf_idf = TfIdfModel({TextOps.LOWER, TextOps.PUNCTUATIONS})
+    tf_idf.train(DOCS)
+    return tf_idf, create_app(model=tf_idf).test_client()
+
+
+def test_transform_service(fitted_client):
+    tf_idf, client = fitted_client
+    assert client.get("/ready").status_code == 200
+
+    response = client.post("/transform", json={"documents": DOCS[1:]})
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body["n_features"] == len(tf_idf.vocabulary_)
+
+    expected = tf_idf.infer(DOCS[1:])
+    for row, result in zip(expected, body["results"]):
+        dense = np.zeros(body["n_features"])
+        dense[result["indices"]] = result["values"]
+        assert np.allclose(dense, row)
+
+
+def test_transform_service_top_k(fitted_client):
+    tf_idf, client = fitted_client
+    body = client.post("/transform", json={"documents": ["phone number radio"], "top_k": 2}).get_json()
+    terms = body["results"][0]["terms"]
+    assert len(terms) == 2 and terms[0]["weight"] >= terms[1]["weight"]
+    assert terms[0]["term"] == "radio"
+
+
+def test_transform_service_invalid_requests(fitted_client):
+    _, client = fitted_client
+    assert client.post("/transform", json={"documents": "not a list"}).status_code == 400
+    assert client.post("/transform", json={"documents": []}).status_code == 400
+    assert client.post("/transform", json={"documents": ["a"], "top_k": 0}).status_code == 400
+    assert client.post("/transform", data="not json").status_code == 400
+
+
+def test_transform_service_without_model(tmp_path):
+    client = create_app(model_path=str(tmp_path / "missing")).test_client()
+    assert client.get("/health").status_code == 200
+    assert client.get("/ready").status_code == 503
+    assert client.post("/transform", json={"documents": ["a"]}).status_code == 503
+
+
+def test_transform_service_unanalyzable_documents():
+    tf_idf = TfIdfModel({TextOps.LOWER, TextOps.PUNCTUATIONS, TextOps.STEM}, word_tokenizer="regex")
+    tf_idf.train(DOCS)
+    client = create_app(model=tf_idf).test_client()
+
+    response = client.post("/transform", json={"documents": ["phone number", "?!"]})
+    assert response.status_code == 400
+    assert "Documents could not be analyzed" in response.get_json()["error"]
+    assert client.post("/transform", json={"documents": ["phone number"]}).status_code == 200
@@ -0,0 +1,85 @@
+import asyncio
+import pytest
+import numpy as np
+
+from src.models import TfIdfModel
+from src.serving import MicroBatcher
+from src.types import TextOps
+
+DOCS = [
+    "We're trying to manipulate the Radio Playhouse listeners, are we?",
+    "I guess \"manipulate\" has the tune of a negative connotation.",
+    "Keep going, baby. You're on a roll. You're on such a roll here. Sure.",
+    "Well, let's seduce them with this phone number.",
+    "What is the phone number?"]
+
+
+def fitted_model():
+    tf_idf = TfIdfModel({TextOps.LOWER, TextOps.PUNCTUATIONS})
+    tf_idf.train(DOCS)
+    return tf_idf
+
+
+def test_batched_rows_match_infer_batcher():
+    tf_idf = fitted_model()
+
+    async def run():
+        async with MicroBatcher(tf_idf, max_batch_size=2, max_wait=0.01) as batcher:
+            return await asyncio.gather(*[batcher.transform(doc) for doc in DOCS * 3]), batcher.metrics.info()
+
+    rows, info = asyncio.run(run())
+    assert np.allclose(np.vstack([row.toarray() for row in rows]), tf_idf.infer(DOCS * 3))
+    assert info["requests"] == 15 and info["max_batch_size"] <= 2
+    assert sum(size * count for size, count in info["batch_sizes"].items()) == 15
+
+
+def test_concurrent_requests_are_coalesced_batcher():
+    tf_idf = fitted_model()
+
+    async def run():
+        async with MicroBatcher(tf_idf, max_batch_size=64, max_wait=0.05) as batcher:
+            await asyncio.gather(*[batcher.transform(doc) for doc in DOCS * 4])
+            return batcher.metrics.info()
+
+    info = asyncio.run(run())
+    assert info["batches"] == 1 and info["batch_sizes"] == {20: 1}
+    assert info["max_queue_depth"] == 20
+
+
+def test_lone_request_is_not_delayed_batcher():
+    tf_idf = fitted_model()
+
+    async def run():
+        async with MicroBatcher(tf_idf, max_batch_size=64, max_wait=0.0) as batcher:
+            return await batcher.transform(DOCS[0])
+
+    assert np.allclose(asyncio.run(run()).toarray(), tf_idf.infer(DOCS[:1]))
+
+
+def test_errors_are_sent_to_callers_batcher():
+    async def run():
+        async with MicroBatcher(TfIdfModel({TextOps.LOWER})) as batcher:
+            return await asyncio.gather(*[batcher.transform(doc) for doc in DOCS], return_exceptions=True)
+
+    results = asyncio.run(run())
+    assert len(results) == len(DOCS) and all(isinstance(r, Exception) for r in results)
+
+
+def test_failing_document_only_fails_its_request_batcher():
+    tf_idf = TfIdfModel({TextOps.LOWER, TextOps.PUNCTUATIONS, TextOps.STEM}, word_tokenizer="regex")
+    tf_idf.train(DOCS)
+    docs = [DOCS[3], "?!", DOCS[4], DOCS[0]]
+
+    async def run():
+        async with MicroBatcher(tf_idf, max_batch_size=64, max_wait=0.05) as batcher:
+            return await asyncio.gather(*[batcher.transform(doc) for doc in docs], return_exceptions=True)
+
+    results = asyncio.run(run())
+    assert isinstance(results[1], AssertionError)
+    good = [0, 2, 3]
+    assert np.allclose(np.vstack([results[i].toarray() for i in good]), tf_idf.infer([docs[i] for i in good]))
+
+
+def test_not_started_batcher():
+    with pytest.raises(AssertionError):
+        asyncio.run(MicroBatcher(fitted_model()).transform(DOCS[0]))
@@ -1,2 +1,5 @@
 from .lemma_tokenizer import *
-from .stem_tokenizer import *
\ No newline at end of file
+from .stem_tokenizer import *
+from .token_cache import *
+from .resources import *
+from .regex_word_tokenizer import *
@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+
+from src.models import TfIdfModel
+from src.tokenizers import RegexWordTokenizer, StemTokenizer
+from src.types import TextOps
+
+
+@pytest.mark.parametrize("text, tokens", [
+    ("We're trying, aren't we?", ["We", "'re", "trying", ",", "are", "n't", "we", "?"]),
+    ("I cannot go, gonna wait... DON'T", ["I", "can", "not", "go", ",", "gon", "na", "wait", "...", "DO", "N'T"]),
+    ("Good muffins cost $3.88 (roughly 3,36 euros)\nin New York.  Please buy me two of them.\nThanks.",
+     ["Good", "muffins", "cost", "$", "3.88", "(", "roughly", "3,36", "euros", ")", "in", "New", "York", ".",
+      "Please", "buy", "me", "two", "of", "them", ".", "Thanks", "."]),
+    ('She said "No!" at 10:30 -- the dogs\' owner', 
+     ["She", "said", "``", "No", "!", "''", "at", "10:30", "--", "the", "dogs", "'", "owner"]),
+    ("Mr. Smith met J. Doe in the U.S. on Jan. 5th, e.g. here.",
+     ["Mr.", "Smith", "met", "J.", "Doe", "in", "the", "U.S.", "on", "Jan.", "5th", ",", "e.g.", "here", "."]),
+    ("call id='data' for x-ray 50% #tag a@b", 
+     ["call", "id=", "'", "data", "'", "for", "x-ray", "50", "%", "#", "tag", "a", "@", "b"]),
+])
+def test_regex_word_tokenizer(text, tokens):
+    assert RegexWordTokenizer()(text) == tokens
+
+
+def test_regex_word_tokenizer_matches_treebank_on_sentences():
+    from nltk.tokenize import NLTKWordTokenizer
+    treebank = NLTKWordTokenizer()
+    sentences = [
+        "Keep going, baby.",
+        "I guess \"manipulate\" has the tune of a negative connotation.",
+        "Well, let's seduce them with this phone number 555.",
+        "He'd say 'hello' [sic] to y'all; they'll gimme {more} <tags> *now*.",
+        "Isn't it 1,000,000 dollars: a lot?",
+    ]
+    for sentence in sentences:
+        assert RegexWordTokenizer()(sentence) == treebank.tokenize(sentence)
+
+
+def test_stem_tokenizer_with_regex_word_tokenizer():
+    st = StemTokenizer(word_tokenizer="regex")
+    assert st("changes does filming ordered they toys") == ['chang', 'doe', 'film', 'order', 'they', 'toy']
+    with pytest.raises(AssertionError, match="Word tokenizer can be one of nltk or regex !"):
+        StemTokenizer(word_tokenizer="split")
+
+
+def test_model_with_regex_word_tokenizer(tmp_path):
+    docs = ["Keep going, baby. You're on a roll.", "What is the phone number?", "Phones aren't rolling."]
+    tf_idf = TfIdfModel({TextOps.LOWER, TextOps.STEM}, word_tokenizer="regex")
+    X = tf_idf.train(docs)
+    assert "n't" in tf_idf.get_feature_names() and "phone" in tf_idf.get_feature_names()
+
+    tf_idf.save(str(tmp_path / "model"))
+    loaded = TfIdfModel.load(str(tmp_path / "model"))
+    assert loaded.word_tokenizer == "regex"
+    assert np.allclose(loaded.infer(docs), X)
@@ -0,0 +1,34 @@
+import subprocess
+import sys
+import pytest
+
+from src.tokenizers import resources
+
+
+def test_import_does_not_load_heavy_modules():
+    code = "import sys, src.models, src.utils, src.tokenizers; " \
+           "print([m for m in ['nltk', 'matplotlib', 'seaborn'] if m in sys.modules])"
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert out.stdout.strip() == "[]"
+
+
+def test_offline_missing_resource_resources(monkeypatch):
+    monkeypatch.setenv(resources.OFFLINE_ENV, "1")
+    monkeypatch.setattr(resources, "has_nltk_resource", lambda name: False)
+    monkeypatch.setattr(resources, "_verified", set())
+    with pytest.raises(LookupError, match="NLTK resource 'wordnet' is not installed."):
+        resources.ensure_nltk_resources(["wordnet"])
+
+
+def test_verified_resource_not_checked_again_resources(monkeypatch):
+    checked = []
+    monkeypatch.setattr(resources, "has_nltk_resource", lambda name: checked.append(name) or True)
+    monkeypatch.setattr(resources, "_verified", set())
+    resources.ensure_nltk_resources(["wordnet"])
+    resources.ensure_nltk_resources(["wordnet"])
+    assert checked == ["wordnet"]
+
+
+def test_unknown_resource_resources():
+    with pytest.raises(AssertionError, match="Unknown NLTK resource: dummy !"):
+        resources.has_nltk_resource("dummy")
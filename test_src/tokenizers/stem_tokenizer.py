@@ -51,4 +51,10 @@ def test_empty_tokenizer_fn_stem():
     st = StemTokenizer()
     st.tokenizer_fn = None
     with pytest.raises(AssertionError, match="Tokenizer function must be a callable !"):
-        st(init_str)
\ No newline at end of file
+        st(init_str)
+
+def test_cached_stem():
+    init_str = "changes does filming ordered they toys changes"
+    st = StemTokenizer(cache_size=100)
+    assert st(init_str) == StemTokenizer()(init_str)
+    assert st.cache_info()["hits"] == 1 and st.cache_info()["misses"] == 6
@@ -0,0 +1,50 @@
+import pickle
+import pytest
+
+from src.tokenizers import TokenCache
+
+
+def test_map_and_stats_cache():
+    calls = []
+    def upper(token):
+        calls.append(token)
+        return token.upper()
+
+    cache = TokenCache(max_size=10)
+    assert cache.map(upper, ["a", "b", "a", "a"]) == ["A", "B", "A", "A"]
+    assert calls == ["a", "b"]
+    info = cache.info()
+    assert info["hits"] == 2 and info["misses"] == 2 and info["size"] == 2
+    assert info["hit_rate"] == 0.5
+
+
+def test_lru_eviction_cache():
+    cache = TokenCache(max_size=2, policy="lru")
+    cache.map(str.upper, ["a", "b", "a", "c"])
+    assert list(cache.entries) == ["a", "c"]
+    assert cache.info()["evictions"] == 1
+
+
+def test_fifo_eviction_cache():
+    cache = TokenCache(max_size=2, policy="fifo")
+    cache.map(str.upper, ["a", "b", "a", "c"])
+    assert list(cache.entries) == ["b", "c"]
+
+
+def test_pickled_cache_is_empty():
+    cache = TokenCache(max_size=3, policy="fifo")
+    cache.map(str.upper, ["a", "b", "a"])
+    loaded = pickle.loads(pickle.dumps(cache))
+    assert len(loaded) == 0 and loaded.hits == 0
+    assert loaded.max_size == 3 and loaded.policy == "fifo"
+    assert loaded.map(str.upper, ["a"]) == ["A"]
+
+
+def test_invalid_size_cache():
+    with pytest.raises(AssertionError, match="Cache size should be a positive integer !"):
+        TokenCache(max_size=0)
+
+
+def test_invalid_policy_cache():
+    with pytest.raises(AssertionError, match="Cache policy can be one of lru or fifo !"):
+        TokenCache(policy="random")
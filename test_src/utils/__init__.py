@@ -0,0 +1,6 @@
+from .io import *
+from .visualize import *
+from .pipeline_stats import *
+from .jsonl import *
+from .json_stream import *
+from .analysis_cache import *
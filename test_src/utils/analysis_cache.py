@@ -0,0 +1,101 @@
+import multiprocessing as mp
+import numpy as np
+import pickle
+
+from src.models import TfIdfModel, HashingTfIdfModel
+from src.types import TextOps
+from src.utils import AnalysisCache
+
+DOCS = [
+    "We're trying to manipulate the Radio Playhouse listeners, are we?",
+    "I guess \"manipulate\" has the tune of a negative connotation.",
+    "Keep going, baby. You're on a roll. You're on such a roll here. Sure.",
+    "Well, let's seduce them with this phone number 555.",
+    "What is the phone number?",
+    "Keep going, baby. You're on a roll. You're on such a roll here. Sure."]
+OP_SET = {TextOps.LOWER, TextOps.DIGITS, TextOps.PUNCTUATIONS, TextOps.STOP_WORDS}
+
+
+def test_cached_model_matches_uncached(tmp_path):
+    path = str(tmp_path / "analysis.sqlite")
+    expected = TfIdfModel(OP_SET, stop_words=["the", "we"]).train(DOCS)
+
+    first = TfIdfModel(OP_SET, stop_words=["the", "we"], analysis_cache=path)
+    assert np.allclose(first.train(DOCS), expected)
+    info = first.analysis_cache.info()
+    assert info["misses"] == 5 and info["hits"] == 1 and info["entries"] == 5
+
+    second = TfIdfModel(OP_SET, stop_words=["the", "we"], analysis_cache=path)
+    assert np.allclose(second.train(DOCS), expected)
+    assert np.allclose(second.infer(DOCS[:2]), expected[:2])
+    assert second.analysis_cache.info()["misses"] == 0
+
+
+def test_fingerprint_separates_settings(tmp_path):
+    path = str(tmp_path / "analysis.sqlite")
+    TfIdfModel(OP_SET, stop_words=["the", "we"], analysis_cache=path).train(DOCS)
+
+    for model in [TfIdfModel(OP_SET, stop_words=["the"], analysis_cache=path),
+                  TfIdfModel(OP_SET - {TextOps.DIGITS}, stop_words=["the", "we"], analysis_cache=path),
+                  TfIdfModel(OP_SET, stop_words=["the", "we"], ngram_range=(1, 2), analysis_cache=path)]:
+        model.train(DOCS)
+        assert model.analysis_cache.info()["hits"] == 1
+
+    hashing = HashingTfIdfModel(OP_SET, stop_words=["the", "we"], n_features=64, analysis_cache=path)
+    hashing.train(DOCS)
+    assert hashing.analysis_cache.info()["misses"] == 0
+
+
+def test_callable_analyzer_is_not_cached(tmp_path):
+    model = TfIdfModel(set(), analyzer=str.split, analysis_cache=str(tmp_path / "analysis.sqlite"))
+    model.train(DOCS)
+    assert model.analysis_cache.hits + model.analysis_cache.misses == 0
+
+
+def test_lru_eviction(tmp_path):
+    cache = AnalysisCache(str(tmp_path / "analysis.sqlite"), max_bytes=1000, batch_size=1)
+    keys = [cache.key(b"settings", "document %d" % i) for i in range(20)]
+    for i, key in enumerate(keys[:8]):
+        cache.put(key, ["token"] * 10 + [str(i)])
+    assert cache.get(keys[0]) is not None
+    for key in keys[8:]:
+        cache.put(key, ["token"] * 10)
+        cache.get(keys[0])
+
+    info = cache.info()
+    assert info["bytes"] <= 1000 and info["evictions"] > 0
+    assert cache.get(keys[0]) == ["token"] * 10 + ["0"]
+    assert cache.get(keys[1]) is None
+
+
+def _fill_cache(args):
+    cache, worker = args
+    for i in range(200):
+        key = cache.key(b"settings", "document %d" % (i % 150))
+        if cache.get(key) is None:
+            cache.put(key, ["worker", str(worker), str(i % 150)])
+    cache.close()
+    return cache.writes
+
+
+def test_concurrent_processes(tmp_path):
+    cache = AnalysisCache(str(tmp_path / "analysis.sqlite"), max_bytes=5000, batch_size=7)
+    with mp.Pool(3) as pool:
+        writes = pool.map(_fill_cache, [(pickle.loads(pickle.dumps(cache)), worker) for worker in range(3)])
+
+    info = cache.info()
+    assert sum(writes) >= 150 - info["entries"] and info["bytes"] <= 5000
+    assert info["bytes"] == sum(len(key) + len(tokens) for key, tokens in
+                                cache._connect().execute("SELECT key, tokens FROM entries"))
+
+
+def test_cache_used_from_another_thread(tmp_path):
+    from concurrent.futures import ThreadPoolExecutor
+
+    path = str(tmp_path / "analysis.sqlite")
+    tf_idf = TfIdfModel(OP_SET, stop_words=["the", "we"], analysis_cache=path)
+    expected = tf_idf.train(DOCS)
+    with ThreadPoolExecutor(2) as executor:
+        results = list(executor.map(lambda docs: tf_idf.infer(docs), [DOCS[:3], DOCS[3:]]))
+    assert np.allclose(np.vstack(results), expected)
+    assert tf_idf.analysis_cache.info()["hits"] >= len(DOCS)
@@ -0,0 +1,69 @@
+import pytest
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+
+from src.utils import IO
+
+
+def test_save_sparse_to_csv_in_chunks(tmp_path):
+    data = sp.random(25, 6, density=0.3, format="csr", random_state=0)
+    dense_path, sparse_path = str(tmp_path / "dense.csv"), str(tmp_path / "sparse.csv")
+    IO.save_to_csv(data.toarray(), dense_path, colnames=list("abcdef"))
+    IO.save_to_csv(data, sparse_path, colnames=list("abcdef"), chunk_size=4)
+    assert pd.read_csv(dense_path).equals(pd.read_csv(sparse_path))
+
+
+def test_save_to_csv_invalid_extension():
+    with pytest.raises(AssertionError, match="Filepath should have '.csv' extension !"):
+        IO.save_to_csv(np.zeros((2, 2)), "out.txt")
+
+
+def test_iter_txt_corpus_in_chunks(tmp_path):
+    corpus_path = tmp_path / "corpus.txt"
+    corpus_path.write_text("".join("doc %d\n" % i for i in range(7)))
+    chunks = list(IO.iter_txt_corpus(str(corpus_path), chunk_size=3))
+    assert [len(chunk) for chunk in chunks] == [3, 3, 1]
+    assert sum(chunks, []) == IO.read_txt_corpus(str(corpus_path))
+
+
+@pytest.mark.parametrize("extension", ["npz", "mtx", "tsv"])
+def test_save_and_read_sparse_formats(tmp_path, extension):
+    data = sp.random(53, 9, density=0.3, format="csr", random_state=0)
+    colnames = ["term_%d" % i for i in range(9)]
+    filepath = str(tmp_path / ("out." + extension))
+    IO.save_matrix(data, filepath, colnames=colnames, chunk_size=10)
+
+    if extension == "npz":
+        X, rownames, names = IO.read_npz(filepath)
+        assert names == colnames and rownames is None
+        assert sp.load_npz(filepath).shape == data.shape
+    elif extension == "mtx":
+        X = IO.read_mtx(filepath)
+    else:
+        X, rownames, names = IO.read_tsv(filepath, colnames=colnames)
+        assert names == colnames
+        data = data[[int(r) for r in rownames]]
+    assert X.shape == data.shape and np.allclose(X.toarray(), data.toarray())
+
+
+def test_save_row_chunks_to_npz(tmp_path):
+    data = sp.random(40, 6, density=0.3, format="csr", random_state=0)
+    filepath = str(tmp_path / "chunks.npz")
+    IO.save_to_npz((data[i:i + 7] for i in range(0, 40, 7)), filepath, rownames=list(range(40)))
+    X, rownames, _ = IO.read_npz(filepath)
+    assert (X != data).nnz == 0 and rownames == [str(i) for i in range(40)]
+
+
+def test_read_tsv_without_colnames(tmp_path):
+    filepath = str(tmp_path / "pairs.tsv")
+    data = sp.csr_matrix(np.array([[0.0, 0.5], [0.25, 0.0], [0.0, 0.0]]))
+    IO.save_to_tsv(data, filepath, rownames=["a", "b", "c"], colnames=["x", "y"])
+    X, rownames, colnames = IO.read_tsv(filepath)
+    assert rownames == ["a", "b"] and colnames == ["y", "x"]
+    assert np.allclose(X.toarray(), [[0.5, 0.0], [0.0, 0.25]])
+
+
+def test_save_matrix_unknown_extension():
+    with pytest.raises(ValueError):
+        IO.save_matrix(np.zeros((2, 2)), "out.parquet")
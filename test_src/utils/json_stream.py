@@ -0,0 +1,71 @@
+import json
+import pytest
+
+from src.utils import IO
+from src.utils.json_stream import JsonStreamReader
+
+TRANSCRIPTS = {
+    "episode-1": [{"utterance": "hello\nthere é", "start": 0.25, "tags": ["a", {"b": "]}"}]},
+                  {"utterance": "second", "start": 123456789}],
+    "episode-2": [],
+    "episode-3": [{"speaker": "no utterance"}, {"utterance": None}, 12345678.5, "text"],
+    "episode-4": {"a": {"utterance": "from an object"}, "b": {"utterance": "  \"quoted\"  "}},
+    "count": 1234567,
+}
+EXPECTED = "hellothere é\nsecond\nfrom an object\n\"quoted\"\n"
+
+
+def write_json(path, indent=None):
+    path.write_text(json.dumps(TRANSCRIPTS, indent=indent, ensure_ascii=False), encoding="utf-8")
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 64, 1 << 16])
+@pytest.mark.parametrize("indent", [None, 2])
+def test_reader_yields_second_level_elements(tmp_path, chunk_size, indent):
+    inp_path = tmp_path / "transcripts.json"
+    write_json(inp_path, indent)
+
+    expected = []
+    for key, value in TRANSCRIPTS.items():
+        elements = value if type(value) == list else list(value.values()) if type(value) == dict else [value]
+        expected.extend((key, element) for element in elements)
+    assert list(JsonStreamReader(str(inp_path), chunk_size)) == expected
+
+
+@pytest.mark.parametrize("chunk_size", [1, 5, 1 << 16])
+def test_create_corpus_txt_from_json_file(tmp_path, chunk_size):
+    inp_path, out_path = tmp_path / "transcripts.json", tmp_path / "corpus.txt"
+    write_json(inp_path, indent=1)
+
+    stats = IO.create_corpus_txt_from_json_file(str(inp_path), str(out_path), "utterance", chunk_size)
+    assert out_path.read_text(encoding="utf-8") == EXPECTED
+    assert stats["elements"] == 9 and stats["documents"] == 4 and stats["skipped"] == 5
+
+
+def test_create_corpus_txt_from_json_files(tmp_path):
+    inp_paths, out_paths = [], []
+    for i in range(3):
+        inp_paths.append(str(tmp_path / ("part%d-transcripts.json" % i)))
+        out_paths.append(str(tmp_path / ("part%d.txt" % i)))
+        write_json(tmp_path / ("part%d-transcripts.json" % i), indent=i)
+
+    stats = IO.create_corpus_txt_from_json_files(inp_paths, out_paths, "utterance", n_jobs=2)
+    assert [s["path"] for s in stats] == inp_paths
+    for path in out_paths:
+        assert open(path, encoding="utf-8").read() == EXPECTED
+
+
+@pytest.mark.parametrize("content", ['[{"utterance": "a"}]', '{"episode": [{"utterance": "a"}', '{"episode": [{"utterance": "a"} {}]}'])
+def test_malformed_json_raises(tmp_path, content):
+    inp_path = tmp_path / "malformed.json"
+    inp_path.write_text(content, encoding="utf-8")
+    with pytest.raises(ValueError):
+        list(JsonStreamReader(str(inp_path), chunk_size=4))
+
+
+@pytest.mark.parametrize("chunk_size", range(1, 41))
+def test_reader_numbers_split_at_chunk_boundaries(tmp_path, chunk_size):
+    inp_path = tmp_path / "numbers.json"
+    inp_path.write_text('{"a":[1.5,2.25,3e5,-10.125,1E-3,0],"b":7.75,"c":{"x":-2.5e+2}}', encoding="utf-8")
+    assert list(JsonStreamReader(str(inp_path), chunk_size)) == [
+        ("a", 1.5), ("a", 2.25), ("a", 3e5), ("a", -10.125), ("a", 1e-3), ("a", 0), ("b", 7.75), ("c", -250.0)]
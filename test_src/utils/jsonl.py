@@ -0,0 +1,41 @@
+import bz2
+import gzip
+import json
+import lzma
+import pytest
+
+from src.utils import IO
+from src.utils.jsonl import read_byte_range
+
+RECORDS = [json.dumps({"reviewText": "review %d\nsecond line é" % i, "overall": i % 5}) for i in range(300)]
+RECORDS[7] = "{not json"
+RECORDS[42] = json.dumps({"summary": "no review text"})
+RECORDS[100] = json.dumps({"reviewText": None})
+EXPECTED = "".join(
+    "review %dsecond line é\n" % i for i in range(300) if i not in [7, 42, 100])
+
+
+def write_jsonl(path, opener=open):
+    with opener(str(path), "wb") as f:
+        f.write(("\n".join(RECORDS) + "\n").encode("utf-8"))
+
+
+@pytest.mark.parametrize("n_jobs", [1, 2])
+@pytest.mark.parametrize("extension, opener", [("", open), (".gz", gzip.open), (".bz2", bz2.open), (".xz", lzma.open)])
+def test_extract_jsonl_corpus(tmp_path, n_jobs, extension, opener):
+    inp_path, out_path = tmp_path / ("reviews.jsonl" + extension), tmp_path / "corpus.txt"
+    write_jsonl(inp_path, opener)
+
+    stats = IO.create_corpus_txt_from_json_list_file(
+        str(inp_path), str(out_path), "reviewText", n_jobs=n_jobs, chunk_bytes=500)
+    assert out_path.read_text(encoding="utf-8") == EXPECTED
+    assert stats["lines"] == 300 and stats["records"] == 297
+    assert stats["skipped"] == 3 and stats["skipped_lines"] == [8, 43, 101]
+
+
+def test_byte_ranges_cover_every_line_once(tmp_path):
+    inp_path = tmp_path / "reviews.jsonl"
+    write_jsonl(inp_path)
+    size = inp_path.stat().st_size
+    blocks = [read_byte_range(str(inp_path), start, min(start + 97, size)) for start in range(0, size, 97)]
+    assert b"".join(blocks) == inp_path.read_bytes()
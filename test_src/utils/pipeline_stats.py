@@ -0,0 +1,63 @@
+import pickle
+import numpy as np
+
+from src.models import TfIdfModel
+from src.types import TextOps
+from src.utils import PipelineStats
+
+DOCS = [
+    "We're trying to manipulate the Radio Playhouse listeners, are we?",
+    "I guess \"manipulate\" has the tune of a negative connotation.",
+    "Keep going, baby. You're on a roll. You're on such a roll here. Sure.",
+    "Well, let's seduce them with this phone number 555.",
+    "What is the phone number?"]
+
+
+def test_nested_stages_stats():
+    stats = PipelineStats()
+    with stats.stage("outer"):
+        split = stats.wrap("split", str.split, count_tokens=True)
+        split("a b c")
+        split("d e")
+
+    outer, inner = stats.stages["outer"], stats.stages["split"]
+    assert inner.calls == 2 and inner.chars == 8 and inner.tokens == 5
+    assert outer.calls == 1 and np.isclose(outer.self_seconds, outer.seconds - inner.seconds)
+    assert "split" in stats.report() and stats.info()["split"]["tokens"] == 5
+
+
+def test_memory_peak_stats():
+    stats = PipelineStats(track_memory=True)
+    with stats.stage("allocate"):
+        data = bytearray(4 * 1024 ** 2)
+        del data
+    stats.close()
+    assert stats.stages["allocate"].peak_bytes >= 4 * 1024 ** 2
+
+
+def test_model_stages_stats():
+    tf_idf = TfIdfModel({TextOps.LOWER, TextOps.DIGITS, TextOps.PUNCTUATIONS}, fuse_preprocessors=False)
+    expected = tf_idf.train(DOCS)
+
+    stats = tf_idf.enable_stats()
+    out = tf_idf.train(DOCS)
+    assert np.allclose(out, expected)
+
+    chars = sum(len(doc) for doc in DOCS)
+    for stage in ["analyze", "MultiPreprocessor", "ExternalPreprocessor", "DigitPreprocessor", "PuncPreprocessor"]:
+        assert stats.stages[stage].calls >= len(DOCS)
+    assert stats.stages["ExternalPreprocessor"].chars >= chars
+    assert stats.stages["analyze"].tokens == stats.stages["regex_tokenize"].tokens > 0
+    assert stats.stages["fit_transform"].seconds >= stats.stages["count_vocab"].seconds
+
+    tf_idf.disable_stats()
+    tf_idf.train(DOCS)
+    assert stats.stages["fit_transform"].calls == 1
+
+
+def test_pickled_stats_start_empty():
+    stats = PipelineStats()
+    with stats.stage("stage"):
+        pass
+    copied = pickle.loads(pickle.dumps(stats))
+    assert len(copied.stages) == 0 and not copied.track_memory
@@ -0,0 +1,42 @@
+import numpy as np
+import scipy.sparse as sp
+
+from src.utils import Visualizer
+
+
+def test_closeness_blocks_match_dense():
+    from sklearn.metrics.pairwise import cosine_similarity
+
+    data = sp.random(30, 12, density=0.3, format="csr", random_state=0)
+    blocks = list(Visualizer.closeness_blocks(data, block_size=7))
+    assert [start for start, _ in blocks] == [0, 7, 14, 21, 28]
+    assert np.allclose(np.vstack([block for _, block in blocks]), cosine_similarity(data))
+
+
+def test_vis_closeness_selects_top_items(tmp_path):
+    data = sp.random(40, 2000, density=0.01, format="csr", random_state=0)
+    labels = ["w%d" % i for i in range(2000)]
+    selected = Visualizer.vis_closeness(data, str(tmp_path / "closeness.png"), labels=labels, max_items=25)
+
+    norms = np.asarray(data.multiply(data).sum(axis=0)).ravel()
+    assert sorted(selected.tolist()) == sorted(np.argsort(-norms, kind="stable")[:25].tolist())
+    assert (tmp_path / "closeness.png").exists()
+
+
+def test_vis_closeness_by_documents(tmp_path):
+    data = np.random.default_rng(0).random((8, 5))
+    selected = Visualizer.vis_closeness(data, str(tmp_path / "docs.png"), axis=0, max_items=None, reorder=False)
+    assert selected.tolist() == list(range(8))
+
+
+def test_vis_heatmap_selects_top_items(tmp_path):
+    data = sp.random(300, 2000, density=0.01, format="csr", random_state=0)
+    rows, cols = Visualizer.vis_heatmap(data, str(tmp_path / "heatmap.png"), max_items=50)
+
+    col_norms = np.asarray(data.multiply(data).sum(axis=0)).ravel()
+    assert cols.tolist() == sorted(np.argsort(-col_norms, kind="stable")[:50].tolist())
+    assert len(rows) == 50 and np.all(np.diff(rows) > 0)
+    assert (tmp_path / "heatmap.png").exists()
+
+    dense_rows, dense_cols = Visualizer.vis_heatmap(data.toarray()[:20], str(tmp_path / "dense.png"), max_items=50)
+    assert dense_rows.tolist() == list(range(20)) and len(dense_cols) == 50